@@ -4,28 +4,17 @@ from __future__ import annotations
 
 import configparser
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 import typer
-from sqlmodel import Session, select
 
-from server.archive import configure_rar_tool
+# Heavy subsystems (FastAPI, SQLModel, Pillow, watchdog, Alembic, archive
+# backends) are imported inside the commands that need them so that
+# `issued --help` and light commands start quickly.
 from server.config import DEFAULT_CONFIG_PATH, IssuedConfig, load_config
-from server.database import get_engine, init_db, reset_database
-from server.migrations import (
-    ensure_ongoing_series_table,
-    ensure_tags_tables,
-    get_status,
-    run_migrations,
-    stamp_if_needed,
-)
-from server.monitor import start_file_monitoring
-from server.opds import run_server
-from server.repository import Repository
-from server.scanner import scan_library
-from server.thumbnails import cleanup_orphaned_thumbnails, generate_thumbnails
-from server.models import Folder
 from server.logging_config import setup_logging
 
 
@@ -44,6 +33,8 @@ STARTUP_BANNER = r"""
 
 
 def _ensure_config() -> IssuedConfig:
+    from server.archive import configure_rar_tool
+
     try:
         config = load_config()
     except FileNotFoundError:
@@ -106,6 +97,8 @@ def scan(
     path: Optional[Path] = typer.Option(None, "--path", help="Scan a subfolder"),
 ) -> None:
     """Scan library and update database."""
+    from server.scanner import scan_library
+
     setup_logging()
     
     config = _ensure_config()
@@ -127,6 +120,21 @@ def serve(
     no_watch: bool = typer.Option(False, "--no-watch", help="Disable file monitoring"),
 ) -> None:
     """Start OPDS server with optional file monitoring."""
+    from server.database import init_db
+    from server.migrations import (
+        ensure_comics_fts_table,
+        ensure_folder_preview_cache,
+        ensure_ongoing_series_table,
+        ensure_page_manifest_column,
+        ensure_tags_tables,
+        get_status,
+        run_migrations,
+        stamp_if_needed,
+    )
+    from server.monitor import start_file_monitoring
+    from server.opds import run_server
+    from server.scanner import scan_library
+
     setup_logging()
     
     typer.echo(typer.style(STARTUP_BANNER, fg=typer.colors.MAGENTA, bold=True))
@@ -149,6 +157,15 @@ def serve(
     if ensure_tags_tables():
         logger.info("tags/comic_tags tables were missing and have been repaired.")
 
+    if ensure_comics_fts_table():
+        logger.info("comics_fts search index was missing and has been rebuilt.")
+
+    if ensure_folder_preview_cache():
+        logger.info("folder preview cache column/triggers were missing and have been repaired.")
+
+    if ensure_page_manifest_column():
+        logger.info("comics.page_manifest column was missing and has been repaired.")
+
     # Initial scan on startup (populates DB if empty or picks up changes)
     logger.info("Running initial library scan...")
     stats = scan_library(config)
@@ -178,6 +195,8 @@ def thumbnails(
     regenerate: bool = typer.Option(False, "--regenerate", help="Regenerate all thumbnails"),
 ) -> None:
     """Generate missing (or all) thumbnails."""
+    from server.thumbnails import generate_thumbnails
+
     setup_logging()
     
     config = _ensure_config()
@@ -187,6 +206,8 @@ def thumbnails(
 @app.command()
 def cleanup() -> None:
     """Remove orphaned thumbnails."""
+    from server.thumbnails import cleanup_orphaned_thumbnails
+
     config = _ensure_config()
     deleted = cleanup_orphaned_thumbnails(config)
     typer.echo(f"[INFO] Removed {deleted} orphaned thumbnails")
@@ -195,6 +216,12 @@ def cleanup() -> None:
 @app.command()
 def stats() -> None:
     """Show library statistics."""
+    from sqlmodel import Session, select
+
+    from server.database import get_engine
+    from server.models import Folder
+    from server.repository import Repository
+
     config = _ensure_config()
 
     with Session(get_engine()) as session:
@@ -224,6 +251,9 @@ def migrate(
     check: bool = typer.Option(False, "--check", help="Print status and exit (1 if not at head)"),
 ) -> None:
     """Run pending database migrations (or check status with --check)."""
+    from server.database import init_db
+    from server.migrations import ensure_ongoing_series_table, get_status, run_migrations
+
     _ensure_config()                    # config must exist before we touch the DB
     init_db()                           # ensure tables exist for a brand-new DB
 
@@ -249,11 +279,26 @@ def migrate(
     logger.info("Migration complete.")
 
 
+def _unlink_thumbnail(path: str) -> bool:
+    """Delete one thumbnail; False (and logged) only if it exists but could not be removed."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as exc:
+        logger.error(f"Failed to delete thumbnail {path}: {exc}")
+        return False
+    return True
+
+
 @app.command()
 def reset(
     confirm: bool = typer.Option(False, "--confirm", help="Confirm destructive reset"),
 ) -> None:
     """Reset database and regenerate thumbnails."""
+    from server.database import reset_database
+    from server.scanner import scan_library
+
     if not confirm:
         typer.echo("[ERROR] This will delete your database and thumbnails. Use --confirm.")
         raise typer.Exit(code=1)
@@ -262,11 +307,23 @@ def reset(
 
     reset_database()
     thumbnails_dir = config.thumbnails_dir
+    failed = 0
     if thumbnails_dir.exists():
-        for file_path in thumbnails_dir.glob("*.jpg"):
-            file_path.unlink()
-
-    typer.echo("[INFO] Database and thumbnails reset. Rescanning library...")
+        # Thumbnails are written as {uuid}.webp; unlink them in parallel.
+        with os.scandir(thumbnails_dir) as entries:
+            paths = [
+                entry.path
+                for entry in entries
+                if entry.name.endswith(".webp") and entry.is_file()
+            ]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            failed = sum(not removed for removed in pool.map(_unlink_thumbnail, paths))
+
+    if failed:
+        typer.echo(f"[WARN] {failed} thumbnail(s) could not be deleted; see the log.")
+        typer.echo("[INFO] Database reset. Rescanning library...")
+    else:
+        typer.echo("[INFO] Database and thumbnails reset. Rescanning library...")
     scan_library(config, force=True)
 
 
@@ -10,7 +10,7 @@ from alembic import context
 from sqlmodel import SQLModel
 
 # Import engine (resolves PROJECT_ROOT → library.db automatically).
-from server.database import engine  # noqa: F401
+from server.database import get_engine
 
 # Import all model modules so that their tables are registered on
 # SQLModel.metadata before Alembic inspects it.
@@ -21,7 +21,7 @@ target_metadata = SQLModel.metadata
 
 def run_migrations_online() -> None:
     """Run migrations with a real database connection."""
-    with engine.connect() as conn:
+    with get_engine().connect() as conn:
         context.configure(
             connection=conn,
             target_metadata=target_metadata,
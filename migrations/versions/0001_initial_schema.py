@@ -16,22 +16,22 @@ branch_labels: str | None = None
 depends_on: str | None = None
 
 
-def _table_exists(name: str) -> bool:
-    """Check whether a table already exists in the database."""
+def _existing_tables() -> set[str]:
+    """Return the names of all tables already present in the database."""
     conn = op.get_bind()
     result = conn.execute(
-        sa.text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:n"),
-        {"n": name},
+        sa.text("SELECT name FROM sqlite_master WHERE type='table'")
     )
-    return result.fetchone() is not None
+    return {row[0] for row in result}
 
 
 def upgrade() -> None:
-    # Every CREATE is guarded by _table_exists so that the migration is
-    # safe to run against a DB that was originally created by the old
+    # Every CREATE is guarded by the existing-table set so that the migration
+    # is safe to run against a DB that was originally created by the old
     # SQLModel.metadata.create_all() path (legacy stamp scenario).
+    existing = _existing_tables()
 
-    if not _table_exists("folders"):
+    if "folders" not in existing:
         op.create_table(
             "folders",
             sa.Column("id", sa.Integer(), primary_key=True),
@@ -42,7 +42,7 @@ def upgrade() -> None:
         )
         op.create_index("ix_folders_path", "folders", ["path"], unique=True)
 
-    if not _table_exists("comics"):
+    if "comics" not in existing:
         op.create_table(
             "comics",
             sa.Column("id", sa.Integer(), primary_key=True),
@@ -61,7 +61,7 @@ def upgrade() -> None:
         op.create_index("ix_comics_uuid", "comics", ["uuid"], unique=True)
         op.create_index("ix_comics_path", "comics", ["path"], unique=True)
 
-    if not _table_exists("metadata"):
+    if "metadata" not in existing:
         op.create_table(
             "metadata",
             sa.Column("id", sa.Integer(), primary_key=True),
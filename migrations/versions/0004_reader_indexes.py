@@ -0,0 +1,41 @@
+"""Indexes for reader "last added" and "continue reading" lists
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def _index_exists(name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type='index' AND name=:n"),
+        {"n": name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    # Plain ascending indexes: SQLite walks them backwards for ORDER BY ... DESC.
+    # Guarded because init_db's create_all already builds them on fresh databases.
+    if not _index_exists("ix_comics_last_scanned_at"):
+        op.create_index("ix_comics_last_scanned_at", "comics", ["last_scanned_at"])
+    if not _index_exists("ix_metadata_last_read_at"):
+        op.create_index("ix_metadata_last_read_at", "metadata", ["last_read_at"])
+
+
+def downgrade() -> None:
+    if _index_exists("ix_metadata_last_read_at"):
+        op.drop_index("ix_metadata_last_read_at", table_name="metadata")
+    if _index_exists("ix_comics_last_scanned_at"):
+        op.drop_index("ix_comics_last_scanned_at", table_name="comics")
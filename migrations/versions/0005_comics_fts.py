@@ -0,0 +1,85 @@
+"""Full-text search index over comic filename, title and series
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+_TRIGGERS = {
+    "comics_fts_ai": """
+        CREATE TRIGGER comics_fts_ai AFTER INSERT ON comics BEGIN
+            INSERT INTO comics_fts (rowid, filename, title, series)
+            VALUES (new.id, new.filename, NULL, NULL);
+        END
+    """,
+    "comics_fts_au": """
+        CREATE TRIGGER comics_fts_au AFTER UPDATE OF filename ON comics BEGIN
+            UPDATE comics_fts SET filename = new.filename WHERE rowid = new.id;
+        END
+    """,
+    "comics_fts_ad": """
+        CREATE TRIGGER comics_fts_ad AFTER DELETE ON comics BEGIN
+            DELETE FROM comics_fts WHERE rowid = old.id;
+        END
+    """,
+    "metadata_fts_ai": """
+        CREATE TRIGGER metadata_fts_ai AFTER INSERT ON metadata BEGIN
+            UPDATE comics_fts SET title = new.title, series = new.series
+            WHERE rowid = new.comic_id;
+        END
+    """,
+    "metadata_fts_au": """
+        CREATE TRIGGER metadata_fts_au AFTER UPDATE OF title, series ON metadata BEGIN
+            UPDATE comics_fts SET title = new.title, series = new.series
+            WHERE rowid = new.comic_id;
+        END
+    """,
+    "metadata_fts_ad": """
+        CREATE TRIGGER metadata_fts_ad AFTER DELETE ON metadata BEGIN
+            UPDATE comics_fts SET title = NULL, series = NULL
+            WHERE rowid = old.comic_id;
+        END
+    """,
+}
+
+
+def _exists(kind: str, name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type=:t AND name=:n"),
+        {"t": kind, "n": name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    if not _exists("table", "comics_fts"):
+        # Trigram tokenizer so MATCH keeps the substring semantics of LIKE '%q%'.
+        op.execute(
+            "CREATE VIRTUAL TABLE comics_fts "
+            "USING fts5(filename, title, series, tokenize='trigram')"
+        )
+        op.execute(
+            "INSERT INTO comics_fts (rowid, filename, title, series) "
+            "SELECT c.id, c.filename, m.title, m.series "
+            "FROM comics c LEFT JOIN metadata m ON m.comic_id = c.id"
+        )
+    for name, ddl in _TRIGGERS.items():
+        if not _exists("trigger", name):
+            op.execute(ddl)
+
+
+def downgrade() -> None:
+    for name in _TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS comics_fts")
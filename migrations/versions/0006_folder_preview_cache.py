@@ -0,0 +1,81 @@
+"""Cached folder preview UUIDs with invalidation triggers
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def _invalidate(folder_id: str) -> str:
+    # Null the cached previews of folder_id and every ancestor.
+    return f"""
+        UPDATE folders SET preview_uuids = NULL
+        WHERE preview_uuids IS NOT NULL AND id IN (
+            WITH RECURSIVE chain(id) AS (
+                SELECT {folder_id}
+                UNION ALL
+                SELECT f.parent_id FROM folders f
+                INNER JOIN chain ON f.id = chain.id
+                WHERE f.parent_id IS NOT NULL
+            )
+            SELECT id FROM chain
+        );
+    """
+
+
+_TRIGGERS = {
+    "folder_preview_comics_ai": "AFTER INSERT ON comics BEGIN"
+    + _invalidate("new.folder_id") + "END",
+    "folder_preview_comics_ad": "AFTER DELETE ON comics BEGIN"
+    + _invalidate("old.folder_id") + "END",
+    "folder_preview_comics_au": "AFTER UPDATE OF folder_id ON comics"
+    " WHEN old.folder_id IS NOT new.folder_id BEGIN"
+    + _invalidate("old.folder_id") + _invalidate("new.folder_id") + "END",
+    "folder_preview_folders_ai": "AFTER INSERT ON folders BEGIN"
+    + _invalidate("new.parent_id") + "END",
+    "folder_preview_folders_ad": "AFTER DELETE ON folders BEGIN"
+    + _invalidate("old.parent_id") + "END",
+    "folder_preview_folders_au": "AFTER UPDATE OF parent_id ON folders BEGIN"
+    + _invalidate("old.parent_id") + _invalidate("new.parent_id") + "END",
+}
+
+
+def _exists(kind: str, name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type=:t AND name=:n"),
+        {"t": kind, "n": name},
+    )
+    return result.fetchone() is not None
+
+
+def _column_exists(table: str, column: str) -> bool:
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(f"PRAGMA table_info({table})")).fetchall()
+    return any(row[1] == column for row in rows)
+
+
+def upgrade() -> None:
+    if not _column_exists("folders", "preview_uuids"):
+        op.add_column("folders", sa.Column("preview_uuids", sa.Text(), nullable=True))
+    for name, body in _TRIGGERS.items():
+        if not _exists("trigger", name):
+            op.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def downgrade() -> None:
+    for name in _TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    if _column_exists("folders", "preview_uuids"):
+        with op.batch_alter_table("folders") as batch_op:
+            batch_op.drop_column("preview_uuids")
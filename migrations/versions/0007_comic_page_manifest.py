@@ -0,0 +1,34 @@
+"""Store each comic's ordered page names
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007"
+down_revision: str | None = "0006"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def _column_exists(table: str, column: str) -> bool:
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(f"PRAGMA table_info({table})")).fetchall()
+    return any(row[1] == column for row in rows)
+
+
+def upgrade() -> None:
+    # Filled in by the scanner; NULL rows fall back to listing the archive.
+    if not _column_exists("comics", "page_manifest"):
+        op.add_column("comics", sa.Column("page_manifest", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    if _column_exists("comics", "page_manifest"):
+        with op.batch_alter_table("comics") as batch_op:
+            batch_op.drop_column("page_manifest")
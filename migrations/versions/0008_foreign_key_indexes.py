@@ -0,0 +1,45 @@
+"""Indexes on folder/comic/tag foreign keys used by reader lookups
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+# (index name, table, column): subfolder listings, folder contents, comics per tag.
+_INDEXES = (
+    ("ix_folders_parent_id", "folders", "parent_id"),
+    ("ix_comics_folder_id", "comics", "folder_id"),
+    ("ix_comic_tags_tag_id", "comic_tags", "tag_id"),
+)
+
+
+def _index_exists(name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type='index' AND name=:n"),
+        {"n": name},
+    )
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    # Guarded because init_db's create_all already builds them on fresh databases.
+    for name, table, column in _INDEXES:
+        if not _index_exists(name):
+            op.create_index(name, table, [column])
+
+
+def downgrade() -> None:
+    for name, table, _column in reversed(_INDEXES):
+        if _index_exists(name):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,109 @@
+"""Widen comics_fts to the metadata columns OPDS search matches
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+_TRIGGER_NAMES = (
+    "comics_fts_ai",
+    "comics_fts_au",
+    "comics_fts_ad",
+    "metadata_fts_ai",
+    "metadata_fts_au",
+    "metadata_fts_ad",
+)
+
+
+def _rebuild(metadata_columns: tuple[str, ...]) -> None:
+    """Drop comics_fts and recreate it over filename plus *metadata_columns*."""
+    columns = ", ".join(metadata_columns)
+    m_columns = ", ".join(f"m.{col}" for col in metadata_columns)
+    nulls = ", ".join("NULL" for _ in metadata_columns)
+    set_new = ", ".join(f"{col} = new.{col}" for col in metadata_columns)
+    set_null = ", ".join(f"{col} = NULL" for col in metadata_columns)
+
+    for name in _TRIGGER_NAMES:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS comics_fts")
+
+    # Trigram tokenizer so MATCH keeps the substring semantics of LIKE '%q%'.
+    op.execute(
+        f"CREATE VIRTUAL TABLE comics_fts USING fts5(filename, {columns}, tokenize='trigram')"
+    )
+    op.execute(
+        f"INSERT INTO comics_fts (rowid, filename, {columns}) "
+        f"SELECT c.id, c.filename, {m_columns} "
+        "FROM comics c LEFT JOIN metadata m ON m.comic_id = c.id"
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER comics_fts_ai AFTER INSERT ON comics BEGIN
+            INSERT INTO comics_fts (rowid, filename, {columns})
+            VALUES (new.id, new.filename, {nulls});
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER comics_fts_au AFTER UPDATE OF filename ON comics BEGIN
+            UPDATE comics_fts SET filename = new.filename WHERE rowid = new.id;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER comics_fts_ad AFTER DELETE ON comics BEGIN
+            DELETE FROM comics_fts WHERE rowid = old.id;
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER metadata_fts_ai AFTER INSERT ON metadata BEGIN
+            UPDATE comics_fts SET {set_new} WHERE rowid = new.comic_id;
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER metadata_fts_au AFTER UPDATE OF {columns} ON metadata BEGIN
+            UPDATE comics_fts SET {set_new} WHERE rowid = new.comic_id;
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER metadata_fts_ad AFTER DELETE ON metadata BEGIN
+            UPDATE comics_fts SET {set_null} WHERE rowid = old.comic_id;
+        END
+        """
+    )
+
+
+def upgrade() -> None:
+    _rebuild(
+        (
+            "title",
+            "series",
+            "writer",
+            "penciller",
+            "notes",
+            "summary",
+            "genre",
+            "publisher",
+        )
+    )
+
+
+def downgrade() -> None:
+    _rebuild(("title", "series"))
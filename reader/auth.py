@@ -1,8 +1,9 @@
-"""Reader session auth: signed cookie (HMAC) with expiry."""
+"""Reader session auth: signed cookie (keyed BLAKE2b) with expiry."""
 
 from __future__ import annotations
 
 import base64
+import functools
 import hmac
 import hashlib
 import json
@@ -24,41 +25,73 @@ def _b64_decode(s: str) -> bytes:
     return base64.urlsafe_b64decode(s)
 
 
+@functools.lru_cache(maxsize=4)
+def _signing_key(password: str) -> bytes:
+    """Fixed-size BLAKE2b key derived once per configured password."""
+    return hashlib.sha256(password.encode("utf-8")).digest()
+
+
+def _sign(payload_bytes: bytes, password: str) -> bytes:
+    return hashlib.blake2b(
+        payload_bytes, key=_signing_key(password), digest_size=32
+    ).digest()
+
+
+def _legacy_sign(payload_bytes: bytes, password: str) -> bytes:
+    """HMAC-SHA256 signature used by cookies issued before the BLAKE2b switch."""
+    return hmac.new(password.encode("utf-8"), payload_bytes, hashlib.sha256).digest()
+
+
+def credentials_match(username: str, password: str, expected_user: str, expected_password: str) -> bool:
+    """Constant-time login check; both fields are always compared."""
+    user_ok = hmac.compare_digest(username.encode("utf-8"), expected_user.encode("utf-8"))
+    password_ok = hmac.compare_digest(password.encode("utf-8"), expected_password.encode("utf-8"))
+    return user_ok & password_ok
+
+
 def create_session_cookie_value(username: str, password: str) -> str:
-    """Build signed cookie value: base64(payload).base64(hmac)."""
+    """Build signed cookie value: base64(payload).base64(signature)."""
     expiry = int(time.time()) + SESSION_MAX_AGE_SECONDS
-    payload = {"u": username, "e": expiry}
-    payload_bytes = json.dumps(payload, sort_keys=True).encode("utf-8")
+    payload_bytes = f"{expiry}|{username}".encode("utf-8")
     payload_b64 = _b64_encode(payload_bytes)
-    key = password.encode("utf-8")
-    sig = hmac.new(key, payload_bytes, hashlib.sha256).digest()
-    sig_b64 = _b64_encode(sig)
+    sig_b64 = _b64_encode(_sign(payload_bytes, password))
     return f"{payload_b64}.{sig_b64}"
 
 
+def _parse_payload(payload_bytes: bytes) -> tuple[Optional[int], Optional[str]]:
+    """Return (expiry, username) from an ``expiry|username`` payload.
+
+    Cookies issued before the compact format carry a JSON object instead.
+    """
+    if payload_bytes.startswith(b"{"):
+        payload = json.loads(payload_bytes.decode("utf-8"))
+        return payload.get("e"), payload.get("u")
+    expiry, sep, username = payload_bytes.partition(b"|")
+    if not sep:
+        return None, None
+    return int(expiry), username.decode("utf-8")
+
+
 def verify_session_cookie(cookie_value: Optional[str], password: str) -> Optional[str]:
     """
     Verify signed cookie; return username if valid and not expired, else None.
     """
     if not cookie_value or not password:
         return None
-    parts = cookie_value.split(".")
-    if len(parts) != 2:
+    payload_b64, sep, sig_b64 = cookie_value.partition(".")
+    if not sep or "." in sig_b64:
         return None
     try:
-        payload_bytes = _b64_decode(parts[0])
-        payload = json.loads(payload_bytes.decode("utf-8"))
-        expiry = payload.get("e")
-        username = payload.get("u")
+        payload_bytes = _b64_decode(payload_b64)
+        expiry, username = _parse_payload(payload_bytes)
         if expiry is None or username is None:
             return None
         if int(time.time()) > expiry:
             return None
-        key = password.encode("utf-8")
-        expected_sig = hmac.new(key, payload_bytes, hashlib.sha256).digest()
-        expected_b64 = _b64_encode(expected_sig)
-        if not hmac.compare_digest(expected_b64, parts[1]):
-            return None
-        return username
+        if hmac.compare_digest(_b64_encode(_sign(payload_bytes, password)), sig_b64):
+            return username
+        if hmac.compare_digest(_b64_encode(_legacy_sign(payload_bytes, password)), sig_b64):
+            return username
+        return None
     except (ValueError, KeyError, json.JSONDecodeError):
         return None
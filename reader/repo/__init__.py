@@ -1,6 +1,7 @@
 """reader.repo – feature-domain repository sub-package.
 
 Re-exports every public function so existing callers continue to work unchanged.
+Write helpers never commit; callers group them with ``server.database.transaction``.
 """
 
 from .folders import (
@@ -22,8 +23,11 @@ from .metadata import (
     get_comic_id_by_uuid,
     get_folder_id_for_comic,
     get_initial_page,
+    get_initial_page_by_id,
     get_metadata,
+    get_reader_context,
     ensure_metadata_row,
+    ensure_metadata_rows,
     update_metadata,
 )
 from .progress import (
@@ -53,10 +57,12 @@ __all__ = [
     "get_top_folders", "add_folder_item_counts", "get_folder",
     "get_subfolders_with_item_count", "get_breadcrumbs_for_folder",
     "get_folder_preview_thumbnails",
-    "get_comics_in_folder", "get_last_added_comics", "get_continue_reading_comics",
+    "get_comics_in_folder", "get_last_added_comics",
+    "get_continue_reading_comics",
     "search_comics", "search_comics_grouped",
     "get_comic_id_by_uuid", "get_folder_id_for_comic", "get_initial_page",
-    "get_metadata", "ensure_metadata_row", "update_metadata",
+    "get_initial_page_by_id",
+    "get_metadata", "get_reader_context", "ensure_metadata_row", "ensure_metadata_rows", "update_metadata",
     "get_progress", "update_progress", "clear_progress",
     "mark_all_comics_in_folder_completed", "toggle_comic_completed",
     "get_tags_for_comic", "get_all_tags", "get_all_tags_with_counts",
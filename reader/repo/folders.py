@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import json
+import sqlite3
+
 
 def get_top_folders(conn) -> list[dict]:
     """Top-level folders (parent_id IS NULL), ordered by name."""
@@ -13,12 +16,26 @@ def get_top_folders(conn) -> list[dict]:
 
 def add_folder_item_counts(conn, folders: list[dict]) -> None:
     """Mutate each folder dict adding item_count (subfolders + comics)."""
+    if not folders:
+        return
+    folder_ids = [f["id"] for f in folders]
+    # json_each() instead of ?,?,?: one statement text for any number of folders.
+    ids_json = json.dumps(folder_ids)
+    cur = conn.execute(
+        """
+        SELECT parent_id AS id, COUNT(*) AS c FROM folders
+        WHERE parent_id IN (SELECT value FROM json_each(?)) GROUP BY parent_id
+        UNION ALL
+        SELECT folder_id AS id, COUNT(*) AS c FROM comics
+        WHERE folder_id IN (SELECT value FROM json_each(?)) GROUP BY folder_id
+        """,
+        (ids_json, ids_json),
+    )
+    counts: dict[int, int] = {}
+    for row in cur.fetchall():
+        counts[row[0]] = counts.get(row[0], 0) + row[1]
     for f in folders:
-        cur = conn.execute(
-            "SELECT (SELECT COUNT(*) FROM folders WHERE parent_id = ?) + (SELECT COUNT(*) FROM comics WHERE folder_id = ?)",
-            (f["id"], f["id"]),
-        )
-        f["item_count"] = cur.fetchone()[0]
+        f["item_count"] = counts.get(f["id"], 0)
 
 
 def get_folder(conn, folder_id: int) -> dict | None:
@@ -32,50 +49,111 @@ def get_folder(conn, folder_id: int) -> dict | None:
 
 
 def get_subfolders_with_item_count(conn, folder_id: int) -> list[dict]:
-    """Direct subfolders of folder_id with item_count set."""
+    """Direct subfolders of folder_id with item_count set, in a single query."""
     cur = conn.execute(
-        "SELECT id, name FROM folders WHERE parent_id = ? ORDER BY name",
+        """
+        SELECT f.id, f.name,
+               (SELECT COUNT(*) FROM folders s WHERE s.parent_id = f.id)
+               + (SELECT COUNT(*) FROM comics c WHERE c.folder_id = f.id) AS item_count
+        FROM folders f
+        WHERE f.parent_id = ?
+        ORDER BY f.name
+        """,
         (folder_id,),
     )
-    subfolders = [dict(row) for row in cur.fetchall()]
-    add_folder_item_counts(conn, subfolders)
-    return subfolders
+    return [dict(row) for row in cur.fetchall()]
 
 
 def get_breadcrumbs_for_folder(conn, folder_id: int) -> list[dict]:
     """Breadcrumb chain for folder (excludes root). Each item: {id, name}."""
-    chain = []
-    current_id = folder_id
-    while current_id:
-        cur = conn.execute(
-            "SELECT id, name, parent_id FROM folders WHERE id = ?",
-            (current_id,),
+    cur = conn.execute(
+        """
+        WITH RECURSIVE chain(id, name, parent_id, depth) AS (
+            SELECT id, name, parent_id, 0 FROM folders WHERE id = ?
+            UNION ALL
+            SELECT f.id, f.name, f.parent_id, c.depth + 1 FROM folders f
+            INNER JOIN chain c ON f.id = c.parent_id
         )
-        folder = cur.fetchone()
-        if not folder:
-            break
-        if folder["parent_id"] is not None:
-            chain.append({"id": folder["id"], "name": folder["name"]})
-        current_id = folder["parent_id"]
-    chain.reverse()
-    return chain
+        SELECT id, name FROM chain
+        WHERE parent_id IS NOT NULL
+        ORDER BY depth DESC
+        """,
+        (folder_id,),
+    )
+    return [{"id": row["id"], "name": row["name"]} for row in cur.fetchall()]
+
+
+# Number of UUIDs kept in folders.preview_uuids; the preview API caps limit at 5.
+PREVIEW_CACHE_SIZE = 5
 
 
 def get_folder_preview_thumbnails(conn, folder_id: int, limit: int = 3) -> list[str]:
+    """Comic UUIDs for folder preview stack, served from folders.preview_uuids.
+
+    A NULL column (set by triggers whenever comics or subfolders below the
+    folder change) is recomputed and stored on a best-effort basis: if a scan
+    holds the write lock, the UUIDs are returned without being cached.
+    """
+    if limit > PREVIEW_CACHE_SIZE or not _has_preview_column(conn):
+        # preview_uuids column not added yet (DB never migrated/repaired).
+        return _compute_preview_uuids(conn, folder_id, limit)
+    row = conn.execute(
+        "SELECT preview_uuids FROM folders WHERE id = ?", (folder_id,)
+    ).fetchone()
+    if row is None:
+        return []
+    if row["preview_uuids"] is not None:
+        return json.loads(row["preview_uuids"])[:limit]
+
+    uuids = _compute_preview_uuids(conn, folder_id, PREVIEW_CACHE_SIZE)
+    _store_preview_uuids(conn, folder_id, uuids)
+    return uuids[:limit]
+
+
+def _has_preview_column(conn) -> bool:
+    return any(row[1] == "preview_uuids" for row in conn.execute("PRAGMA table_info(folders)"))
+
+
+def _store_preview_uuids(conn, folder_id: int, uuids: list[str]) -> None:
+    """Cache *uuids* and commit, without waiting on (or failing for) a held write lock."""
+    busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+    conn.execute("PRAGMA busy_timeout = 0")
+    try:
+        conn.execute(
+            "UPDATE folders SET preview_uuids = ? WHERE id = ?",
+            (json.dumps(uuids), folder_id),
+        )
+        conn.commit()
+    except sqlite3.OperationalError as exc:
+        conn.rollback()
+        message = str(exc)
+        if "locked" not in message and "busy" not in message:
+            raise
+    finally:
+        conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout)}")
+
+
+def _compute_preview_uuids(conn, folder_id: int, limit: int) -> list[str]:
     """Comic UUIDs for folder preview stack.
     - Leaf folder (series): last N added comics; if only 1 comic → 1 UUID (single cover).
     - Container with 1 direct child (1 subfolder): 1 UUID (single cover), last added in subtree.
     - Container with 2+ direct children: up to limit UUIDs, one per child when possible.
     """
-    # Check if folder is leaf (no subfolders)
+    # Subfolder count and "has comics" in one round trip: an empty leaf needs no more queries.
     cur = conn.execute(
-        "SELECT COUNT(*) as cnt FROM folders WHERE parent_id = ?",
-        (folder_id,),
+        """
+        SELECT (SELECT COUNT(*) FROM folders WHERE parent_id = ?) AS cnt,
+               EXISTS (SELECT 1 FROM comics WHERE folder_id = ?) AS has_comics
+        """,
+        (folder_id, folder_id),
     )
-    direct_children_count = cur.fetchone()["cnt"]
+    counts = cur.fetchone()
+    direct_children_count = counts["cnt"]
     has_subfolders = direct_children_count > 0
 
     if not has_subfolders:
+        if not counts["has_comics"]:
+            return []
         # Leaf folder (series): get last N added comics
         cur = conn.execute(
             """
@@ -108,7 +186,8 @@ def get_folder_preview_thumbnails(conn, folder_id: int, limit: int = 3) -> list[
         row = cur.fetchone()
         return [row["uuid"]] if row else []
 
-    # Container with 2+ direct children: diversify (one per child, then fill)
+    # Container with 2+ direct children: diversify (one per child, then fill).
+    # Ranking by rn first yields one random comic per child before any repeats.
     cur = conn.execute(
         """
         WITH RECURSIVE folder_tree AS (
@@ -117,30 +196,17 @@ def get_folder_preview_thumbnails(conn, folder_id: int, limit: int = 3) -> list[
             SELECT f.id, ft.root_child FROM folders f
             INNER JOIN folder_tree ft ON f.parent_id = ft.id
         )
-        SELECT c.uuid, ft.root_child FROM comics c
-        INNER JOIN folder_tree ft ON c.folder_id = ft.id
-        ORDER BY RANDOM()
+        SELECT uuid FROM (
+            SELECT c.uuid,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY ft.root_child ORDER BY RANDOM()
+                   ) AS rn
+            FROM comics c
+            INNER JOIN folder_tree ft ON c.folder_id = ft.id
+        )
+        ORDER BY rn, RANDOM()
+        LIMIT ?
         """,
-        (folder_id,),
+        (folder_id, limit),
     )
-    rows = cur.fetchall()
-
-    seen_children = set()
-    result = []
-
-    for row in rows:
-        if len(result) >= limit:
-            break
-        child = row["root_child"]
-        if child not in seen_children:
-            result.append(row["uuid"])
-            seen_children.add(child)
-
-    if len(result) < limit:
-        for row in rows:
-            if len(result) >= limit:
-                break
-            if row["uuid"] not in result:
-                result.append(row["uuid"])
-
-    return result
+    return [row["uuid"] for row in cur.fetchall()]
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import functools
+import json
+
 
 def get_comic_id_by_uuid(conn, comic_uuid: str) -> int | None:
     """Comic id for uuid, or None."""
@@ -30,57 +33,74 @@ def get_initial_page(conn, comic_uuid: str, page_count: int) -> int:
     return max(1, min(p, page_count)) if page_count else 1
 
 
+def get_initial_page_by_id(conn, comic_id: int, page_count: int) -> int:
+    """Like get_initial_page for an already-resolved comic id; clamps in SQL, no join."""
+    cur = conn.execute(
+        "SELECT MIN(MAX(COALESCE(current_page, 1), 1), ?) AS page FROM metadata WHERE comic_id = ?",
+        (max(page_count, 1), comic_id),
+    )
+    row = cur.fetchone()
+    return row["page"] if row else 1
+
+
+def get_reader_context(conn, comic_id: int, folder_id: int | None, page_count: int) -> dict:
+    """initial_page, issue title and folder breadcrumbs for the reader page, in one query."""
+    cur = conn.execute(
+        """
+        WITH RECURSIVE chain(id, name, parent_id, depth) AS (
+            SELECT id, name, parent_id, 0 FROM folders WHERE id = ?
+            UNION ALL
+            SELECT f.id, f.name, f.parent_id, c.depth + 1 FROM folders f
+            INNER JOIN chain c ON f.id = c.parent_id
+        )
+        SELECT
+            (SELECT MIN(MAX(COALESCE(current_page, 1), 1), ?)
+               FROM metadata WHERE comic_id = ?) AS initial_page,
+            (SELECT title FROM metadata WHERE comic_id = ?) AS title,
+            (SELECT json_group_array(json_object('id', id, 'name', name))
+               FROM (SELECT id, name FROM chain WHERE parent_id IS NOT NULL
+                     ORDER BY depth DESC)) AS breadcrumbs
+        """,
+        (folder_id, max(page_count, 1), comic_id, comic_id),
+    )
+    row = cur.fetchone()
+    return {
+        "initial_page": row["initial_page"] or 1,
+        "title": row["title"],
+        "breadcrumbs": json.loads(row["breadcrumbs"]),
+    }
+
+
 def get_metadata(conn, comic_uuid: str) -> dict | None:
     """Full metadata dict for comic (filename, uuid, all meta fields). None if comic not found."""
     cur = conn.execute(
-        "SELECT id, uuid, filename FROM comics WHERE uuid = ?",
+        "SELECT c.uuid, c.filename, m.title, m.series, m.issue_number, m.publisher, m.year, "
+        "m.month, m.writer, m.penciller, m.artist, m.summary, m.notes, m.web, m.language_iso, "
+        "m.score, m.genre "
+        "FROM comics c LEFT JOIN metadata m ON m.comic_id = c.id "
+        "WHERE c.uuid = ?",
         (comic_uuid,),
     )
     row = cur.fetchone()
     if not row:
         return None
-    comic_id = row["id"]
-    cur = conn.execute(
-        "SELECT title, series, issue_number, publisher, year, month, writer, penciller, artist, "
-        "summary, notes, web, language_iso, score, genre "
-        "FROM metadata WHERE comic_id = ?",
-        (comic_id,),
-    )
-    meta = cur.fetchone()
-    out = {
-        "uuid": row["uuid"],
-        "filename": row["filename"],
-        "title": None,
-        "series": None,
-        "issue_number": None,
-        "publisher": None,
-        "year": None,
-        "month": None,
-        "writer": None,
-        "penciller": None,
-        "artist": None,
-        "summary": None,
-        "notes": None,
-        "web": None,
-        "language_iso": None,
-        "score": None,
-        "genre": None,
-    }
-    if meta:
-        for k in out:
-            if k in ("uuid", "filename"):
-                continue
-            if k in meta.keys():
-                out[k] = meta[k]
-    return out
+    return dict(row)
 
 
 def ensure_metadata_row(conn, comic_id: int) -> None:
     """Insert metadata row for comic_id if missing."""
-    cur = conn.execute("SELECT 1 FROM metadata WHERE comic_id = ?", (comic_id,))
-    if not cur.fetchone():
-        conn.execute("INSERT INTO metadata (comic_id) VALUES (?)", (comic_id,))
-        conn.commit()
+    ensure_metadata_rows(conn, [comic_id])
+
+
+def ensure_metadata_rows(conn, comic_ids: list[int]) -> None:
+    """Insert metadata rows for every comic_id that lacks one, in a single statement."""
+    if not comic_ids:
+        return
+    conn.execute(
+        "INSERT OR IGNORE INTO metadata (comic_id, is_completed) "
+        "SELECT value, 0 FROM json_each(?)",
+        (json.dumps(list(comic_ids)),),
+    )
 
 
 _ALLOWED_METADATA_COLUMNS = frozenset({
@@ -90,19 +110,34 @@ _ALLOWED_METADATA_COLUMNS = frozenset({
 })
 
 
-def update_metadata(conn, comic_uuid: str, payload: dict) -> None:
-    """Update metadata fields. payload: dict of column -> value. Creates row if needed."""
-    comic_id = get_comic_id_by_uuid(conn, comic_uuid)
-    if not comic_id:
-        return
-    ensure_metadata_row(conn, comic_id)
-    safe_payload = {k: v for k, v in payload.items() if k in _ALLOWED_METADATA_COLUMNS}
-    if not safe_payload:
-        return
-    updates = [f"{k} = ?" for k in safe_payload]
-    params = list(safe_payload.values()) + [comic_id]
-    conn.execute(
-        "UPDATE metadata SET " + ", ".join(updates) + " WHERE comic_id = ?",
-        tuple(params),
+@functools.lru_cache(maxsize=128)
+def _metadata_upsert_sql(columns: tuple[str, ...]) -> str:
+    """Upsert statement for a column set; identical text lets sqlite3 reuse its prepared statement."""
+    if columns:
+        conflict = "UPDATE SET " + ", ".join(f"{k} = excluded.{k}" for k in columns)
+    else:
+        # Self-assignment rather than DO NOTHING so an existing comic still counts as a change.
+        conflict = "UPDATE SET comic_id = excluded.comic_id"
+    return (
+        "INSERT INTO metadata (comic_id, is_completed"
+        + "".join(f", {k}" for k in columns)
+        + ") SELECT id, 0"
+        + ", ?" * len(columns)
+        + " FROM comics WHERE uuid = ?"
+        + " ON CONFLICT(comic_id) DO "
+        + conflict
+    )
+
+
+def update_metadata(conn, comic_uuid: str, payload: dict) -> bool:
+    """Update metadata fields. payload: dict of column -> value. Creates row if needed.
+
+    Single upsert: the comic id is resolved inline, so an unknown uuid inserts
+    nothing and returns False.
+    """
+    columns = tuple(sorted(k for k in payload if k in _ALLOWED_METADATA_COLUMNS))
+    cur = conn.execute(
+        _metadata_upsert_sql(columns),
+        (*(payload[k] for k in columns), comic_uuid),
     )
-    conn.commit()
+    return cur.rowcount > 0
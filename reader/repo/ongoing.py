@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import re
 from datetime import datetime, timezone
 
@@ -34,7 +35,7 @@ def is_ongoing_series(conn, folder_id: int) -> bool:
 
 
 def set_ongoing_series(conn, folder_id: int, ongoing: bool) -> None:
-    """Insert or remove ongoing mark. Caller should commit."""
+    """Insert or remove ongoing mark. Caller commits (see server.database.transaction)."""
     if ongoing:
         now = datetime.now(timezone.utc).isoformat()
         conn.execute(
@@ -49,7 +50,6 @@ def set_ongoing_series(conn, folder_id: int, ongoing: bool) -> None:
             "DELETE FROM ongoing_series WHERE folder_id = ?",
             (folder_id,),
         )
-    conn.commit()
 
 
 def list_ongoing_series_rows(conn) -> list[dict]:
@@ -90,23 +90,24 @@ def list_ongoing_series_rows(conn) -> list[dict]:
         return []
 
     folder_ids = [r["folder_id"] for r in base_rows]
-    placeholders = ",".join("?" * len(folder_ids))
+    # One JSON parameter keeps each statement's text fixed for sqlite3's statement cache.
+    ids_json = json.dumps(folder_ids)
 
     # Issue counts per folder
     cur = conn.execute(
-        f"""
+        """
         SELECT folder_id, COUNT(*) AS issue_count
         FROM comics
-        WHERE folder_id IN ({placeholders})
+        WHERE folder_id IN (SELECT value FROM json_each(?))
         GROUP BY folder_id
         """,
-        folder_ids,
+        (ids_json,),
     )
     counts = {row["folder_id"]: int(row["issue_count"]) for row in cur.fetchall()}
 
     # Last added comic per folder (by created_at, then id)
     cur = conn.execute(
-        f"""
+        """
         WITH ranked AS (
             SELECT c.folder_id, c.uuid, c.filename,
                    m.issue_number, m.year, m.month,
@@ -116,13 +117,13 @@ def list_ongoing_series_rows(conn) -> list[dict]:
                    ) AS rn
             FROM comics c
             LEFT JOIN metadata m ON m.comic_id = c.id
-            WHERE c.folder_id IN ({placeholders})
+            WHERE c.folder_id IN (SELECT value FROM json_each(?))
         )
         SELECT folder_id, uuid, filename, issue_number, year, month
         FROM ranked
         WHERE rn = 1
         """,
-        folder_ids,
+        (ids_json,),
     )
     last_by_folder: dict[int, dict] = {}
     for row in cur.fetchall():
@@ -130,16 +131,16 @@ def list_ongoing_series_rows(conn) -> list[dict]:
 
     # Issue numbers per folder (filename-first, metadata fallback)
     cur = conn.execute(
-        f"""
+        """
         SELECT c.folder_id,
                c.uuid,
                c.filename,
                m.issue_number
         FROM comics c
         LEFT JOIN metadata m ON m.comic_id = c.id
-        WHERE c.folder_id IN ({placeholders})
+        WHERE c.folder_id IN (SELECT value FROM json_each(?))
         """,
-        folder_ids,
+        (ids_json,),
     )
     issues_by_folder: dict[int, list[int]] = {fid: [] for fid in folder_ids}
     nulls_by_folder: dict[int, int] = {fid: 0 for fid in folder_ids}
@@ -162,13 +163,13 @@ def list_ongoing_series_rows(conn) -> list[dict]:
 
     # Max created_at for sort (most recently added series first)
     cur = conn.execute(
-        f"""
+        """
         SELECT folder_id, MAX(created_at) AS max_ts
         FROM comics
-        WHERE folder_id IN ({placeholders})
+        WHERE folder_id IN (SELECT value FROM json_each(?))
         GROUP BY folder_id
         """,
-        folder_ids,
+        (ids_json,),
     )
     max_ts_by_folder = {row["folder_id"]: row["max_ts"] for row in cur.fetchall()}
 
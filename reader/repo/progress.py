@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import json
 from datetime import datetime, timezone
 
-from .metadata import ensure_metadata_row, get_comic_id_by_uuid
+from .metadata import ensure_metadata_row, ensure_metadata_rows, get_comic_id_by_uuid
 
 
 def get_progress(conn, comic_uuid: str) -> dict | None:
@@ -25,39 +26,36 @@ def get_progress(conn, comic_uuid: str) -> dict | None:
     return out
 
 
-def update_progress(conn, comic_uuid: str, current_page: int, is_completed: bool | None) -> None:
-    """Set current_page, last_read_at=now, optionally is_completed. Creates metadata row if needed."""
-    comic_id = get_comic_id_by_uuid(conn, comic_uuid)
-    if not comic_id:
-        return
-    ensure_metadata_row(conn, comic_id)
+_UPSERT_PROGRESS = """INSERT INTO metadata (comic_id, current_page, last_read_at, is_completed)
+           SELECT id, ?, ?, ? FROM comics WHERE uuid = ?
+           ON CONFLICT(comic_id) DO UPDATE SET
+               current_page = excluded.current_page, last_read_at = excluded.last_read_at"""
+_UPSERT_PROGRESS_COMPLETED = _UPSERT_PROGRESS + ", is_completed = excluded.is_completed"
+
+
+def update_progress(conn, comic_uuid: str, current_page: int, is_completed: bool | None) -> bool:
+    """Set current_page, last_read_at=now, optionally is_completed. Creates metadata row if needed.
+
+    Returns False if the comic does not exist.
+    """
     now = datetime.now(timezone.utc).isoformat()
-    updates = ["current_page = ?", "last_read_at = ?"]
-    params = [current_page, now]
-    if is_completed is not None:
-        updates.append("is_completed = ?")
-        params.append(1 if is_completed else 0)
-    params.append(comic_id)
-    conn.execute(
-        "UPDATE metadata SET " + ", ".join(updates) + " WHERE comic_id = ?",
-        tuple(params),
+    cur = conn.execute(
+        _UPSERT_PROGRESS if is_completed is None else _UPSERT_PROGRESS_COMPLETED,
+        (current_page, now, 1 if is_completed else 0, comic_uuid),
     )
-    conn.commit()
+    return cur.rowcount > 0
 
 
-def clear_progress(conn, comic_uuid: str) -> None:
-    """Reset current_page, last_read_at, is_completed for comic. No-op if no metadata row."""
-    comic_id = get_comic_id_by_uuid(conn, comic_uuid)
-    if not comic_id:
-        return
-    cur = conn.execute("SELECT 1 FROM metadata WHERE comic_id = ?", (comic_id,))
-    if not cur.fetchone():
-        return
-    conn.execute(
-        "UPDATE metadata SET current_page = NULL, last_read_at = NULL, is_completed = 0 WHERE comic_id = ?",
-        (comic_id,),
+def clear_progress(conn, comic_uuid: str) -> bool:
+    """Reset current_page, last_read_at, is_completed for comic. Returns False if the comic does not exist."""
+    cur = conn.execute(
+        """INSERT INTO metadata (comic_id, is_completed)
+           SELECT id, 0 FROM comics WHERE uuid = ?
+           ON CONFLICT(comic_id) DO UPDATE SET
+               current_page = NULL, last_read_at = NULL, is_completed = 0""",
+        (comic_uuid,),
     )
-    conn.commit()
+    return cur.rowcount > 0
 
 
 def mark_all_comics_in_folder_completed(conn, folder_id: int) -> int:
@@ -71,18 +69,15 @@ def mark_all_comics_in_folder_completed(conn, folder_id: int) -> int:
     if not comic_ids:
         return 0
 
-    for comic_id in comic_ids:
-        ensure_metadata_row(conn, comic_id)
+    ensure_metadata_rows(conn, comic_ids)
 
     now = datetime.now(timezone.utc).isoformat()
     cur = conn.execute(
         """UPDATE metadata
            SET is_completed = 1, last_read_at = ?
-           WHERE comic_id IN ({})""".format(",".join("?" * len(comic_ids))),
-        [now] + comic_ids,
+           WHERE comic_id IN (SELECT value FROM json_each(?))""",
+        (now, json.dumps(comic_ids)),
     )
-    conn.commit()
-
     return cur.rowcount
 
 
@@ -106,6 +101,4 @@ def toggle_comic_completed(conn, comic_uuid: str) -> bool | None:
         "UPDATE metadata SET is_completed = ?, last_read_at = ? WHERE comic_id = ?",
         (1 if new_state else 0, now, comic_id),
     )
-    conn.commit()
-
     return new_state
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from .comics import _COMICS_WITH_META
+from .comics import _COMICS_WITH_META, _iter_dicts
 from .metadata import get_comic_id_by_uuid
 
 
@@ -45,7 +45,8 @@ def get_all_tags_with_counts(conn) -> list[dict]:
 
 def get_comics_for_tag(conn, tag_name: str) -> list[dict]:
     """All comics with the given tag, grouped by folder."""
-    cur = conn.execute(
+    rows = _iter_dicts(
+        conn,
         _COMICS_WITH_META
         + """
          INNER JOIN comic_tags ct ON ct.comic_id = c.id
@@ -54,7 +55,6 @@ def get_comics_for_tag(conn, tag_name: str) -> list[dict]:
         + " WHERE t.name = ? ORDER BY f.name, c.filename",
         (tag_name,),
     )
-    rows = [dict(row) for row in cur.fetchall()]
     groups: dict[str, list] = {}
     for row in rows:
         key = row["folder_name"] or ""
@@ -71,7 +71,6 @@ def delete_tag(conn, tag_name: str) -> bool:
         return False
     conn.execute("DELETE FROM comic_tags WHERE tag_id = ?", (row["id"],))
     conn.execute("DELETE FROM tags WHERE id = ?", (row["id"],))
-    conn.commit()
     return True
 
 
@@ -83,20 +82,13 @@ def set_tags_for_comic(conn, comic_uuid: str, tags: list[str]) -> list[str]:
 
     normalised = sorted({t.strip() for t in tags if t.strip()}, key=str.casefold)
 
-    tag_ids: list[int] = []
-    for name in normalised:
-        conn.execute(
-            "INSERT INTO tags (name) VALUES (?) ON CONFLICT(name) DO NOTHING",
-            (name,),
-        )
-        cur = conn.execute("SELECT id FROM tags WHERE name = ?", (name,))
-        tag_ids.append(cur.fetchone()["id"])
-
+    conn.executemany(
+        "INSERT INTO tags (name) VALUES (?) ON CONFLICT(name) DO NOTHING",
+        [(name,) for name in normalised],
+    )
     conn.execute("DELETE FROM comic_tags WHERE comic_id = ?", (comic_id,))
-    for tag_id in tag_ids:
-        conn.execute(
-            "INSERT INTO comic_tags (comic_id, tag_id) VALUES (?, ?)",
-            (comic_id, tag_id),
-        )
-    conn.commit()
+    conn.executemany(
+        "INSERT INTO comic_tags (comic_id, tag_id) SELECT ?, id FROM tags WHERE name = ?",
+        [(comic_id, name) for name in normalised],
+    )
     return normalised
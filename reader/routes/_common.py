@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import re
 import sys
 from pathlib import Path
 
-from fastapi import Request
+from fastapi import HTTPException, Request
 from fastapi.templating import Jinja2Templates
 
 from server.config import get_config
@@ -32,6 +33,23 @@ def url_path(request: Request, route_name: str, **path_params) -> str:
 
 templates.env.globals["url_path"] = url_path
 
+# Templates ship with the app and never change while it runs: skip the per-render
+# mtime check and compile everything once up front instead of on first hit.
+templates.env.auto_reload = False
+templates.env.cache = {}
+for _name in templates.env.list_templates(extensions=["html"]):
+    templates.env.get_template(_name)
+
+
+# Comic uuids are str(uuid4()); anything else cannot be in the library.
+_COMIC_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def require_comic_uuid(comic_uuid: str) -> None:
+    """404 for malformed comic uuids before any database or archive work."""
+    if not _COMIC_UUID_RE.fullmatch(comic_uuid):
+        raise HTTPException(status_code=404, detail="Comic not found")
+
 
 def _library_title() -> str:
     try:
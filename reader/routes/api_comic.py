@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
-from server.database import db_connection
+from server.database import db_connection, transaction
+from server.utils import etag_matches
 from .. import repo
 from .. import services
+from ._common import require_comic_uuid
 
 router = APIRouter(tags=["reader"])
 
@@ -49,6 +51,7 @@ class ProgressUpdate(BaseModel):
 @router.get("/api/comic/{comic_uuid}")
 def api_comic_info(comic_uuid: str):
     """JSON: comic title and page count."""
+    require_comic_uuid(comic_uuid)
     comic = services.get_comic_by_uuid(comic_uuid)
     if not comic:
         raise HTTPException(status_code=404, detail="Comic not found")
@@ -56,18 +59,26 @@ def api_comic_info(comic_uuid: str):
 
 
 @router.get("/api/comic/{comic_uuid}/page/{page_num:int}")
-def api_comic_page(comic_uuid: str, page_num: int):
-    """Image bytes for one page (1-based)."""
-    if page_num < 1:
+async def api_comic_page(comic_uuid: str, page_num: int, request: Request):
+    """Image bytes for one page (1-based). Answers 304 when the client's ETag is current.
+
+    Archive work runs on the reader's archive executor, not the shared threadpool.
+    """
+    require_comic_uuid(comic_uuid)
+    page = await services.run_archive_io(services.resolve_page, comic_uuid, page_num - 1)
+    if not page:
         raise HTTPException(status_code=404, detail="Page not found")
-    result = services.get_page_image(comic_uuid, page_num - 1)
+    headers = {"ETag": page.etag, "Cache-Control": "private, max-age=3600"}
+    if etag_matches(request.headers.get("if-none-match"), page.etag):
+        return Response(status_code=304, headers=headers)
+    result = await services.run_archive_io(services.get_page_stream, page)
     if not result:
         raise HTTPException(status_code=404, detail="Page not found")
-    data, content_type = result
-    return Response(
-        content=data,
+    chunks, content_type, length = result
+    return StreamingResponse(
+        services.aiter_archive_chunks(chunks),
         media_type=content_type,
-        headers={"Cache-Control": "private, max-age=3600"},
+        headers={**headers, "Content-Length": str(length)},
     )
 
 
@@ -77,6 +88,7 @@ def api_comic_page(comic_uuid: str, page_num: int):
 @router.get("/api/comic/{comic_uuid}/metadata")
 def api_comic_metadata_get(comic_uuid: str):
     """JSON: comic filename, uuid, editable metadata, and tags."""
+    require_comic_uuid(comic_uuid)
     with db_connection() as conn:
         out = repo.get_metadata(conn, comic_uuid)
         if out is None:
@@ -88,12 +100,14 @@ def api_comic_metadata_get(comic_uuid: str):
 @router.patch("/api/comic/{comic_uuid}/metadata")
 def api_comic_metadata_patch(comic_uuid: str, body: MetadataUpdate):
     """Update editable metadata (partial)."""
-    with db_connection() as conn:
-        if repo.get_comic_id_by_uuid(conn, comic_uuid) is None:
-            raise HTTPException(status_code=404, detail="Comic not found")
-        payload = body.model_dump(exclude_unset=True)
-        repo.update_metadata(conn, comic_uuid, payload)
-        return {"ok": True}
+    require_comic_uuid(comic_uuid)
+    # Only the fields the client sent; no full model_dump walk for a one-field PATCH.
+    payload = {k: getattr(body, k) for k in body.model_fields_set}
+    with db_connection() as conn, transaction(conn):
+        found = repo.update_metadata(conn, comic_uuid, payload)
+    if not found:
+        raise HTTPException(status_code=404, detail="Comic not found")
+    return {"ok": True}
 
 
 # --- Tags ---
@@ -102,6 +116,7 @@ def api_comic_metadata_patch(comic_uuid: str, body: MetadataUpdate):
 @router.get("/api/comic/{comic_uuid}/tags")
 def api_comic_tags_get(comic_uuid: str):
     """JSON: list of tags for a comic."""
+    require_comic_uuid(comic_uuid)
     with db_connection() as conn:
         if repo.get_comic_id_by_uuid(conn, comic_uuid) is None:
             raise HTTPException(status_code=404, detail="Comic not found")
@@ -112,10 +127,12 @@ def api_comic_tags_get(comic_uuid: str):
 @router.put("/api/comic/{comic_uuid}/tags")
 def api_comic_tags_put(comic_uuid: str, body: TagsUpdate):
     """Replace tag list for a comic."""
+    require_comic_uuid(comic_uuid)
     with db_connection() as conn:
         if repo.get_comic_id_by_uuid(conn, comic_uuid) is None:
             raise HTTPException(status_code=404, detail="Comic not found")
-        tags = repo.set_tags_for_comic(conn, comic_uuid, body.tags)
+        with transaction(conn):
+            tags = repo.set_tags_for_comic(conn, comic_uuid, body.tags)
         return {"ok": True, "tags": tags}
 
 
@@ -129,7 +146,7 @@ def api_tags_list():
 @router.delete("/api/tags/{tag_name}")
 def api_tag_delete(tag_name: str):
     """Delete a tag globally (removes it from all comics)."""
-    with db_connection() as conn:
+    with db_connection() as conn, transaction(conn):
         found = repo.delete_tag(conn, tag_name)
     if not found:
         raise HTTPException(status_code=404, detail="Tag not found")
@@ -142,6 +159,7 @@ def api_tag_delete(tag_name: str):
 @router.get("/api/comic/{comic_uuid}/progress")
 def api_comic_progress_get(comic_uuid: str):
     """JSON: current_page, is_completed, last_read_at."""
+    require_comic_uuid(comic_uuid)
     with db_connection() as conn:
         out = repo.get_progress(conn, comic_uuid)
         if out is None:
@@ -152,28 +170,32 @@ def api_comic_progress_get(comic_uuid: str):
 @router.patch("/api/comic/{comic_uuid}/progress")
 def api_comic_progress_patch(comic_uuid: str, body: ProgressUpdate):
     """Update reading progress."""
-    with db_connection() as conn:
-        if repo.get_comic_id_by_uuid(conn, comic_uuid) is None:
-            raise HTTPException(status_code=404, detail="Comic not found")
-        repo.update_progress(conn, comic_uuid, body.current_page, body.is_completed)
-        return {"ok": True}
+    require_comic_uuid(comic_uuid)
+    with db_connection() as conn, transaction(conn):
+        found = repo.update_progress(conn, comic_uuid, body.current_page, body.is_completed)
+    if not found:
+        raise HTTPException(status_code=404, detail="Comic not found")
+    return {"ok": True}
 
 
 @router.post("/api/comic/{comic_uuid}/progress/clear")
 def api_comic_progress_clear(comic_uuid: str):
     """Remove from Continue Reading: reset progress."""
-    with db_connection() as conn:
-        if repo.get_comic_id_by_uuid(conn, comic_uuid) is None:
-            raise HTTPException(status_code=404, detail="Comic not found")
-        repo.clear_progress(conn, comic_uuid)
-        return Response(content="", status_code=200)
+    require_comic_uuid(comic_uuid)
+    with db_connection() as conn, transaction(conn):
+        found = repo.clear_progress(conn, comic_uuid)
+    if not found:
+        raise HTTPException(status_code=404, detail="Comic not found")
+    return Response(content="", status_code=200)
 
 
 @router.post("/api/comic/{comic_uuid}/completed/toggle")
 def api_comic_completed_toggle(comic_uuid: str):
     """Toggle comic completed state."""
+    require_comic_uuid(comic_uuid)
     with db_connection() as conn:
         if repo.get_comic_id_by_uuid(conn, comic_uuid) is None:
             raise HTTPException(status_code=404, detail="Comic not found")
-        is_completed = repo.toggle_comic_completed(conn, comic_uuid)
+        with transaction(conn):
+            is_completed = repo.toggle_comic_completed(conn, comic_uuid)
         return {"ok": True, "is_completed": bool(is_completed)}
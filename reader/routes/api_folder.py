@@ -5,7 +5,7 @@ from __future__ import annotations
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
-from server.database import db_connection
+from server.database import db_connection, transaction
 from .. import repo
 from ._common import templates
 
@@ -29,7 +29,8 @@ def api_folder_ongoing_patch(folder_id: int, body: OngoingUpdate):
             )
         if body.ongoing and repo.folder_comic_count(conn, folder_id) == 0:
             raise HTTPException(status_code=400, detail="Folder has no comics")
-        repo.set_ongoing_series(conn, folder_id, body.ongoing)
+        with transaction(conn):
+            repo.set_ongoing_series(conn, folder_id, body.ongoing)
     return {"ok": True, "ongoing": body.ongoing}
 
 
@@ -52,7 +53,8 @@ def api_folder_complete_all(folder_id: int, request: Request):
         if not folder:
             raise HTTPException(status_code=404, detail="Folder not found")
 
-        repo.mark_all_comics_in_folder_completed(conn, folder_id)
+        with transaction(conn):
+            repo.mark_all_comics_in_folder_completed(conn, folder_id)
 
         comics = repo.get_comics_in_folder(conn, folder_id)
 
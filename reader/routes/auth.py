@@ -36,7 +36,9 @@ def reader_login_post(
     config = get_config()
     if not config.reader_auth.enabled:
         return RedirectResponse(url=url_path(request, "browse_root"), status_code=302)
-    if username != config.reader_auth.user or password != config.reader_auth.password:
+    if not reader_auth.credentials_match(
+        username, password, config.reader_auth.user, config.reader_auth.password
+    ):
         return _login_template(request, error="Invalid username or password.", next=next)
     cookie_value = reader_auth.create_session_cookie_value(
         config.reader_auth.user, config.reader_auth.password
@@ -5,10 +5,16 @@ from __future__ import annotations
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import RedirectResponse
 
-from server.database import db_connection
+from server.database import db_connection, read_snapshot
 from .. import repo
 from .. import services
-from ._common import templates, _library_title, _reader_auth_enabled, _folder_ongoing_context
+from ._common import (
+    templates,
+    _library_title,
+    _reader_auth_enabled,
+    _folder_ongoing_context,
+    require_comic_uuid,
+)
 
 router = APIRouter(tags=["reader"])
 
@@ -19,56 +25,57 @@ router = APIRouter(tags=["reader"])
 @router.get("/")
 def browse_root(request: Request):
     """Browse root: first level (single folder contents or folder list + last added)."""
-    with db_connection() as conn:
+    with db_connection() as conn, read_snapshot(conn):
         top_folders = repo.get_top_folders(conn)
-
+        continue_reading = repo.get_continue_reading_comics(conn, 12)
         if len(top_folders) == 1:
             folder_id = top_folders[0]["id"]
             subfolders = repo.get_subfolders_with_item_count(conn, folder_id)
             comics = repo.get_comics_in_folder(conn, folder_id)
-            continue_reading = repo.get_continue_reading_comics(conn, 12)
             ongoing_ctx = _folder_ongoing_context(conn, folder_id)
-            return templates.TemplateResponse(
-                request,
-                "browser.html",
-                {
-                    "title": _library_title(),
-                    "breadcrumbs": [],
-                    "folders": subfolders,
-                    "comics": comics,
-                    "grouped_comics": [],
-                    "is_search": False,
-                    "show_last_added": False,
-                    "last_added_comics": [],
-                    "continue_reading_comics": continue_reading,
-                    "reader_auth_enabled": _reader_auth_enabled(),
-                    "folder_id": folder_id,
-                    **ongoing_ctx,
-                },
-            )
-
-        repo.add_folder_item_counts(conn, top_folders)
-        continue_reading = repo.get_continue_reading_comics(conn, 12)
+        else:
+            repo.add_folder_item_counts(conn, top_folders)
+
+    if len(top_folders) == 1:
         return templates.TemplateResponse(
             request,
             "browser.html",
             {
                 "title": _library_title(),
                 "breadcrumbs": [],
-                "folders": top_folders,
-                "comics": [],
+                "folders": subfolders,
+                "comics": comics,
                 "grouped_comics": [],
                 "is_search": False,
                 "show_last_added": False,
                 "last_added_comics": [],
                 "continue_reading_comics": continue_reading,
                 "reader_auth_enabled": _reader_auth_enabled(),
-                "folder_id": None,
-                "is_leaf": False,
-                "is_ongoing": False,
+                "folder_id": folder_id,
+                **ongoing_ctx,
             },
         )
 
+    return templates.TemplateResponse(
+        request,
+        "browser.html",
+        {
+            "title": _library_title(),
+            "breadcrumbs": [],
+            "folders": top_folders,
+            "comics": [],
+            "grouped_comics": [],
+            "is_search": False,
+            "show_last_added": False,
+            "last_added_comics": [],
+            "continue_reading_comics": continue_reading,
+            "reader_auth_enabled": _reader_auth_enabled(),
+            "folder_id": None,
+            "is_leaf": False,
+            "is_ongoing": False,
+        },
+    )
+
 
 # --- Browse: search ---
 
@@ -156,7 +163,7 @@ def browse_ongoings(request: Request):
 @router.get("/folder/{folder_id:int}")
 def browse_folder(request: Request, folder_id: int):
     """Browse a folder: subfolders and comics."""
-    with db_connection() as conn:
+    with db_connection() as conn, read_snapshot(conn):
         folder = repo.get_folder(conn, folder_id)
         if not folder:
             raise HTTPException(status_code=404, detail="Folder not found")
@@ -192,29 +199,26 @@ def browse_folder(request: Request, folder_id: int):
 @router.get("/comic/{comic_uuid}")
 def reader_view(request: Request, comic_uuid: str):
     """Reader page: open a comic and flip through pages."""
+    require_comic_uuid(comic_uuid)
     comic = services.get_comic_by_uuid(comic_uuid)
     if not comic:
         raise HTTPException(status_code=404, detail="Comic not found")
 
     page_count = comic["page_count"] or 1
     with db_connection() as conn:
-        initial_page = repo.get_initial_page(conn, comic_uuid, page_count)
-        folder_id = repo.get_folder_id_for_comic(conn, comic_uuid)
-        breadcrumbs = repo.get_breadcrumbs_for_folder(conn, folder_id) if folder_id else []
-        metadata = repo.get_metadata(conn, comic_uuid)
-        issue_title = (metadata or {}).get("title")
+        context = repo.get_reader_context(conn, comic["id"], comic["folder_id"], page_count)
 
     return templates.TemplateResponse(
         request,
         "reader.html",
         {
             "title": f"{comic['filename']} — {_library_title()}",
-            "breadcrumbs": breadcrumbs,
+            "breadcrumbs": context["breadcrumbs"],
             "comic_uuid": comic_uuid,
             "comic_filename": comic["filename"],
-            "issue_title": issue_title,
+            "issue_title": context["title"],
             "page_count": page_count,
-            "initial_page": initial_page,
+            "initial_page": context["initial_page"],
             "reader_auth_enabled": _reader_auth_enabled(),
         },
     )
@@ -7,14 +7,18 @@ Page order: natural sort (1, 2, 3, ..., 10).
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import IO, AsyncIterator, Callable, Iterator, NamedTuple, Optional, TypeVar
 
 from server.config import get_config
 from server.database import db_connection
 from server.path_utils import to_absolute
-from server.archive import get_archive
+from server.archive import ZipArchiveWrapper, get_archive, open_cached_archive
 
 _CONTENT_TYPES = {
     ".jpg": "image/jpeg",
@@ -23,22 +27,34 @@ _CONTENT_TYPES = {
     ".webp": "image/webp",
 }
 
+_DIGITS_RE = re.compile(r"(\d+)")
+
+# Streamed page chunk; large enough that a multi-MB page is a handful of threadpool hops.
+PAGE_CHUNK_SIZE = 256 * 1024
+
+# Archive reads get their own pool so a burst of page fetches cannot take every
+# slot of the shared threadpool that sync routes (browse, metadata) run in.
+ARCHIVE_IO_WORKERS = 8
+_ARCHIVE_EXECUTOR = ThreadPoolExecutor(max_workers=ARCHIVE_IO_WORKERS, thread_name_prefix="archive")
+
+_T = TypeVar("_T")
+
 
 def _natural_sort_key(name: str):
     """Sort key for image names so 1, 2, 10 order correctly (not 1, 10, 2)."""
-    parts = re.split(r"(\d+)", name)
-    return [
-        int(part) if part.isdigit() else part.lower()
-        for part in parts
-    ]
+    # split() with a capture group alternates text/digits: odd slots are the numbers.
+    parts = _DIGITS_RE.split(name.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return parts
 
 
 def get_comic_by_uuid(comic_uuid: str) -> Optional[dict]:
-    """Return comic info by UUID: path (absolute), page_count, filename. None if not found."""
+    """Return comic info by UUID: id, folder_id, path (absolute), page_count, filename,
+    page_manifest (JSON page names from the scanner, or None). None if not found."""
     config = get_config()
     with db_connection() as conn:
         cur = conn.execute(
-            "SELECT path, page_count, filename FROM comics WHERE uuid = ?",
+            "SELECT id, folder_id, path, page_count, filename, page_manifest FROM comics WHERE uuid = ?",
             (comic_uuid,),
         )
         row = cur.fetchone()
@@ -51,6 +67,8 @@ def get_comic_by_uuid(comic_uuid: str) -> Optional[dict]:
         return None
 
     page_count = row["page_count"] or 0
+    if page_count <= 0 and row["page_manifest"]:
+        page_count = len(json.loads(row["page_manifest"]))
     if page_count <= 0:
         try:
             with get_archive(abs_path) as archive:
@@ -59,16 +77,34 @@ def get_comic_by_uuid(comic_uuid: str) -> Optional[dict]:
             page_count = 0
 
     return {
+        "id": row["id"],
+        "folder_id": row["folder_id"],
         "path": abs_path,
         "page_count": page_count,
         "filename": row["filename"],
+        "page_manifest": row["page_manifest"],
     }
 
 
-def get_page_image(comic_uuid: str, page_index: int) -> Optional[tuple[bytes, str]]:
-    """Return (image_bytes, content_type) for comic page at 0-based index.
+@functools.lru_cache(maxsize=256)
+def _sorted_page_names(path: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    """Naturally sorted image names for an archive; mtime/size invalidate the cache."""
+    with open_cached_archive(Path(path)) as archive:
+        return tuple(sorted(archive.list_images(), key=_natural_sort_key))
 
-    Extracts the single requested page directly from the archive.
+
+class PageRef(NamedTuple):
+    """A resolved comic page: archive path, member name and an ETag for HTTP caching."""
+
+    path: Path
+    name: str
+    etag: str
+
+
+def resolve_page(comic_uuid: str, page_index: int) -> Optional[PageRef]:
+    """Locate a 0-based page without reading it. None if comic or page not found.
+
+    The ETag changes whenever the archive file is replaced or modified.
     """
     if page_index < 0:
         return None
@@ -77,16 +113,80 @@ def get_page_image(comic_uuid: str, page_index: int) -> Optional[tuple[bytes, st
     if not comic:
         return None
 
+    path = comic["path"]
+    try:
+        stat = path.stat()
+        if comic.get("page_manifest"):
+            names = json.loads(comic["page_manifest"])
+        else:
+            # Not scanned since the manifest column was added: list the archive.
+            names = _sorted_page_names(str(path), stat.st_mtime_ns, stat.st_size)
+    except Exception:
+        return None
+    if page_index >= len(names):
+        return None
+    etag = f'"{comic_uuid}-{page_index}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    return PageRef(path, names[page_index], etag)
+
+
+def _content_type(name: str) -> str:
+    # String slicing instead of Path(name).suffix: no PurePath parse per page request.
+    return _CONTENT_TYPES.get(name[name.rfind("."):].lower(), "image/jpeg")
+
+
+def get_page_image(comic_uuid: str, page_index: int) -> Optional[tuple[bytes, str]]:
+    """Return (image_bytes, content_type) for comic page at 0-based index.
+
+    Extracts the single requested page directly from the archive.
+    """
+    page = resolve_page(comic_uuid, page_index)
+    if not page:
+        return None
+    try:
+        with open_cached_archive(page.path) as archive:
+            data = archive.read(page.name)
+        return data, _content_type(page.name)
+    except Exception:
+        return None
+
+
+def get_page_stream(page: PageRef) -> Optional[tuple[Iterator[bytes], str, int]]:
+    """Return (chunks, content_type, length) for a resolved page.
+
+    CBZ pages are decompressed chunk by chunk while the response is sent
+    instead of being read into one bytes object; other formats yield a single
+    chunk from ``Archive.read``.
+    """
     try:
-        with get_archive(comic["path"]) as archive:
-            names = archive.list_images()
-            names.sort(key=_natural_sort_key)
-            if page_index >= len(names):
-                return None
-            name = names[page_index]
-            data = archive.read(name)
-            suffix = Path(name).suffix.lower()
-            content_type = _CONTENT_TYPES.get(suffix, "image/jpeg")
-            return data, content_type
+        with open_cached_archive(page.path) as archive:
+            if isinstance(archive, ZipArchiveWrapper):
+                handle = archive.open(page.name)
+                length = archive.file_size(page.name)
+            else:
+                data = archive.read(page.name)
+                return iter((data,)), _content_type(page.name), len(data)
     except Exception:
         return None
+    return _iter_chunks(handle), _content_type(page.name), length
+
+
+def _iter_chunks(handle: IO[bytes]) -> Iterator[bytes]:
+    with handle:
+        while chunk := handle.read(PAGE_CHUNK_SIZE):
+            yield chunk
+
+
+async def run_archive_io(func: Callable[..., _T], *args) -> _T:
+    """Run a blocking archive call on the dedicated archive executor."""
+    return await asyncio.get_running_loop().run_in_executor(_ARCHIVE_EXECUTOR, func, *args)
+
+
+async def aiter_archive_chunks(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Drain a page chunk iterator on the archive executor, one chunk per hop."""
+    try:
+        while chunk := await run_archive_io(next, chunks, b""):
+            yield chunk
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            await run_archive_io(close)
@@ -10,11 +10,14 @@ import os
 import shutil
 import subprocess
 import tempfile
+import threading
 import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
 from enum import StrEnum
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, Protocol, List
+from typing import IO, Iterator, Optional, Protocol, List
 
 try:
     import rarfile
@@ -38,6 +41,7 @@ except ImportError:
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 PDF_RENDER_DPI = 150  # DPI for rendering PDF pages to images
 PDF_MAX_CACHE_PAGES = 50  # Max pages to keep rendered in memory per session
+OPEN_ARCHIVE_CACHE_SIZE = 16  # Long-lived handles kept by open_cached_archive()
 
 
 class ComicFormat(StrEnum):
@@ -106,7 +110,10 @@ def detect_archive_format(path: Path) -> ComicFormat:
 
 
 def is_image(filename: str) -> bool:
-    return Path(filename).suffix.lower() in IMAGE_EXTENSIONS
+    # Plain string work: called for every archive member, so no PurePath per name.
+    basename = filename.rsplit("/", 1)[-1]
+    dot = basename.rfind(".")
+    return dot > 0 and basename[dot:].lower() in IMAGE_EXTENSIONS
 
 
 class Archive(Protocol):
@@ -143,6 +150,13 @@ class ZipArchiveWrapper:
     def read(self, filename: str) -> bytes:
         return self.zf.read(filename)
 
+    def open(self, filename: str) -> IO[bytes]:
+        """Stream one member; it stays readable after the wrapper is closed."""
+        return self.zf.open(filename)
+
+    def file_size(self, filename: str) -> int:
+        return self.zf.getinfo(filename).file_size
+
     def close(self) -> None:
         self.zf.close()
 
@@ -335,7 +349,9 @@ class PdfBookWrapper:
         self._page_names = [
             f"page_{i+1:04d}.png" for i in range(len(self._doc))
         ]
-        self._image_cache: dict[str, bytes] = {}  # LRU-bounded cache (max PDF_MAX_CACHE_PAGES entries)
+        self._image_cache: dict[str, bytes] = {}  # LRU-bounded cache (max max_cached_pages entries)
+        # open_cached_archive() sets this to 0: long-lived handles keep no renders.
+        self.max_cached_pages = PDF_MAX_CACHE_PAGES
 
     def list_images(self) -> List[str]:
         """Return synthetic page names as image list."""
@@ -375,9 +391,10 @@ class PdfBookWrapper:
             img_bytes = pix.tobytes("png")
 
             # Cache for this session (evict oldest entry when limit reached)
-            if len(self._image_cache) >= PDF_MAX_CACHE_PAGES:
-                self._image_cache.pop(next(iter(self._image_cache)))
-            self._image_cache[filename] = img_bytes
+            if self.max_cached_pages > 0:
+                if len(self._image_cache) >= self.max_cached_pages:
+                    self._image_cache.pop(next(iter(self._image_cache)))
+                self._image_cache[filename] = img_bytes
             return img_bytes
 
         except Exception as exc:
@@ -451,3 +468,75 @@ def get_archive(
         raise ValueError(
             f"Cannot open {path.name} as {comic_format.value}: {exc}"
         ) from exc
+
+
+class _CachedArchive:
+    """An open archive shared between requests; ``lock`` serializes access."""
+
+    def __init__(self, archive: Archive):
+        self.archive = archive
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+            self.archive.close()
+
+
+_open_archives: OrderedDict[tuple[str, int, int], _CachedArchive] = OrderedDict()
+_open_archives_lock = threading.Lock()
+
+
+@contextmanager
+def open_cached_archive(path: Path) -> Iterator[Archive]:
+    """Borrow a long-lived handle for *path* from a small LRU of open archives.
+
+    Meant for the reader, which fetches one page per request from the same few
+    files: the central directory is parsed once instead of on every page.
+    Handles are keyed by (path, mtime, size) and stay open after the block;
+    use ``get_archive`` for one-off access such as scanning. PDF handles
+    opened here keep no rendered pages, so memory held by the LRU stays
+    bounded by OPEN_ARCHIVE_CACHE_SIZE open documents.
+    """
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    while True:
+        with _open_archives_lock:
+            entry = _open_archives.get(key)
+            if entry is not None:
+                _open_archives.move_to_end(key)
+        if entry is None:
+            archive = get_archive(path)
+            if isinstance(archive, PdfBookWrapper):
+                archive.max_cached_pages = 0
+            entry = _cache_archive(key, archive)
+        with entry.lock:
+            if entry.closed:
+                continue  # evicted between lookup and lock; open it again
+            yield entry.archive
+            return
+
+
+def _cache_archive(key: tuple[str, int, int], archive: Archive) -> _CachedArchive:
+    evicted: list[_CachedArchive] = []
+    with _open_archives_lock:
+        entry = _open_archives.get(key)
+        if entry is None:
+            entry = _open_archives[key] = _CachedArchive(archive)
+            while len(_open_archives) > OPEN_ARCHIVE_CACHE_SIZE:
+                evicted.append(_open_archives.popitem(last=False)[1])
+        else:
+            evicted.append(_CachedArchive(archive))  # lost a race; keep the cached one
+    for stale in evicted:
+        stale.close()
+    return entry
+
+
+def close_cached_archives() -> None:
+    """Close every handle held by ``open_cached_archive`` (server shutdown, tests)."""
+    with _open_archives_lock:
+        entries = list(_open_archives.values())
+        _open_archives.clear()
+    for entry in entries:
+        entry.close()
@@ -92,29 +92,47 @@ def _local_name(tag: str) -> str:
     return tag.split("}")[-1].lower() if "}" in tag else tag.lower()
 
 
-def parse_comicinfo_xml(xml_bytes: bytes) -> ComicInfoParsed:
-    """Parse ComicInfo.xml content into a validated Pydantic model. <Series> is ignored."""
-    raw: dict[str, object] = {}
+_INT_KEYS = frozenset({"issue_number", "month", "year"})
+
+
+def _parse_root(xml_bytes: bytes):
+    """Root element of *xml_bytes*, or None on malformed XML."""
     try:
-        root = ET.fromstring(xml_bytes)
+        return ET.fromstring(xml_bytes)
     except ET.ParseError:
+        return None
+
+
+def parse_comicinfo_xml(xml_bytes: bytes) -> ComicInfoParsed:
+    """Parse ComicInfo.xml content into a ComicInfoParsed. <Series> is ignored.
+
+    Built with model_construct(), so pydantic does not validate: ints are
+    coerced by _int_or_none and every other field is a plain string.
+    """
+    root = _parse_root(xml_bytes)
+    if root is None:
         return ComicInfoParsed()
 
-    by_lower = {_local_name(elem.tag): elem for elem in root}
+    # Single pass over the children; a repeated tag keeps its last occurrence.
+    texts: dict[str, Optional[str]] = {}
+    for elem in root:
+        our_key = TAG_MAP.get(_local_name(elem.tag))
+        if our_key is not None:
+            texts[our_key] = _text(elem)
 
-    for xml_tag_lower, our_key in TAG_MAP.items():
-        elem = by_lower.get(xml_tag_lower)
-        text = _text(elem) if elem is not None else None
+    raw: dict[str, object] = {}
+    for our_key, text in texts.items():
         if text is None:
             continue
-        if our_key in ("issue_number", "month", "year"):
+        if our_key in _INT_KEYS:
             val = _int_or_none(text)
             if val is not None:
                 raw[our_key] = val
         else:
             raw[our_key] = text
 
-    return ComicInfoParsed.model_validate(raw)
+    # raw only holds stripped strings and ints from _int_or_none: skip re-validation.
+    return ComicInfoParsed.model_construct(**raw)
 
 
 def read_comicinfo_from_archive(archive_path: Path) -> Optional[ComicInfoParsed]:
@@ -126,7 +144,7 @@ def read_comicinfo_from_archive(archive_path: Path) -> Optional[ComicInfoParsed]
         with get_archive(archive_path) as archive:
             names = archive.list_names()
             comicinfo_name = next(
-                (n for n in names if Path(n).name.lower() == "comicinfo.xml"),
+                (n for n in names if n.rsplit("/", 1)[-1].lower() == "comicinfo.xml"),
                 None,
             )
             if comicinfo_name is None:
@@ -135,6 +153,7 @@ def read_comicinfo_from_archive(archive_path: Path) -> Optional[ComicInfoParsed]
     except Exception:
         return None
 
-    if not raw.strip():
+    # isspace() stops at the first non-blank byte; strip() would copy the whole file.
+    if not raw or raw.isspace():
         return None
     return parse_comicinfo_xml(raw)
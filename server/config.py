@@ -9,8 +9,10 @@ from __future__ import annotations
 
 import configparser
 import dataclasses
+import functools
 import os
 import pathlib
+import re
 import sys
 from typing import Optional
 
@@ -38,20 +40,23 @@ RESOURCE_ROOT = _get_resource_root()
 DATA_DIR = pathlib.Path(os.environ.get("DATA_DIR", str(PROJECT_ROOT)))
 DEFAULT_CONFIG_PATH = DATA_DIR / "config.ini"
 
+# Config objects are frozen: load_config hands every caller the same cached
+# instance, so nobody may mutate it. Use dataclasses.replace() for variants.
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class LibraryConfig:
     path: pathlib.Path
     name: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ServerConfig:
     host: str = "0.0.0.0"
     port: int = 8080
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ThumbnailConfig:
     width: int = 300
     height: int = 450
@@ -59,20 +64,25 @@ class ThumbnailConfig:
     format: str = "jpeg"
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ScannerConfig:
     supported_formats: tuple[str, ...] = ("cbz", "cbr", "cb7", "pdf")
     ignore_patterns: tuple[str, ...] = (".DS_Store", "Thumbs.db", "@eaDir")
     unrar_tool: str = "unrar"
+    workers: int = 0  # Archive/thumbnail threads; 0 = min(8, CPU count)
+
+    @property
+    def worker_count(self) -> int:
+        return self.workers if self.workers > 0 else min(8, os.cpu_count() or 1)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class MonitoringConfig:
     enabled: bool = True
     debounce_seconds: int = 2
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ReaderAuthConfig:
     """Credentials for web reader access. If both set, login is required."""
 
@@ -84,7 +94,7 @@ class ReaderAuthConfig:
         return bool(self.user.strip() and self.password)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class IssuedConfig:
     library: LibraryConfig
     server: ServerConfig
@@ -123,65 +133,118 @@ def _parse_bool(value: str, default: bool) -> bool:
 def load_config(config_path: Optional[pathlib.Path] = None) -> IssuedConfig:
     """Load configuration from config.ini.
 
-    Defaults to `config.ini` in the project root.
+    Defaults to `config.ini` in the project root. Parsed results are cached
+    per (path, mtime, size), so repeated calls only re-read the file after it changes.
     """
     path = config_path or DEFAULT_CONFIG_PATH
-    if not path.exists():
-        raise FileNotFoundError(f"Config file not found: {path}")
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {path}") from None
+    return _load_config_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
+_SECTION_RE = re.compile(r"^\[([^\]]+)\]\s*$")
+_KV_RE = re.compile(r"^([^=:\s;#][^=:]*?)\s*=\s*(.*?)\s*$")
+
+
+def _read_ini(path: pathlib.Path) -> dict[str, dict[str, str]]:
+    """Sections of a plain ``[section]`` / ``key = value`` INI file.
+
+    Handles the subset config.ini.example uses with two regexes. Anything
+    configparser treats specially (continuation lines, ``:`` delimiters,
+    ``%`` interpolation, DEFAULT, duplicates) falls back to configparser.
+    """
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return _read_ini_configparser(path)
+
+    sections: dict[str, dict[str, str]] = {}
+    current: Optional[dict[str, str]] = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#;":
+            continue
+        if line[0].isspace():
+            return _read_ini_configparser(path)
+        match = _SECTION_RE.match(line)
+        if match:
+            name = match.group(1)
+            if name in sections or name == configparser.DEFAULTSECT:
+                return _read_ini_configparser(path)
+            current = sections[name] = {}
+            continue
+        match = _KV_RE.match(line)
+        if match is None or current is None or "%" in match.group(2):
+            return _read_ini_configparser(path)
+        key = match.group(1).lower()
+        if key in current:
+            return _read_ini_configparser(path)
+        current[key] = match.group(2)
+    return sections
+
 
+def _read_ini_configparser(path: pathlib.Path) -> dict[str, dict[str, str]]:
     parser = configparser.ConfigParser()
     parser.read(path)
+    return {name: dict(parser.items(name)) for name in parser.sections()}
 
-    lib_path = pathlib.Path(
-        parser.get("library", "path", fallback="/path/to/comics")
-    ).expanduser()
-    lib_name = parser.get("library", "name", fallback="My Comic Library")
+
+def _ini_int(sections: dict[str, dict[str, str]], section: str, key: str, fallback: int) -> int:
+    value = sections.get(section, {}).get(key)
+    return fallback if value is None else int(value)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path_str: str, mtime_ns: int, size: int) -> IssuedConfig:
+    """Parse config.ini; *mtime_ns* and *size* are only part of the cache key."""
+    ini = _read_ini(pathlib.Path(path_str))
+    library = ini.get("library", {})
+    server_ini = ini.get("server", {})
+    thumbnails_ini = ini.get("thumbnails", {})
+    scanner_ini = ini.get("scanner", {})
+    monitoring_ini = ini.get("monitoring", {})
+
+    lib_path = pathlib.Path(library.get("path", "/path/to/comics")).expanduser()
+    lib_name = library.get("name", "My Comic Library")
 
     server = ServerConfig(
-        host=parser.get("server", "host", fallback="0.0.0.0"),
-        port=parser.getint("server", "port", fallback=8080),
+        host=server_ini.get("host", "0.0.0.0"),
+        port=_ini_int(ini, "server", "port", 8080),
     )
 
     thumbs = ThumbnailConfig(
-        width=parser.getint("thumbnails", "width", fallback=300),
-        height=parser.getint("thumbnails", "height", fallback=450),
-        quality=parser.getint("thumbnails", "quality", fallback=85),
-        format=parser.get("thumbnails", "format", fallback="jpeg"),
+        width=_ini_int(ini, "thumbnails", "width", 300),
+        height=_ini_int(ini, "thumbnails", "height", 450),
+        quality=_ini_int(ini, "thumbnails", "quality", 85),
+        format=thumbnails_ini.get("format", "jpeg"),
     )
 
     scanner = ScannerConfig(
         supported_formats=tuple(
             f.strip()
-            for f in parser.get(
-                "scanner", "supported_formats", fallback="cbz,cbr,cb7,pdf"
-            ).split(",")
+            for f in scanner_ini.get("supported_formats", "cbz,cbr,cb7,pdf").split(",")
             if f.strip()
         ),
         ignore_patterns=tuple(
             p.strip()
-            for p in parser.get(
-                "scanner",
-                "ignore_patterns",
-                fallback=".DS_Store,Thumbs.db,@eaDir",
-            ).split(",")
+            for p in scanner_ini.get("ignore_patterns", ".DS_Store,Thumbs.db,@eaDir").split(",")
             if p.strip()
         ),
-        unrar_tool=parser.get("scanner", "unrar_tool", fallback="unrar"),
+        unrar_tool=scanner_ini.get("unrar_tool", "unrar"),
+        workers=_ini_int(ini, "scanner", "workers", 0),
     )
 
     monitoring = MonitoringConfig(
-        enabled=_parse_bool(
-            parser.get("monitoring", "enabled", fallback="true"), True
-        ),
-        debounce_seconds=parser.getint(
-            "monitoring", "debounce_seconds", fallback=2
-        ),
+        enabled=_parse_bool(monitoring_ini.get("enabled", "true"), True),
+        debounce_seconds=_ini_int(ini, "monitoring", "debounce_seconds", 2),
     )
 
-    if parser.has_section("reader"):
+    if "reader" in ini:
         reader_auth = ReaderAuthConfig(
-            user=parser.get("reader", "user", fallback="").strip(),
-            password=parser.get("reader", "password", fallback="").strip(),
+            user=ini["reader"].get("user", "").strip(),
+            password=ini["reader"].get("password", "").strip(),
         )
     else:
         reader_auth = ReaderAuthConfig()
@@ -211,6 +274,14 @@ def reset_config_cache() -> None:
     """Clear the cached config (useful for tests)."""
     global _cached_config
     _cached_config = None
+    _load_config_cached.cache_clear()
+
+
+# `path = ...` inside [library]: group 1 is everything from the header up to that line.
+_LIBRARY_PATH_RE = re.compile(
+    r"(^\[library\][ \t]*\n(?:(?![ \t]*\[)[^\n]*\n)*?)[ \t]*path[ \t]*=[^\n]*",
+    re.MULTILINE | re.IGNORECASE,
+)
 
 
 def ensure_config(
@@ -234,22 +305,13 @@ def ensure_config(
 
     content = example_path.read_text(encoding="utf-8")
 
-    # Replace library path line in the example content
-    lines = []
-    in_library_section = False
-    for line in content.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("[") and stripped.endswith("]"):
-            in_library_section = stripped.lower() == "[library]"
-            lines.append(line)
-            continue
-
-        if in_library_section and stripped.startswith("path "):
-            lines.append(f"path = {library_path}")
-        else:
-            lines.append(line)
-
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    # Replace the library path line in the example content
+    content = _LIBRARY_PATH_RE.sub(
+        lambda m: f"{m.group(1)}path = {library_path}", content, count=1
+    )
+    if not content.endswith("\n"):
+        content += "\n"
+    path.write_text(content, encoding="utf-8")
 
     thumbnails_dir = DATA_DIR / "thumbnails"
     thumbnails_dir.mkdir(parents=True, exist_ok=True)
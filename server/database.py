@@ -2,67 +2,207 @@
 
 from __future__ import annotations
 
+import atexit
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator, Iterator
-
-from sqlmodel import SQLModel, create_engine, Session
+from typing import TYPE_CHECKING, Generator, Iterator, Optional
 
 from .config import DATA_DIR
 
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlmodel import Session
+
 DB_PATH = DATA_DIR / "library.db"
 # Use SQLite with WAL mode enabled for concurrency
 SQLITE_URL = f"sqlite:///{DB_PATH}"
 
-# check_same_thread=False is needed for SQLite if using across threads (FastAPI)
-engine = create_engine(SQLITE_URL, connect_args={"check_same_thread": False})
+# Per-connection tuning. journal_mode=WAL is persistent in the file and is set
+# once by init_db; with WAL, synchronous=NORMAL only fsyncs at checkpoints.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",  # 256 MiB memory-mapped reads
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _apply_pragmas(dbapi_connection, connection_record=None) -> None:
+    for pragma in CONNECTION_PRAGMAS:
+        dbapi_connection.execute(pragma)
+
+
+# Created by get_engine() on first use, so importing this module (reader
+# routes, CLI --help) does not pull in SQLAlchemy/SQLModel.
+engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
 
 
 def get_session() -> Generator[Session, None, None]:
     """Dependency for FastAPI or context manager for scripts."""
-    with Session(engine) as session:
+    from sqlmodel import Session
+
+    with Session(get_engine()) as session:
         yield session
 
 
 def init_db() -> None:
     """Create database tables."""
+    from sqlmodel import SQLModel
+
     # Import models to ensure they are registered with SQLModel.metadata
     from . import models  # noqa: F401
 
     # Enable WAL mode for better concurrency
-    with engine.connect() as conn:
+    with get_engine().connect() as conn:
         conn.exec_driver_sql("PRAGMA journal_mode=WAL;")
         conn.exec_driver_sql("PRAGMA foreign_keys=ON;")
 
-    SQLModel.metadata.create_all(engine)
+    SQLModel.metadata.create_all(get_engine())
 
 
 def reset_database() -> None:
     """Delete the database file and recreate it."""
+    global _pool_generation
+    with _pool_lock:
+        _pool_generation += 1  # pooled handles still point at the unlinked file
+    for _, conn in getattr(_pool_local, "idle", ()):
+        _discard(conn)
+    _pool_local.idle = []
     if DB_PATH.exists():
         DB_PATH.unlink()
     init_db()
 
 
-def get_engine():
-    """Return the global engine instance."""
+def get_engine() -> Engine:
+    """Return the global engine instance, creating it on first call."""
+    global engine
+    if engine is None:
+        with _engine_lock:
+            if engine is None:
+                from sqlalchemy import event
+                from sqlmodel import create_engine
+
+                # check_same_thread=False is needed for SQLite if using across threads (FastAPI).
+                # Pooled connections keep their sqlite3 statement cache; size it like get_connection's.
+                new_engine = create_engine(
+                    SQLITE_URL,
+                    connect_args={"check_same_thread": False, "cached_statements": 256},
+                )
+                event.listen(new_engine, "connect", _apply_pragmas)
+                engine = new_engine
     return engine
 
 
 def get_connection() -> sqlite3.Connection:
     """Return a sqlite3 connection with row factory for dict-like access."""
-    connection = sqlite3.connect(DB_PATH)
+    # Room for every repo statement (the default cache holds 128) so hot queries stay prepared.
+    connection = sqlite3.connect(DB_PATH, cached_statements=256)
     connection.row_factory = sqlite3.Row
     connection.execute("PRAGMA foreign_keys=ON")
+    _apply_pragmas(connection)
     return connection
 
 
+# Per-thread pool of idle connections for db_connection(). Server and monitor
+# threads are long-lived, so most requests skip sqlite3.connect() and the
+# PRAGMA round trips entirely. A connection is checked out exclusively, so
+# nested db_connection() blocks get separate handles.
+POOL_SIZE_PER_THREAD = 2
+_pool_local = threading.local()
+_pool_lock = threading.Lock()
+_pool_generation = 0
+_pooled: set[sqlite3.Connection] = set()
+
+
+def _checkout() -> tuple[tuple[str, int], sqlite3.Connection]:
+    idle = getattr(_pool_local, "idle", None)
+    if idle is None:
+        idle = _pool_local.idle = []
+    key = (str(DB_PATH), _pool_generation)
+    while idle:
+        conn_key, conn = idle.pop()
+        if conn_key == key:
+            return key, conn
+        _discard(conn)
+    conn = get_connection()
+    with _pool_lock:
+        _pooled.add(conn)
+    return key, conn
+
+
+def _checkin(key: tuple[str, int], conn: sqlite3.Connection) -> None:
+    try:
+        if conn.in_transaction:
+            conn.rollback()  # closing used to discard uncommitted work; keep that
+    except sqlite3.Error:
+        _discard(conn)
+        return
+    conn.row_factory = sqlite3.Row
+    idle = _pool_local.idle
+    if len(idle) < POOL_SIZE_PER_THREAD:
+        idle.append((key, conn))
+    else:
+        _discard(conn)
+
+
+def _discard(conn: sqlite3.Connection) -> None:
+    with _pool_lock:
+        _pooled.discard(conn)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+@atexit.register
+def close_pooled_connections() -> None:
+    """Close every pooled connection (process exit)."""
+    with _pool_lock:
+        conns = list(_pooled)
+        _pooled.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            pass  # owned by another thread; the OS reclaims it at exit
+
+
 @contextmanager
 def db_connection() -> Iterator[sqlite3.Connection]:
-    """Context manager for sqlite3 connections. Auto-closes on exit."""
-    conn = get_connection()
+    """Context manager for a pooled sqlite3 connection, returned to this thread's pool on exit.
+
+    Anything left uncommitted is rolled back, as closing the connection used to do.
+    """
+    key, conn = _checkout()
     try:
         yield conn
     finally:
-        conn.close()
+        _checkin(key, conn)
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Group writes on *conn* into one commit; roll back if the block raises."""
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+@contextmanager
+def read_snapshot(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run several SELECTs on *conn* inside one read transaction.
+
+    The WAL read lock and snapshot are taken once instead of per statement,
+    and every query in the block sees the same state of the database.
+    """
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.rollback()
@@ -4,14 +4,19 @@ Provides centralized logging setup with:
 - File handler with rotation (10MB, 5 backups)
 - Rich console handler with colored output
 - Consistent formatting across all modules
+- Both handlers fed from a queue, so logging callers never wait on
+  Rich rendering or file rotation
 """
 
 from __future__ import annotations
 
+import atexit
+import copy
 import logging
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 from rich.console import Console
@@ -22,6 +27,21 @@ from rich.theme import Theme
 _logging_initialized = False
 
 
+class _InProcessQueueHandler(QueueHandler):
+    """QueueHandler that keeps exc_info for the listener.
+
+    The stock prepare() formats the record and drops exc_info, which is
+    meant for cross-process queues and would disable Rich tracebacks.
+    The queue here never leaves the process.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 def _get_data_dir() -> Path:
     """Return the data directory (same as config.DATA_DIR without circular import)."""
     env = os.environ.get("DATA_DIR")
@@ -80,11 +100,17 @@ def setup_logging(log_level: str = "INFO") -> None:
     )
     console_handler.setLevel(numeric_level)
     
-    # Configure root logger
+    # Configure root logger: callers only enqueue; a listener thread formats and writes
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)  # Capture everything, handlers filter
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(_InProcessQueueHandler(log_queue))
     
     # Silence noisy third-party loggers
     logging.getLogger("watchdog").setLevel(logging.WARNING)
@@ -6,6 +6,7 @@ Everything else (CLI, serve) goes through the functions below.
 
 from __future__ import annotations
 
+import functools
 import shutil
 import sqlite3
 from pathlib import Path
@@ -24,8 +25,9 @@ logger = get_logger(__name__)
 # Alembic config object — reused by every public function
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=1)
 def _alembic_cfg() -> AlembicConfig:
-    """Build an AlembicConfig that points at our alembic.ini."""
+    """Build an AlembicConfig that points at our alembic.ini (once per process)."""
     ini_path = RESOURCE_ROOT / "alembic.ini"
     cfg = AlembicConfig(str(ini_path))
     # Override script_location to an absolute path so it works regardless
@@ -129,24 +131,236 @@ def ensure_tags_tables() -> bool:
         conn.close()
 
 
+# Metadata columns mirrored into comics_fts next to comics.filename (revision 0009).
+COMICS_FTS_METADATA_COLUMNS = (
+    "title",
+    "series",
+    "writer",
+    "penciller",
+    "notes",
+    "summary",
+    "genre",
+    "publisher",
+)
+_FTS_COLUMNS = ", ".join(COMICS_FTS_METADATA_COLUMNS)
+_FTS_M_COLUMNS = ", ".join(f"m.{col}" for col in COMICS_FTS_METADATA_COLUMNS)
+
+
+def _comics_fts_trigger_ddl() -> dict[str, str]:
+    """CREATE TRIGGER statements that keep comics_fts in sync, keyed by trigger name.
+
+    Same triggers as migration 0009, for DBs stamped to head without running it.
+    """
+    columns = _FTS_COLUMNS
+    set_new = ", ".join(f"{col} = new.{col}" for col in COMICS_FTS_METADATA_COLUMNS)
+    set_null = ", ".join(f"{col} = NULL" for col in COMICS_FTS_METADATA_COLUMNS)
+    return {
+        "comics_fts_ai": """
+            CREATE TRIGGER IF NOT EXISTS comics_fts_ai AFTER INSERT ON comics BEGIN
+                INSERT INTO comics_fts (rowid, filename) VALUES (new.id, new.filename);
+            END
+        """,
+        "comics_fts_au": """
+            CREATE TRIGGER IF NOT EXISTS comics_fts_au AFTER UPDATE OF filename ON comics BEGIN
+                UPDATE comics_fts SET filename = new.filename WHERE rowid = new.id;
+            END
+        """,
+        "comics_fts_ad": """
+            CREATE TRIGGER IF NOT EXISTS comics_fts_ad AFTER DELETE ON comics BEGIN
+                DELETE FROM comics_fts WHERE rowid = old.id;
+            END
+        """,
+        "metadata_fts_ai": f"""
+            CREATE TRIGGER IF NOT EXISTS metadata_fts_ai AFTER INSERT ON metadata BEGIN
+                UPDATE comics_fts SET {set_new} WHERE rowid = new.comic_id;
+            END
+        """,
+        "metadata_fts_au": f"""
+            CREATE TRIGGER IF NOT EXISTS metadata_fts_au AFTER UPDATE OF {columns} ON metadata BEGIN
+                UPDATE comics_fts SET {set_new} WHERE rowid = new.comic_id;
+            END
+        """,
+        "metadata_fts_ad": f"""
+            CREATE TRIGGER IF NOT EXISTS metadata_fts_ad AFTER DELETE ON metadata BEGIN
+                UPDATE comics_fts SET {set_null} WHERE rowid = old.comic_id;
+            END
+        """,
+    }
+
+
+def comics_fts_exists(conn: sqlite3.Connection) -> bool:
+    """True once comics_fts has been created (migration 0005 or the serve-time repair)."""
+    return (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='comics_fts'"
+        ).fetchone()
+        is not None
+    )
+
+
+def ensure_comics_fts_table() -> bool:
+    """Create and backfill the ``comics_fts`` search index if it is missing.
+
+    Returns True when the table was created.  Databases created by
+    ``init_db`` and stamped straight to head never ran migrations 0005/0009.
+    """
+    if not DB_PATH.exists():
+        return False
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        if comics_fts_exists(conn):
+            return False
+        conn.execute(
+            "CREATE VIRTUAL TABLE comics_fts "
+            f"USING fts5(filename, {_FTS_COLUMNS}, tokenize='trigram')"
+        )
+        conn.execute(
+            f"INSERT INTO comics_fts (rowid, filename, {_FTS_COLUMNS}) "
+            f"SELECT c.id, c.filename, {_FTS_M_COLUMNS} "
+            "FROM comics c LEFT JOIN metadata m ON m.comic_id = c.id"
+        )
+        for ddl in _comics_fts_trigger_ddl().values():
+            conn.execute(ddl)
+        conn.commit()
+        logger.warning(
+            "Created missing comics_fts search index (schema repair; DB was already at head)."
+        )
+        return True
+    finally:
+        conn.close()
+
+
+def _invalidate_previews(folder_id: str) -> str:
+    """Trigger statement nulling preview_uuids on *folder_id* and its ancestors."""
+    return f"""
+        UPDATE folders SET preview_uuids = NULL
+        WHERE preview_uuids IS NOT NULL AND id IN (
+            WITH RECURSIVE chain(id) AS (
+                SELECT {folder_id}
+                UNION ALL
+                SELECT f.parent_id FROM folders f
+                INNER JOIN chain ON f.id = chain.id
+                WHERE f.parent_id IS NOT NULL
+            )
+            SELECT id FROM chain
+        );
+    """
+
+
+# Same triggers as migration 0006, for DBs stamped to head without running it.
+# Updates invalidate only when a comic changes folder: re-processing a changed
+# comic rewrites last_scanned_at but keeps the folder's cached preview.  The
+# WHEN clause matters because SQLite fires UPDATE OF folder_id whenever the
+# column is in the SET list, even if the value is unchanged.
+FOLDER_PREVIEW_TRIGGERS = {
+    "folder_preview_comics_ai": "AFTER INSERT ON comics BEGIN"
+    + _invalidate_previews("new.folder_id") + "END",
+    "folder_preview_comics_ad": "AFTER DELETE ON comics BEGIN"
+    + _invalidate_previews("old.folder_id") + "END",
+    "folder_preview_comics_au": "AFTER UPDATE OF folder_id ON comics"
+    " WHEN old.folder_id IS NOT new.folder_id BEGIN"
+    + _invalidate_previews("old.folder_id")
+    + _invalidate_previews("new.folder_id") + "END",
+    "folder_preview_folders_ai": "AFTER INSERT ON folders BEGIN"
+    + _invalidate_previews("new.parent_id") + "END",
+    "folder_preview_folders_ad": "AFTER DELETE ON folders BEGIN"
+    + _invalidate_previews("old.parent_id") + "END",
+    "folder_preview_folders_au": "AFTER UPDATE OF parent_id ON folders BEGIN"
+    + _invalidate_previews("old.parent_id")
+    + _invalidate_previews("new.parent_id") + "END",
+}
+
+
+def ensure_folder_preview_cache() -> bool:
+    """Add ``folders.preview_uuids`` and its invalidation triggers if missing.
+
+    Returns True when anything was created.  ``init_db`` builds the column
+    from the model but not the triggers, and DBs stamped to head skipped 0006.
+    """
+    if not DB_PATH.exists():
+        return False
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        created = False
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(folders)")}
+        if "preview_uuids" not in columns:
+            conn.execute("ALTER TABLE folders ADD COLUMN preview_uuids TEXT")
+            created = True
+        existing = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='trigger'")
+        }
+        for name, body in FOLDER_PREVIEW_TRIGGERS.items():
+            if name not in existing:
+                conn.execute(f"CREATE TRIGGER {name} {body}")
+                created = True
+        if created:
+            # Anything cached before the triggers existed may be stale.
+            conn.execute("UPDATE folders SET preview_uuids = NULL")
+            conn.commit()
+            logger.warning(
+                "Created folder preview cache column/triggers (schema repair; DB was already at head)."
+            )
+        return created
+    finally:
+        conn.close()
+
+
+def ensure_page_manifest_column() -> bool:
+    """Add ``comics.page_manifest`` if missing; returns True when it was added.
+
+    Legacy databases stamped to head by ``stamp_if_needed`` never ran 0007.
+    """
+    if not DB_PATH.exists():
+        return False
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(comics)")}
+        if "page_manifest" in columns:
+            return False
+        conn.execute("ALTER TABLE comics ADD COLUMN page_manifest TEXT")
+        conn.commit()
+        logger.warning(
+            "Created missing comics.page_manifest column (schema repair; DB was already at head)."
+        )
+        return True
+    finally:
+        conn.close()
+
+
 def _backup_db() -> None:
     """Copy library.db → library.db.bak (overwrite previous backup)."""
     if DB_PATH.exists():
         shutil.copy2(DB_PATH, DB_PATH.with_suffix(".db.bak"))
 
 
-def _alembic_version_exists() -> bool:
-    """Return True when the alembic_version table is present in the DB."""
+_NOT_MANAGED = object()
+
+
+def _read_revision():
+    """``alembic_version.version_num`` (None if the table is empty), or ``_NOT_MANAGED``.
+
+    One read-only open and a direct SELECT. Only a missing alembic_version
+    table means "not managed"; other errors (e.g. a locked database) are
+    raised so a managed DB is never stamped past pending migrations.
+    """
     if not DB_PATH.exists():
-        return False
-    conn = sqlite3.connect(DB_PATH)
+        return _NOT_MANAGED
+    conn = sqlite3.connect(f"{DB_PATH.resolve().as_uri()}?mode=ro", uri=True)
     try:
-        cur = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='alembic_version'"
-        )
-        return cur.fetchone() is not None
+        row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+    except sqlite3.OperationalError as exc:
+        if str(exc) == "no such table: alembic_version":
+            return _NOT_MANAGED
+        raise
     finally:
         conn.close()
+    return row[0] if row else None
+
+
+def _alembic_version_exists() -> bool:
+    """Return True when the alembic_version table is present in the DB."""
+    return _read_revision() is not _NOT_MANAGED
 
 
 def run_migrations(backup: bool = True) -> None:
@@ -177,26 +391,22 @@ def stamp_if_needed() -> None:
     alembic_command.stamp(_alembic_cfg(), "head")
 
 
+@functools.lru_cache(maxsize=1)
+def _head_rev() -> str:
+    """Head revision of the bundled scripts; walks migrations/versions once per process."""
+    script = ScriptDirectory.from_config(_alembic_cfg())
+    return script.get_current_head() or "unknown"
+
+
 def get_status() -> tuple[str | None, str]:
     """Return (current_revision, head_revision).
 
     current_revision is None when the DB does not exist or has never
     been stamped/migrated.
     """
-    cfg = _alembic_cfg()
-
     # Head is a static property of the migration scripts — no DB needed.
-    script = ScriptDirectory.from_config(cfg)
-    head_rev: str = script.get_current_head() or "unknown"
+    head_rev = _head_rev()
 
     # Current requires reading the DB.
-    if not DB_PATH.exists() or not _alembic_version_exists():
-        return None, head_rev
-
-    conn = sqlite3.connect(DB_PATH)
-    try:
-        cur = conn.execute("SELECT version_num FROM alembic_version")
-        row = cur.fetchone()
-        return (row[0] if row else None), head_rev
-    finally:
-        conn.close()
+    current = _read_revision()
+    return (None if current is _NOT_MANAGED else current), head_rev
@@ -8,12 +8,14 @@ from sqlmodel import Field, SQLModel, Relationship
 class FolderBase(SQLModel):
     name: str
     path: str = Field(unique=True, index=True)
-    parent_id: Optional[int] = Field(default=None, foreign_key="folders.id")
+    parent_id: Optional[int] = Field(default=None, foreign_key="folders.id", index=True)
 
 class Folder(FolderBase, table=True):
     __tablename__ = "folders"
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # JSON list of preview comic UUIDs for the reader; NULL = recompute on next read.
+    preview_uuids: Optional[str] = Field(default=None)
     
     # Relationships
     parent: Optional["Folder"] = Relationship(
@@ -31,15 +33,17 @@ class ComicBase(SQLModel):
     file_size: int
     page_count: int = 0
     file_modified_at: datetime
-    last_scanned_at: Optional[datetime] = None
+    last_scanned_at: Optional[datetime] = Field(default=None, index=True)
     thumbnail_generated: bool = False
-    folder_id: Optional[int] = Field(default=None, foreign_key="folders.id")
+    folder_id: Optional[int] = Field(default=None, foreign_key="folders.id", index=True)
 
 class Comic(ComicBase, table=True):
     __tablename__ = "comics"
     id: Optional[int] = Field(default=None, primary_key=True)
     uuid: str = Field(unique=True, index=True, default_factory=lambda: str(uuid.uuid4()))
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # JSON list of image names in reading order, written by the scanner.
+    page_manifest: Optional[str] = Field(default=None)
     
     # Relationships
     folder: Optional[Folder] = Relationship(back_populates="comics")
@@ -68,7 +72,7 @@ class ComicMetadataBase(SQLModel):
     # Reading progress (continue reading)
     is_completed: bool = False
     current_page: Optional[int] = None  # 1-based page last viewed
-    last_read_at: Optional[datetime] = None
+    last_read_at: Optional[datetime] = Field(default=None, index=True)
 
 class ComicMetadata(ComicMetadataBase, table=True):
     __tablename__ = "metadata"  # Override default table name to match legacy schema
@@ -91,4 +95,4 @@ class ComicTag(SQLModel, table=True):
     __tablename__ = "comic_tags"
 
     comic_id: int = Field(foreign_key="comics.id", primary_key=True)
-    tag_id: int = Field(foreign_key="tags.id", primary_key=True)
+    tag_id: int = Field(foreign_key="tags.id", primary_key=True, index=True)
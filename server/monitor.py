@@ -6,28 +6,82 @@ and automatically update the database.
 
 from __future__ import annotations
 
+import functools
+import os
 import time
 import queue
+from collections import OrderedDict
 from pathlib import Path
 from threading import Thread, Event
-from typing import Optional, Dict, Any, NamedTuple
+from typing import Optional, Any, NamedTuple
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
 from .config import IssuedConfig
 from .logging_config import get_logger
-from .scanner import is_comic_file, scan_folder, scan_file, delete_path, move_path
+from .scanner import COMIC_EXTENSIONS, apply_deletes_and_moves, scan_folder, scan_file
 
 logger = get_logger(__name__)
 
 
+# Cap on remembered modified paths, on top of the time-based pruning.
+DEBOUNCE_MAX_ENTRIES = 4096
+
+
 class MonitorTask(NamedTuple):
     action: str
     path: Path
     dest_path: Optional[Path] = None
 
 
+def _is_apple_double(src_path: str) -> bool:
+    """macOS ``._*`` metadata files; string ops only, no Path per event."""
+    return os.path.basename(src_path).startswith("._")
+
+
+@functools.lru_cache(maxsize=8192)
+def _is_comic_name(src_path: str) -> bool:
+    """Same answer as scanner.is_comic_file without building a Path.
+
+    Memoized per path: modify bursts repeat the same file many times. The
+    extension set is a module constant, so entries never go stale.
+    """
+    name = os.path.basename(src_path)
+    dot = name.rfind(".")
+    return dot > 0 and name[dot:].lower() in COMIC_EXTENSIONS
+
+
+class DedupTaskQueue(queue.Queue):
+    """Task queue that drops a scan or delete identical to one still waiting in it.
+
+    A burst of events for one path enqueues it once; it can be queued again
+    as soon as the worker has taken it. Moves are always queued: replaying
+    A->B after B->A is a different outcome from skipping it.
+    """
+
+    def _init(self, maxsize: int) -> None:
+        super()._init(maxsize)
+        self._waiting: set[MonitorTask] = set()
+
+    def put(self, item: MonitorTask, block: bool = True, timeout: Optional[float] = None) -> None:
+        if item.action != "move":
+            with self.mutex:
+                if item in self._waiting:
+                    return
+        super().put(item, block, timeout)
+
+    def _put(self, item: MonitorTask) -> None:
+        if item.action != "move":
+            self._waiting.add(item)
+        super()._put(item)
+
+    def _get(self) -> MonitorTask:
+        item = super()._get()
+        self._waiting.discard(item)
+        return item
+
+
 class ComicLibraryHandler(FileSystemEventHandler):
     """Handle filesystem events and push them to a processing queue."""
 
@@ -35,57 +89,77 @@ class ComicLibraryHandler(FileSystemEventHandler):
         super().__init__()
         self.task_queue = task_queue
         self.debounce_seconds = debounce_seconds
-        self._last_modified: Dict[str, float] = {}
+        # Oldest first: every write moves its key to the end with a newer timestamp.
+        self._last_modified: OrderedDict[str, float] = OrderedDict()
 
     def on_created(self, event: FileSystemEvent) -> None:
-        path = Path(event.src_path)
-        if path.name.startswith("._"):
+        src_path = event.src_path
+        if _is_apple_double(src_path):
             return
 
         if event.is_directory:
-            self.task_queue.put(MonitorTask("scan_folder", path))
-        elif is_comic_file(path):
-            self.task_queue.put(MonitorTask("scan_file", path))
+            self.task_queue.put(MonitorTask("scan_folder", Path(src_path)))
+        elif _is_comic_name(src_path):
+            self.task_queue.put(MonitorTask("scan_file", Path(src_path)))
 
     def on_deleted(self, event: FileSystemEvent) -> None:
-        path = Path(event.src_path)
-        if path.name.startswith("._"):
+        if _is_apple_double(event.src_path):
             return
-            
-        self.task_queue.put(MonitorTask("delete", path))
+
+        self.task_queue.put(MonitorTask("delete", Path(event.src_path)))
 
     def on_moved(self, event: FileSystemEvent) -> None:
-        src_path = Path(event.src_path)
-        dest_path = Path(event.dest_path)
-        
-        if src_path.name.startswith("._") or dest_path.name.startswith("._"):
+        if _is_apple_double(event.src_path) or _is_apple_double(event.dest_path):
             return
 
-        self.task_queue.put(MonitorTask("move", src_path, dest_path=dest_path))
+        self.task_queue.put(
+            MonitorTask("move", Path(event.src_path), dest_path=Path(event.dest_path))
+        )
 
     def on_modified(self, event: FileSystemEvent) -> None:
         if event.is_directory:
             return
 
-        path = Path(event.src_path)
-        if path.name.startswith("._") or not is_comic_file(path):
+        src_path = event.src_path
+        if _is_apple_double(src_path) or not _is_comic_name(src_path):
             return
 
         # Simple debounce for modified files
         now = time.time()
-        key = str(path)
+        key = src_path
         last = self._last_modified.get(key, 0)
         if now - last < self.debounce_seconds:
             return
         
         self._last_modified[key] = now
-        self.task_queue.put(MonitorTask("scan_file", path))
+        self._last_modified.move_to_end(key)
+        self.task_queue.put(MonitorTask("scan_file", Path(src_path)))
 
-        # Prune stale entries to prevent unbounded growth
+        # Prune stale entries from the old end to prevent unbounded growth
         cutoff = now - self.debounce_seconds * 2
-        self._last_modified = {
-            k: v for k, v in self._last_modified.items() if v > cutoff
-        }
+        last_modified = self._last_modified
+        while last_modified and (
+            len(last_modified) > DEBOUNCE_MAX_ENTRIES
+            or next(iter(last_modified.values())) <= cutoff
+        ):
+            last_modified.popitem(last=False)
+
+
+def _covered(parts: tuple[str, ...], roots: set[tuple[str, ...]]) -> bool:
+    """True if *parts* or one of its ancestors is in *roots*: one set lookup per depth."""
+    return any(parts[:i] in roots for i in range(1, len(parts) + 1))
+
+
+def _outermost(tasks_by_path: dict[Path, MonitorTask]) -> dict[Path, MonitorTask]:
+    """Keep only tasks whose path is not inside another task's path."""
+    roots: set[tuple[str, ...]] = set()
+    kept: dict[Path, MonitorTask] = {}
+    for path in sorted(tasks_by_path):
+        parts = path.parts
+        if not _covered(parts, roots):
+            roots.add(parts)
+            kept[path] = tasks_by_path[path]
+    return kept
 
 
 def optimize_tasks(tasks: list[MonitorTask]) -> list[MonitorTask]:
@@ -94,7 +168,7 @@ def optimize_tasks(tasks: list[MonitorTask]) -> list[MonitorTask]:
     Rules:
     1. If scanning a folder, ignore scans for its subfolders and files.
     2. If deleting a folder, ignore deletes for its subfolders/files.
-    3. Keep moves as is (usually unique per file/folder).
+    3. Keep every move, in order: replaying a move is not idempotent.
     """
     if not tasks:
         return []
@@ -105,46 +179,18 @@ def optimize_tasks(tasks: list[MonitorTask]) -> list[MonitorTask]:
     deletes = {t.path: t for t in tasks if t.action == "delete"}
     moves = [t for t in tasks if t.action == "move"]
 
-    # Optimize folder scans: remove subfolders if parent is scanned
-    # Sort by path length so we process parents first
-    sorted_folder_paths = sorted(scan_folders.keys())
-    final_scan_folders = {}
-    
-    for path in sorted_folder_paths:
-        # Check if any parent of 'path' is already in final_scan_folders
-        is_subfolder = False
-        for parent in final_scan_folders:
-            if path != parent and path.is_relative_to(parent):
-                is_subfolder = True
-                break
-        
-        if not is_subfolder:
-            final_scan_folders[path] = scan_folders[path]
+    # Optimize folder scans: remove subfolders if parent is scanned.
+    # Sorted order visits parents before children, so only minimal roots are kept.
+    final_scan_folders = _outermost(scan_folders)
+    folder_roots = {path.parts for path in final_scan_folders}
 
     # Optimize file scans: remove if inside a scanned folder
-    final_scan_files = []
-    for path, task in scan_files.items():
-        is_covered = False
-        for folder_path in final_scan_folders:
-            if path.is_relative_to(folder_path):
-                is_covered = True
-                break
-        if not is_covered:
-            final_scan_files.append(task)
+    final_scan_files = [
+        task for path, task in scan_files.items() if not _covered(path.parts, folder_roots)
+    ]
 
     # Optimize deletes: remove sub-paths if parent is deleted
-    sorted_delete_paths = sorted(deletes.keys())
-    final_deletes = {}
-    
-    for path in sorted_delete_paths:
-        is_subitem = False
-        for parent in final_deletes:
-            if path != parent and path.is_relative_to(parent):
-                is_subitem = True
-                break
-        
-        if not is_subitem:
-            final_deletes[path] = deletes[path]
+    final_deletes = _outermost(deletes)
 
     # Reassemble tasks in a logical order:
     # 1. Deletes (cleanup first)
@@ -175,17 +221,14 @@ def process_queue(task_queue: queue.Queue, config: IssuedConfig, stop_event: Eve
 
         # Start accumulating a batch
         batch = [first_task]
-        start_time = time.time()
-        
-        while (time.time() - start_time) < BATCH_WINDOW:
+        deadline = time.monotonic() + BATCH_WINDOW
+
+        while (remaining := deadline - time.monotonic()) > 0:
             try:
-                # Non-blocking get to drain queue
-                task = task_queue.get_nowait()
-                batch.append(task)
+                # Sleep until the next event or the end of the window, whichever comes first
+                batch.append(task_queue.get(timeout=remaining))
             except queue.Empty:
-                # Queue empty, wait a bit to see if more come (debounce burst)
-                time.sleep(0.1)
-                continue
+                break
         
         optimized_tasks = optimize_tasks(batch)
         for _ in range(len(batch)):
@@ -194,17 +237,25 @@ def process_queue(task_queue: queue.Queue, config: IssuedConfig, stop_event: Eve
             except ValueError:
                 pass # Ignore if called too many times
 
+        # Deletes and moves only touch the DB: apply the whole window in one commit.
+        deletes = [t.path for t in optimized_tasks if t.action == "delete"]
+        moves = [
+            (t.path, t.dest_path) for t in optimized_tasks if t.action == "move" and t.dest_path
+        ]
+        if deletes or moves:
+            try:
+                apply_deletes_and_moves(deletes, moves, config)
+            except Exception as e:
+                logger.error(f"Error applying deletes/moves: {e}")
+
+        # Scans read archives and write thumbnails: keep one commit per comic so
+        # the write lock is never held across that I/O.
         for task in optimized_tasks:
             try:
                 if task.action == "scan_folder":
                     scan_folder(task.path, config)
                 elif task.action == "scan_file":
                     scan_file(task.path, config)
-                elif task.action == "delete":
-                    delete_path(task.path, config)
-                elif task.action == "move":
-                    if task.dest_path:
-                        move_path(task.path, task.dest_path, config)
             except Exception as e:
                 logger.error(f"Error processing task {task}: {e}")
 
@@ -220,7 +271,7 @@ def start_file_monitoring(config: IssuedConfig) -> Optional[Observer]:
         logger.error(f"Library path does not exist: {library_path}")
         return None
 
-    task_queue: queue.Queue = queue.Queue()
+    task_queue: queue.Queue = DedupTaskQueue()
     stop_event = Event()
 
     # Start the worker thread
@@ -238,5 +289,7 @@ def start_file_monitoring(config: IssuedConfig) -> Optional[Observer]:
     observer = Observer()
     observer.schedule(event_handler, str(library_path), recursive=True)
     observer.start()
+    # Observer resolves to the native backend (inotify / FSEvents / Windows API).
+    logger.debug(f"File monitoring backend: {type(observer).__name__}")
 
     return observer
@@ -21,12 +21,12 @@ from typing import Optional
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from ..archive import close_cached_archives
 from ..logging_config import get_logger  # noqa: F401 – keep for patching compat
 from ..config import get_config  # noqa: F401 – re-exported for monkeypatching in tests
 from .middleware import (
     ReaderAuthMiddleware,
     RequestLoggingMiddleware,
-    _ReaderAccessFilter,
     _UvicornStartupFilter,
 )
 from .routes import router as _opds_router
@@ -36,13 +36,27 @@ logger = get_logger(__name__)
 
 
 def _get_lan_ip() -> Optional[str]:
-    """Return this machine's LAN IP (for OPDS URL when binding to 0.0.0.0)."""
+    """Return this machine's LAN IP (for OPDS URL when binding to 0.0.0.0).
+
+    A UDP connect only picks the outgoing route; no packet is sent. Hosts
+    without a default route fall back to the addresses of their own hostname.
+    """
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.settimeout(0.2)
             s.connect(("8.8.8.8", 80))
             return s.getsockname()[0]
+    except OSError:
+        pass
+    try:
+        infos = socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET)
     except OSError:
         return None
+    for info in infos:
+        ip = info[4][0]
+        if not ip.startswith("127."):
+            return ip
+    return None
 
 
 @asynccontextmanager
@@ -62,6 +76,7 @@ async def _lifespan(app: FastAPI):
 
     asyncio.create_task(_print_startup_messages())
     yield
+    close_cached_archives()
 
 
 app = FastAPI(title="Issued OPDS", lifespan=_lifespan)
@@ -99,7 +114,6 @@ def run_server(
     for name in ("uvicorn", "uvicorn.error", "uvicorn.access", "uvicorn.lifespan"):
         logging.getLogger(name).addFilter(startup_filter)
     logging.getLogger().addFilter(startup_filter)
-    logging.getLogger("uvicorn.access").addFilter(_ReaderAccessFilter())
 
     uvicorn.run(
         app,
@@ -107,6 +121,9 @@ def run_server(
         port=effective_port,
         log_level="info",
         log_config=None,
+        # setup_logging() keeps uvicorn.access at WARNING and uvicorn logs access
+        # lines at INFO, so don't let it build (and drop) one per request.
+        access_log=False,
     )
 
 
@@ -2,17 +2,37 @@
 
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Iterator
 from urllib.parse import quote
 
 from fastapi import Response
+from fastapi.responses import StreamingResponse
 
 from ..config import IssuedConfig
 
 
+# (epoch second, formatted) of the last _now_iso() call.
+_now_iso_cache: tuple[int, str] = (0, "")
+
+
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+    """Current UTC time, second precision; formatted at most once per second.
+
+    Racing threads may both format the same second, which is harmless.
+    """
+    global _now_iso_cache
+    now = int(time.time())
+    cached_at, formatted = _now_iso_cache
+    if cached_at != now:
+        formatted = (
+            datetime.fromtimestamp(now, timezone.utc)
+            .isoformat(timespec="seconds")
+            .replace("+00:00", "Z")
+        )
+        _now_iso_cache = (now, formatted)
+    return formatted
 
 
 def _root_href() -> str:
@@ -40,7 +60,8 @@ def _search_href(q: str) -> str:
 
 
 def _absolute_href(base_url: str, path: str) -> str:
-    return base_url.rstrip("/") + path
+    """*base_url* is stripped of its trailing slash once per request by the handler."""
+    return base_url + path
 
 
 def _escape_xml(s: str) -> str:
@@ -54,18 +75,23 @@ def _escape_xml(s: str) -> str:
     )
 
 
+_MEDIA_TYPES = {
+    "cbz": "application/x-cbz",
+    "cbr": "application/x-cbr",
+    "cb7": "application/x-7z-compressed",
+    "pdf": "application/pdf",
+}
+
+
 def _comic_media_type(fmt: str) -> str:
-    """Return the MIME type for a comic format string (e.g. 'cbz', 'pdf')."""
-    fmt_lower = fmt.lower()
-    if fmt_lower == "cbz":
-        return "application/x-cbz"
-    if fmt_lower == "cbr":
-        return "application/x-cbr"
-    if fmt_lower == "cb7":
-        return "application/x-7z-compressed"
-    if fmt_lower == "pdf":
-        return "application/pdf"
-    return "application/octet-stream"
+    """Return the MIME type for a comic format string (e.g. 'cbz', 'pdf').
+
+    The scanner stores formats lowercase, so the first lookup normally hits.
+    """
+    media_type = _MEDIA_TYPES.get(fmt)
+    if media_type is None:
+        media_type = _MEDIA_TYPES.get(fmt.lower(), "application/octet-stream")
+    return media_type
 
 
 def _get_library_title(config: IssuedConfig | None) -> str:
@@ -74,6 +100,23 @@ def _get_library_title(config: IssuedConfig | None) -> str:
     return config.library.name
 
 
+_FEED_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n'
+_FEED_CLOSE = "\n</feed>"
+_CATALOG_LINK_TYPE = 'type="application/atom+xml;profile=opds-catalog"'
+
+
+def _feed_head(feed_id: str, title: str, updated: str, self_href: str, start_href: str) -> str:
+    """Everything before a feed's first entry. *title* is escaped here."""
+    return (
+        f"{_FEED_OPEN}"
+        f"  <id>{feed_id}</id>\n"
+        f"  <title>{_escape_xml(title)}</title>\n"
+        f"  <updated>{updated}</updated>\n"
+        f'  <link rel="self" href="{self_href}" {_CATALOG_LINK_TYPE} />\n'
+        f'  <link rel="start" href="{start_href}" {_CATALOG_LINK_TYPE} />\n'
+    )
+
+
 def _xml_response(xml: str) -> Response:
     return Response(
         content=xml,
@@ -81,36 +124,63 @@ def _xml_response(xml: str) -> Response:
     )
 
 
+# Entries encoded per streamed chunk: bounded buffers, few threadpool hops.
+FEED_CHUNK_ENTRIES = 64
+
+
+def _iter_feed_chunks(head: str, entries: Iterable[str]) -> Iterator[bytes]:
+    batch = [head]
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= FEED_CHUNK_ENTRIES:
+            yield "".join(batch).encode("utf-8")
+            batch.clear()
+    batch.append(_FEED_CLOSE)
+    yield "".join(batch).encode("utf-8")
+
+
+def _xml_stream_response(head: str, entries: Iterable[str]) -> StreamingResponse:
+    """Stream a feed: *head* (everything up to the first entry), the entries, then ``</feed>``.
+
+    *entries* may be a generator, so entry XML is built as the body is sent
+    rather than held in memory as one string.
+    """
+    return StreamingResponse(
+        _iter_feed_chunks(head, entries),
+        media_type="application/atom+xml;profile=opds-catalog",
+    )
+
+
+def _collection_link_xml(base_url: str, folder_id: int, name: str) -> str:
+    """rel=collection line pointing a comic entry at its series (leaf) folder."""
+    return (
+        f'    <link rel="collection"'
+        f'          href="{base_url}{_folder_href(folder_id)}"'
+        f'          type="application/atom+xml;profile=opds-catalog;kind=acquisition"'
+        f'          title="{_escape_xml(name)}" />\n'
+    )
+
+
 def _comic_entry_xml(
     comic_uuid: str,
     title: str,
     updated_ts: str,
     media_type: str,
     base_url: str,
-    *,
-    series_folder_id: Optional[int] = None,
-    series_name: Optional[str] = None,
+    collection_link: str = "",
 ) -> str:
-    """Build OPDS entry XML for a comic. Adds rel=collection when folder is a series (leaf)."""
-    links = [
-        f'    <link rel="http://opds-spec.org/image/thumbnail"'
-        f'          href="{_absolute_href(base_url, _comic_thumb_href(comic_uuid))}" type="image/webp" />',
-        f'    <link rel="http://opds-spec.org/acquisition"'
-        f'          href="{_absolute_href(base_url, _comic_file_href(comic_uuid))}" type="{media_type}" />',
-    ]
-    if series_folder_id is not None and series_name is not None:
-        links.insert(
-            1,
-            f'    <link rel="collection"'
-            f'          href="{_absolute_href(base_url, _folder_href(series_folder_id))}"'
-            f'          type="application/atom+xml;profile=opds-catalog;kind=acquisition"'
-            f'          title="{_escape_xml(series_name)}" />',
-        )
-    links_str = "\n".join(links)
+    """Build OPDS entry XML for a comic.
+
+    *collection_link* comes from _collection_link_xml when the comic's folder
+    is a series; callers build it once per folder, not per entry. One f-string
+    per entry; feed builders join the entries once.
+    *base_url* has no trailing slash (see _absolute_href).
+    """
     return f"""
   <entry>
     <title>{_escape_xml(title)}</title>
     <id>urn:comic:{comic_uuid}</id>
     <updated>{updated_ts}</updated>
-{links_str}
+    <link rel="http://opds-spec.org/image/thumbnail"          href="{base_url}{_comic_thumb_href(comic_uuid)}" type="image/webp" />
+{collection_link}    <link rel="http://opds-spec.org/acquisition"          href="{base_url}{_comic_file_href(comic_uuid)}" type="{media_type}" />
   </entry>"""
@@ -5,89 +5,105 @@ from __future__ import annotations
 import logging
 from urllib.parse import quote
 
-from fastapi.responses import RedirectResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request, cookie_parser
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from ..config import get_config
 from reader import auth as reader_auth
 
 
-class ReaderAuthMiddleware(BaseHTTPMiddleware):
-    """Redirect to /reader/login when reader auth is enabled and session is invalid."""
+def _header(scope: Scope, name: bytes) -> str:
+    """First value of a raw ASGI header (lowercase *name*), or ''."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return ""
 
-    async def dispatch(self, request, call_next):
-        path = request.url.path
-        if not path.startswith("/reader"):
-            return await call_next(request)
-        if path.startswith("/reader/static"):
-            return await call_next(request)
-        if path == "/reader/login":
-            return await call_next(request)
-        if path == "/reader/logout" and request.method == "POST":
-            return await call_next(request)
+
+class ReaderAuthMiddleware:
+    """Redirect to /reader/login when reader auth is enabled and session is invalid.
+
+    Plain ASGI: reads path and cookie straight from the scope, no per-request
+    Request/Response objects or task group as with BaseHTTPMiddleware.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._is_public(scope):
+            await self.app(scope, receive, send)
+            return
         try:
             config = get_config()
         except FileNotFoundError:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
         if not config.reader_auth.enabled:
-            return await call_next(request)
-        cookie = request.cookies.get(reader_auth.SESSION_COOKIE_NAME)
+            await self.app(scope, receive, send)
+            return
+        cookie = cookie_parser(_header(scope, b"cookie")).get(reader_auth.SESSION_COOKIE_NAME)
         if reader_auth.verify_session_cookie(cookie, config.reader_auth.password):
-            return await call_next(request)
-        return RedirectResponse(
-            url="/reader/login?next=" + quote(path),
-            status_code=302,
+            await self.app(scope, receive, send)
+            return
+        location = "/reader/login?next=" + quote(scope["path"])
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 302,
+                "headers": [
+                    (b"location", location.encode("latin-1")),
+                    (b"content-length", b"0"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    def _is_public(scope: Scope) -> bool:
+        path = scope["path"]
+        return (
+            not path.startswith("/reader")
+            or path.startswith("/reader/static")
+            or path == "/reader/login"
+            or (path == "/reader/logout" and scope["method"] == "POST")
         )
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Log incoming requests with full URL for debugging."""
-
-    async def dispatch(self, request, call_next):
-        if not getattr(request.app.state, "logged_first_request", False):
-            _logger = logging.getLogger("issued.request")
-            user_agent = request.headers.get("user-agent", "")
-            client_name = user_agent.split("/")[0] if user_agent else "unknown"
-            client_ip = request.client.host if request.client else "unknown"
-            message = (
-                'client_connected="%s" ip="%s" url="%s %s" host="%s" ua="%s"'
-                % (
-                    client_name,
-                    client_ip,
-                    request.method,
-                    str(request.url),
-                    request.headers.get("host", ""),
-                    user_agent,
-                )
-            )
-            _logger.info(message)
-            request.app.state.logged_first_request = True
-        return await call_next(request)
-
-
-class _ReaderAccessFilter(logging.Filter):
-    """Filter out access log lines for successful requests to reduce console noise.
-    Keep errors (4xx, 5xx) visible for debugging.
+class RequestLoggingMiddleware:
+    """Log the first incoming request with full URL for debugging.
+
+    After that request every call is a plain flag test and forward.
     """
 
-    def filter(self, record: logging.LogRecord) -> bool:
-        try:
-            msg = record.getMessage()
-            if any(
-                pattern in msg
-                for pattern in [
-                    ' 200 OK',
-                    '" 200',
-                    ' 204 No Content',
-                    '" 204',
-                    ' 304 Not Modified',
-                    '" 304',
-                ]
-            ):
-                return False
-            return True
-        except Exception:
-            return True
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._first_request_pending = True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self._first_request_pending and scope["type"] == "http":
+            self._first_request_pending = False
+            _log_first_request(Request(scope))
+        await self.app(scope, receive, send)
+
+
+def _log_first_request(request: Request) -> None:
+    _logger = logging.getLogger("issued.request")
+    user_agent = request.headers.get("user-agent", "")
+    client_name = user_agent.split("/")[0] if user_agent else "unknown"
+    client_ip = request.client.host if request.client else "unknown"
+    message = (
+        'client_connected="%s" ip="%s" url="%s %s" host="%s" ua="%s"'
+        % (
+            client_name,
+            client_ip,
+            request.method,
+            str(request.url),
+            request.headers.get("host", ""),
+            user_agent,
+        )
+    )
+    _logger.info(message)
 
 
 class _UvicornStartupFilter(logging.Filter):
@@ -2,17 +2,29 @@
 
 from __future__ import annotations
 
+import itertools
+import sqlite3
+from collections.abc import Iterator, Sequence
+from datetime import timezone
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
 from fastapi import APIRouter, HTTPException, Query, Request, Response
 from fastapi.responses import FileResponse
 
 from ..config import get_config
 from ..database import db_connection
 from ..logging_config import get_logger
+from ..migrations import COMICS_FTS_METADATA_COLUMNS, comics_fts_exists
+from ..utils import etag_matches
 from .feeds import (
+    _FEED_CLOSE,
     _absolute_href,
+    _collection_link_xml,
     _comic_entry_xml,
     _comic_media_type,
     _escape_xml,
+    _feed_head,
     _folder_href,
     _get_library_title,
     _now_iso,
@@ -20,6 +32,7 @@ from .feeds import (
     _root_href,
     _search_href,
     _xml_response,
+    _xml_stream_response,
 )
 
 logger = get_logger(__name__)
@@ -37,6 +50,43 @@ def chrome_devtools_well_known() -> Response:
     return Response(content="{}", media_type="application/json")
 
 
+def _iter_comic_entries(
+    comics: Sequence[sqlite3.Row],
+    updated: str,
+    base_url: str,
+    *,
+    series: tuple[int, str] | None = None,
+    series_from_row: bool = False,
+) -> Iterator[str]:
+    """Entry XML per comic row, built lazily while the feed streams.
+
+    *series* is (folder_id, name) of a series folder feed. With
+    *series_from_row*, each row's ``is_leaf``/``folder_id``/``folder_name``
+    columns decide instead. Collection links are built once per folder.
+    """
+    collection_link = _collection_link_xml(base_url, *series) if series else ""
+    row_links: dict[int, str] = {}
+    for comic in comics:
+        if series_from_row:
+            if comic["is_leaf"]:
+                folder_id = comic["folder_id"]
+                collection_link = row_links.get(folder_id)
+                if collection_link is None:
+                    collection_link = row_links[folder_id] = _collection_link_xml(
+                        base_url, folder_id, comic["folder_name"]
+                    )
+            else:
+                collection_link = ""
+        yield _comic_entry_xml(
+            comic["uuid"],
+            comic["display_title"] or comic["filename"],
+            comic["last_scanned_at"] or updated,
+            _comic_media_type(comic["format"]),
+            base_url,
+            collection_link,
+        )
+
+
 @router.get("/opds")
 def opds_root_no_slash(request: Request) -> Response:
     return opds_root(request)
@@ -58,7 +108,7 @@ def opds_root(request: Request) -> Response:
         folders = cur.fetchall()
 
     updated = _now_iso()
-    base_url = str(request.base_url)
+    base_url = str(request.base_url).rstrip("/")
     self_href = _absolute_href(base_url, _root_href())
     title = _get_library_title(config)
 
@@ -88,17 +138,8 @@ def opds_root(request: Request) -> Response:
   </entry>"""
     )
 
-    xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>\n'
-        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
-        f"  <id>urn:uuid:root</id>\n"
-        f"  <title>{title}</title>\n"
-        f"  <updated>{updated}</updated>\n"
-        f"  <link rel=\"self\" href=\"{self_href}\" type=\"application/atom+xml;profile=opds-catalog\" />\n"
-        f"  <link rel=\"start\" href=\"{self_href}\" type=\"application/atom+xml;profile=opds-catalog\" />\n"
-        f"{''.join(entries)}\n"
-        "</feed>"
-    )
+    head = _feed_head("urn:uuid:root", title, updated, self_href, self_href)
+    xml = head + "".join(entries) + _FEED_CLOSE
     return _xml_response(xml)
 
 
@@ -131,12 +172,12 @@ def opds_folder(folder_id: int, request: Request) -> Response:
         comics = cur.fetchall()
 
     updated = _now_iso()
-    base_url = str(request.base_url)
+    base_url = str(request.base_url).rstrip("/")
     self_href = _absolute_href(base_url, _folder_href(folder_id))
     start_href = _absolute_href(base_url, _root_href())
-    entries = []
+    subfolder_entries = []
     for sub in subfolders:
-        entries.append(
+        subfolder_entries.append(
             f"""
   <entry>
     <title>{_escape_xml(sub['name'])}</title>
@@ -149,38 +190,13 @@ def opds_folder(folder_id: int, request: Request) -> Response:
         )
 
     is_series = len(subfolders) == 0
-    series_folder_id = folder_id if is_series else None
-    series_name = folder["name"] if is_series else None
-
-    for comic in comics:
-        updated_ts = comic["last_scanned_at"] or updated
-        media_type = _comic_media_type(comic["format"])
-        comic_uuid = comic["uuid"]
-        title = comic["display_title"] or comic["filename"]
-        entries.append(
-            _comic_entry_xml(
-                comic_uuid,
-                title,
-                updated_ts,
-                media_type,
-                base_url,
-                series_folder_id=series_folder_id,
-                series_name=series_name,
-            )
-        )
-
-    xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>\n'
-        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
-        f"  <id>urn:folder:{folder_id}</id>\n"
-        f"  <title>{_escape_xml(folder['name'])}</title>\n"
-        f"  <updated>{updated}</updated>\n"
-        f"  <link rel=\"self\" href=\"{self_href}\" type=\"application/atom+xml;profile=opds-catalog\" />\n"
-        f"  <link rel=\"start\" href=\"{start_href}\" type=\"application/atom+xml;profile=opds-catalog\" />\n"
-        f"{''.join(entries)}\n"
-        "</feed>"
+    series = (folder_id, folder["name"]) if is_series else None
+    entries = itertools.chain(
+        subfolder_entries, _iter_comic_entries(comics, updated, base_url, series=series)
     )
-    return _xml_response(xml)
+
+    head = _feed_head(f"urn:folder:{folder_id}", folder["name"], updated, self_href, start_href)
+    return _xml_stream_response(head, entries)
 
 
 @router.get("/opds/recent")
@@ -190,7 +206,9 @@ def opds_recent(request: Request, limit: int = Query(50, ge=1, le=200)) -> Respo
         cur = conn.execute(
             "SELECT c.id, c.uuid, c.filename, c.format, c.last_scanned_at, "
             "       c.folder_id, f.name AS folder_name, "
-            "       COALESCE(m.title, c.filename) AS display_title "
+            "       COALESCE(m.title, c.filename) AS display_title, "
+            # Leaf (series) folder: one ix_folders_parent_id probe per row
+            "       NOT EXISTS (SELECT 1 FROM folders sub WHERE sub.parent_id = c.folder_id) AS is_leaf "
             "FROM comics c "
             "JOIN folders f ON c.folder_id = f.id "
             "LEFT JOIN metadata m ON m.comic_id = c.id "
@@ -198,123 +216,116 @@ def opds_recent(request: Request, limit: int = Query(50, ge=1, le=200)) -> Respo
             (limit,),
         )
         comics = cur.fetchall()
-        folder_ids = [c["folder_id"] for c in comics]
-        non_leaf_ids = set()
-        if folder_ids:
-            placeholders = ",".join("?" * len(folder_ids))
-            cur = conn.execute(
-                f"SELECT parent_id FROM folders WHERE parent_id IN ({placeholders})",
-                folder_ids,
-            )
-            non_leaf_ids = {row["parent_id"] for row in cur.fetchall()}
 
     updated = _now_iso()
-    base_url = str(request.base_url)
+    base_url = str(request.base_url).rstrip("/")
     self_href = _absolute_href(base_url, _recent_href(limit))
     start_href = _absolute_href(base_url, _root_href())
 
-    entries = []
-    for comic in comics:
-        updated_ts = comic["last_scanned_at"] or updated
-        media_type = _comic_media_type(comic["format"])
-        comic_uuid = comic["uuid"]
-        title = comic["display_title"] or comic["filename"]
-        is_series = comic["folder_id"] not in non_leaf_ids
-        entries.append(
-            _comic_entry_xml(
-                comic_uuid,
-                title,
-                updated_ts,
-                media_type,
-                base_url,
-                series_folder_id=comic["folder_id"] if is_series else None,
-                series_name=comic["folder_name"] if is_series else None,
-            )
-        )
+    entries = _iter_comic_entries(comics, updated, base_url, series_from_row=True)
+    head = _feed_head("urn:recent", "Recent", updated, self_href, start_href)
+    return _xml_stream_response(head, entries)
+
 
-    xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>\n'
-        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
-        "  <id>urn:recent</id>\n"
-        "  <title>Recent</title>\n"
-        f"  <updated>{updated}</updated>\n"
-        f"  <link rel=\"self\" href=\"{self_href}\" type=\"application/atom+xml;profile=opds-catalog\" />\n"
-        f"  <link rel=\"start\" href=\"{start_href}\" type=\"application/atom+xml;profile=opds-catalog\" />\n"
-        f"{''.join(entries)}\n"
-        "</feed>"
+_SEARCH_SELECT = (
+    "SELECT c.id, c.uuid, c.filename, c.format, c.last_scanned_at, "
+    "       c.folder_id, f.name AS folder_name, "
+    "       COALESCE(m.title, c.filename) AS display_title, "
+    # Leaf (series) folder: one ix_folders_parent_id probe per row
+    "       NOT EXISTS (SELECT 1 FROM folders sub WHERE sub.parent_id = c.folder_id) AS is_leaf "
+    "FROM comics c "
+    "JOIN folders f ON c.folder_id = f.id "
+    "LEFT JOIN metadata m ON m.comic_id = c.id "
+)
+_SEARCH_COLUMNS = ("filename", *COMICS_FTS_METADATA_COLUMNS)
+# Trigram FTS needs at least three characters to use the index; shorter
+# terms fall back to LIKE over the comics_fts columns.
+_SEARCH_FTS_MATCH = "SELECT rowid FROM comics_fts WHERE comics_fts MATCH ?"
+_SEARCH_FTS_LIKE = "SELECT rowid FROM comics_fts WHERE " + " OR ".join(
+    f"{col} LIKE ?" for col in _SEARCH_COLUMNS
+)
+_SEARCH_LEGACY_WHERE = "WHERE c.filename LIKE ? OR " + " OR ".join(
+    f"m.{col} LIKE ?" for col in COMICS_FTS_METADATA_COLUMNS
+)
+
+
+def _search_comics(conn: sqlite3.Connection, q: str) -> list[sqlite3.Row]:
+    """Comics whose filename or searchable metadata contains q, via comics_fts."""
+    like = f"%{q}%"
+    if not comics_fts_exists(conn):
+        # comics_fts not created yet (DB never migrated/repaired): plain LIKE scan.
+        cur = conn.execute(
+            _SEARCH_SELECT + _SEARCH_LEGACY_WHERE + " ORDER BY c.filename",
+            [like] * len(_SEARCH_COLUMNS),
+        )
+        return cur.fetchall()
+    if len(q) >= 3:
+        fts_sql, fts_params = _SEARCH_FTS_MATCH, ['"' + q.replace('"', '""') + '"']
+    else:
+        fts_sql, fts_params = _SEARCH_FTS_LIKE, [like] * len(_SEARCH_COLUMNS)
+    cur = conn.execute(
+        _SEARCH_SELECT + f"WHERE c.id IN ({fts_sql}) ORDER BY c.filename",
+        fts_params,
     )
-    return _xml_response(xml)
+    return cur.fetchall()
 
 
 @router.get("/opds/search")
 def opds_search(request: Request, q: str = Query(..., min_length=1)) -> Response:
     """Search by filename and metadata (title, series, writer, notes, summary, etc.)."""
-    like = f"%{q}%"
-
     with db_connection() as conn:
-        cur = conn.execute(
-            "SELECT c.id, c.uuid, c.filename, c.format, c.last_scanned_at, "
-            "       c.folder_id, f.name AS folder_name, "
-            "       COALESCE(m.title, c.filename) AS display_title "
-            "FROM comics c "
-            "JOIN folders f ON c.folder_id = f.id "
-            "LEFT JOIN metadata m ON m.comic_id = c.id "
-            "WHERE c.filename LIKE ? OR m.title LIKE ? OR m.series LIKE ? "
-            "   OR m.writer LIKE ? OR m.penciller LIKE ? OR m.notes LIKE ? "
-            "   OR m.summary LIKE ? OR m.genre LIKE ? OR m.publisher LIKE ? "
-            "ORDER BY c.filename",
-            (like, like, like, like, like, like, like, like, like),
-        )
-        comics = cur.fetchall()
-        folder_ids = list({c["folder_id"] for c in comics})
-        non_leaf_ids = set()
-        if folder_ids:
-            placeholders = ",".join("?" * len(folder_ids))
-            cur = conn.execute(
-                f"SELECT parent_id FROM folders WHERE parent_id IN ({placeholders})",
-                folder_ids,
-            )
-            non_leaf_ids = {row["parent_id"] for row in cur.fetchall()}
+        comics = _search_comics(conn, q)
 
     updated = _now_iso()
-    base_url = str(request.base_url)
+    base_url = str(request.base_url).rstrip("/")
     self_href = _absolute_href(base_url, _search_href(q))
     start_href = _absolute_href(base_url, _root_href())
-    entries = []
-    for comic in comics:
-        updated_ts = comic["last_scanned_at"] or updated
-        media_type = _comic_media_type(comic["format"])
-        comic_uuid = comic["uuid"]
-        title = comic["display_title"] or comic["filename"]
-        is_series = comic["folder_id"] not in non_leaf_ids
-        entries.append(
-            _comic_entry_xml(
-                comic_uuid,
-                title,
-                updated_ts,
-                media_type,
-                base_url,
-                series_folder_id=comic["folder_id"] if is_series else None,
-                series_name=comic["folder_name"] if is_series else None,
-            )
-        )
-
-    xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>\n'
-        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
-        "  <id>urn:search</id>\n"
-        f"  <title>Search: {_escape_xml(q)}</title>\n"
-        f"  <updated>{updated}</updated>\n"
-        f"  <link rel=\"self\" href=\"{self_href}\" type=\"application/atom+xml;profile=opds-catalog\" />\n"
-        f"  <link rel=\"start\" href=\"{start_href}\" type=\"application/atom+xml;profile=opds-catalog\" />\n"
-        f"{''.join(entries)}\n"
-        "</feed>"
-    )
-    return _xml_response(xml)
+    entries = _iter_comic_entries(comics, updated, base_url, series_from_row=True)
+    head = _feed_head("urn:search", f"Search: {q}", updated, self_href, start_href)
+    return _xml_stream_response(head, entries)
+
+
+def _http_date_timestamp(value: str) -> float:
+    """POSIX timestamp of an HTTP date; a ``-0000`` zone parses naive and means UTC."""
+    dt = parsedate_to_datetime(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _validated_file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    cache_control: str,
+    filename: str | None = None,
+    missing: str = "File missing on disk",
+) -> Response:
+    """FileResponse with ETag/Last-Modified from one stat(); 304 when the client copy is current."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=missing)
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    last_modified = formatdate(st.st_mtime, usegmt=True)
+    headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag)
+    else:
+        since = request.headers.get("if-modified-since")
+        try:
+            not_modified = since is not None and int(st.st_mtime) <= _http_date_timestamp(since)
+        except (TypeError, ValueError):
+            not_modified = False
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers, stat_result=st)
 
 
 @router.get("/opds/comic/{comic_uuid}/file")
-def download_comic(comic_uuid: str):
+def download_comic(comic_uuid: str, request: Request):
     """Return original comic archive."""
     from ..path_utils import to_absolute
 
@@ -334,9 +345,6 @@ def download_comic(comic_uuid: str):
         raise HTTPException(status_code=500, detail="Server not configured")
 
     path = to_absolute(comic["path"], config.library_path)
-    if not path.exists():
-        raise HTTPException(status_code=404, detail="File missing on disk")
-
     media_type = _comic_media_type(comic["format"])
     detected_suffix = f".{comic['format'].lower()}"
     download_name = (
@@ -344,11 +352,13 @@ def download_comic(comic_uuid: str):
         if path.suffix.lower() == detected_suffix
         else f"{path.stem}{detected_suffix}"
     )
-    return FileResponse(path, media_type=media_type, filename=download_name)
+    return _validated_file_response(
+        request, path, media_type, "public, max-age=3600", filename=download_name
+    )
 
 
 @router.get("/opds/comic/{comic_uuid}/thumbnail")
-def get_thumbnail(comic_uuid: str):
+def get_thumbnail(comic_uuid: str, request: Request):
     """Return WebP thumbnail for comic."""
     try:
         config = get_config()
@@ -356,6 +366,8 @@ def get_thumbnail(comic_uuid: str):
         raise HTTPException(status_code=500, detail="Server not configured")
 
     thumb_path = config.thumbnails_dir / f"{comic_uuid}.webp"
-    if not thumb_path.exists():
-        raise HTTPException(status_code=404, detail="Thumbnail not found")
-    return FileResponse(thumb_path, media_type="image/webp")
+    # Rewritten in place by rescans and --regenerate: clients revalidate every
+    # time and get a 304 from the ETag while the file is unchanged.
+    return _validated_file_response(
+        request, thumb_path, "image/webp", "public, no-cache", missing="Thumbnail not found"
+    )
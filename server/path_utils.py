@@ -46,3 +46,18 @@ def to_absolute(relative_path: str, library_root: Path) -> Path:
         Path("/library/Comics/Marvel/X-Men.cbz")
     """
     return library_root / relative_path
+
+
+def descendant_range(relative_path: str) -> tuple[str, str]:
+    """Half-open ``[low, high)`` bounds of the stored paths under *relative_path*.
+
+    ``path >= low AND path < high`` matches exactly the paths starting with
+    ``relative_path + "/"`` and, unlike ``LIKE 'prefix/%'``, is a range scan
+    on the BINARY path index, case-sensitive, and immune to ``%``/``_`` in
+    folder names. ``"0"`` is the character right after ``"/"``.
+
+    Example:
+        >>> descendant_range("Marvel")
+        ("Marvel/", "Marvel0")
+    """
+    return f"{relative_path}/", f"{relative_path}0"
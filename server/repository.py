@@ -5,18 +5,57 @@ Encapsulates database operations using SQLModel/SQLAlchemy.
 
 from __future__ import annotations
 
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Set, Tuple
+from typing import Iterator, List, NamedTuple, Optional, Set, Tuple
 
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Session, select, col, func
 
 from .models import Folder, Comic, ComicMetadata
 from .config import IssuedConfig
-from .path_utils import to_relative, to_absolute
+from .path_utils import descendant_range, to_relative, to_absolute
 from .comicinfo import ComicMetadataUpdate
 
 
+def _under(column, relative_path: str):
+    """SQL predicate: *column* holds a path strictly under *relative_path*."""
+    low, high = descendant_range(relative_path)
+    return (col(column) >= low) & (col(column) < high)
+
+
+class ComicScanState(NamedTuple):
+    """Columns the scanner needs to decide whether a known comic can be skipped.
+
+    Plain values, so a commit between comics cannot expire them.
+    """
+
+    file_modified_at: Optional[datetime]
+    format: str
+    thumbnail_generated: bool
+    has_metadata: bool
+
+    @classmethod
+    def from_comic(cls, comic: Comic) -> "ComicScanState":
+        return cls(
+            comic.file_modified_at,
+            comic.format,
+            comic.thumbnail_generated,
+            comic.metadata_rel is not None,
+        )
+
+
+class UpsertedComic(NamedTuple):
+    """Key columns of a row written by Repository.upsert_comics."""
+
+    id: int
+    uuid: str
+
+
 class Repository:
     """Data access layer that stores paths as relative to library_root in DB.
     
@@ -27,15 +66,64 @@ class Repository:
     def __init__(self, session: Session, library_root: Path):
         self.session = session
         self.library_root = library_root.resolve()
+        self._defer_commits = False
+        self._defer_limits: Tuple[Optional[int], Optional[float]] = (None, None)
+        self._deferred_count = 0
+        self._deferred_since = 0.0
+        # Relative folder path -> id, once preload_folder_cache() has run.
+        # Ids rather than Folder objects: commits expire ORM instances.
+        self._folder_ids: Optional[dict[str, int]] = None
 
     def commit(self) -> None:
-        """Commit the current transaction. Callers control when to commit."""
-        self.session.commit()
+        """Commit the current transaction. Callers control when to commit.
+
+        Inside ``deferred_commits()`` this only flushes, unless the block's
+        batch limits are reached.
+        """
+        if not self._defer_commits:
+            self.session.commit()
+            return
+        self.session.flush()
+        self._deferred_count += 1
+        max_pending, max_seconds = self._defer_limits
+        if (max_pending is not None and self._deferred_count >= max_pending) or (
+            max_seconds is not None and time.monotonic() - self._deferred_since >= max_seconds
+        ):
+            self.session.commit()
+            self._reset_deferred()
+
+    def _reset_deferred(self) -> None:
+        self._deferred_count = 0
+        self._deferred_since = time.monotonic()
+
+    @contextmanager
+    def deferred_commits(
+        self, max_pending: Optional[int] = None, max_seconds: Optional[float] = None
+    ) -> Iterator["Repository"]:
+        """Group every commit() in the block into one transaction, committed at the end.
+
+        With *max_pending* / *max_seconds*, the transaction is also committed
+        once that many commit() calls have accumulated or that long has passed,
+        which bounds how long the write lock is held. Rolls back whatever is
+        still uncommitted if the block (or the final commit) raises.
+        """
+        self._defer_commits = True
+        self._defer_limits = (max_pending, max_seconds)
+        self._reset_deferred()
+        try:
+            yield self
+            self._defer_commits = False
+            self.session.commit()
+        except BaseException:
+            self.session.rollback()
+            raise
+        finally:
+            self._defer_commits = False
 
     def get_or_create_folder(self, path: Path) -> Folder:
         """Upsert a folder row based on its absolute path.
         
-        Stores relative path in DB. Recursively creates parent folders.
+        Stores relative path in DB. Creates missing parent folders too.
         
         Args:
             path: Absolute path to the folder
@@ -44,36 +132,93 @@ class Repository:
             Folder object with relative path stored in DB
         """
         path = path.resolve()
-        rel_path_str = to_relative(path, self.library_root)
-        
-        # Try finding existing by relative path
-        statement = select(Folder).where(Folder.path == rel_path_str)
-        folder = self.session.exec(statement).first()
-        if folder:
-            return folder
 
-        # Determine parent
-        parent_id = None
-        if path != self.library_root:
-            parent_path = path.parent
-            
-            # Stop recursion if we hit filesystem root or library root
-            if parent_path != path and parent_path.is_relative_to(self.library_root):
-                # Recursively get/create parent
-                parent_folder = self.get_or_create_folder(parent_path)
-                parent_id = parent_folder.id
-
-        # Create new folder with relative path
-        folder = Folder(
-            name=path.name or str(path),
-            path=rel_path_str,
-            parent_id=parent_id
-        )
-        self.session.add(folder)
-        self.session.flush()
-        self.session.refresh(folder)
+        # The folder and its ancestors up to the library root, deepest first
+        chain = [path]
+        if path.is_relative_to(self.library_root):
+            while chain[-1] != self.library_root:
+                chain.append(chain[-1].parent)
+        rel_paths = [to_relative(p, self.library_root) for p in chain]
+
+        # One query for whichever of them already exist
+        statement = select(Folder).where(col(Folder.path).in_(rel_paths))
+        existing = {folder.path: folder for folder in self.session.exec(statement).all()}
+
+        # Create the missing ones top-down; one flush assigns all their ids
+        folder = None
+        created = False
+        for folder_path, rel_path_str in zip(reversed(chain), reversed(rel_paths)):
+            parent = folder
+            folder = existing.get(rel_path_str)
+            if folder is None:
+                folder = Folder(name=folder_path.name or str(folder_path), path=rel_path_str)
+                folder.parent = parent
+                self.session.add(folder)
+                created = True
+            existing[rel_path_str] = folder
+        if created:
+            self.session.flush()
+
+        for rel_path_str, known in existing.items():
+            self._remember_folder(rel_path_str, known.id)
         return folder
 
+    def preload_folder_cache(self) -> None:
+        """Load every folder's (path, id) in one query for get_or_create_folder_id.
+
+        Folder moves and deletes through this repository drop the cache again.
+        """
+        rows = self.session.exec(select(Folder.path, Folder.id)).all()
+        self._folder_ids = {path: folder_id for path, folder_id in rows}
+
+    def _remember_folder(self, rel_path_str: str, folder_id: int) -> None:
+        if self._folder_ids is not None:
+            self._folder_ids[rel_path_str] = folder_id
+
+    def get_or_create_folder_id(self, path: Path) -> int:
+        """Id of the folder at absolute *path*, creating it and missing parents.
+
+        With a preloaded cache, existing folders cost no query and missing ones
+        one INSERT each; otherwise this is get_or_create_folder(path).id.
+        Paths from a walk under the resolved root hit the cache as given, so
+        only a miss pays for resolve().
+        """
+        if self._folder_ids is None:
+            return self.get_or_create_folder(path).id
+
+        folder_id = self._folder_ids.get(to_relative(path, self.library_root))
+        if folder_id is not None:
+            return folder_id
+
+        path = path.resolve()
+        if not path.is_relative_to(self.library_root):
+            return self.get_or_create_folder(path).id
+
+        folder_id = self._folder_ids.get(to_relative(path, self.library_root))
+        if folder_id is not None:
+            return folder_id
+
+        # Walk up to the nearest known ancestor, then create downwards.
+        missing = [path]
+        parent_id = None
+        while missing[-1] != self.library_root:
+            parent_id = self._folder_ids.get(to_relative(missing[-1].parent, self.library_root))
+            if parent_id is not None:
+                break
+            missing.append(missing[-1].parent)
+
+        for folder_path in reversed(missing):
+            rel_path_str = to_relative(folder_path, self.library_root)
+            folder = Folder(
+                name=folder_path.name or str(folder_path),
+                path=rel_path_str,
+                parent_id=parent_id,
+            )
+            self.session.add(folder)
+            self.session.flush()
+            parent_id = self._folder_ids[rel_path_str] = folder.id
+        return parent_id
+
     def upsert_comic(
         self,
         *,
@@ -85,53 +230,92 @@ class Repository:
         page_count: int,
         file_modified_at: datetime,
         thumbnail_generated: bool = False,
+        page_manifest: Optional[str] = None,
+        rel_path: Optional[str] = None,
     ) -> Comic:
         """Insert or update a comic.
         
         Args:
             path: Absolute path to the comic file
+            rel_path: to_relative(path), when the caller already has it
             
         Stores relative path in DB.
         """
-        rel_path_str = to_relative(path, self.library_root)
-        statement = select(Comic).where(Comic.path == rel_path_str)
-        comic = self.session.exec(statement).first()
+        upserted = self.upsert_comics(
+            [
+                dict(
+                    folder_id=folder_id,
+                    path=path,
+                    filename=filename,
+                    fmt=fmt,
+                    file_size=file_size,
+                    page_count=page_count,
+                    file_modified_at=file_modified_at,
+                    thumbnail_generated=thumbnail_generated,
+                    page_manifest=page_manifest,
+                    rel_path=rel_path,
+                )
+            ]
+        )[0]
+        return self.session.get(Comic, upserted.id)
+
+    def upsert_comics(self, comics: List[dict]) -> List[UpsertedComic]:
+        """Insert or update several comics; each dict holds upsert_comic's arguments.
+
+        One Core INSERT ... ON CONFLICT(path) DO UPDATE ... RETURNING covers all
+        of them, and one more statement adds metadata rows for new comics; no
+        ORM objects are built. Returns (id, uuid) per comic, in input order.
+        Comic objects already in the session are not refreshed.
+        """
+        if not comics:
+            return []
 
         now = datetime.now(timezone.utc)
-
-        if comic:
-            # Update
-            comic.folder_id = folder_id
-            comic.filename = filename
-            comic.format = fmt
-            comic.file_size = file_size
-            comic.page_count = page_count
-            comic.file_modified_at = file_modified_at
-            comic.last_scanned_at = now
-            comic.thumbnail_generated = thumbnail_generated
-        else:
-            # Insert with relative path
-            comic = Comic(
-                folder_id=folder_id,
-                filename=filename,
-                path=rel_path_str,
-                format=fmt,
-                file_size=file_size,
-                page_count=page_count,
-                file_modified_at=file_modified_at,
-                last_scanned_at=now,
-                thumbnail_generated=thumbnail_generated,
-            )
-            self.session.add(comic)
-            self.session.flush()
-            
-            metadata = ComicMetadata(comic_id=comic.id)
-            self.session.add(metadata)
-
-        self.session.add(comic)
-        self.session.flush()
-        self.session.refresh(comic)
-        return comic
+        rows = [
+            {
+                "uuid": str(uuid.uuid4()),
+                "created_at": now,
+                "path": c.get("rel_path") or to_relative(c["path"], self.library_root),
+                "folder_id": c["folder_id"],
+                "filename": c["filename"],
+                "format": c["fmt"],
+                "file_size": c["file_size"],
+                "page_count": c["page_count"],
+                "file_modified_at": c["file_modified_at"],
+                "last_scanned_at": now,
+                "thumbnail_generated": c.get("thumbnail_generated", False),
+                "page_manifest": c.get("page_manifest"),
+            }
+            for c in comics
+        ]
+
+        # uuid and created_at only apply to new rows.  folder_id is left out of
+        # the update too: the path pins the folder, moves go through
+        # update_comic_paths, and naming the column would fire the folder
+        # preview trigger on every rescan.
+        comics_table = Comic.__table__
+        insert_stmt = sqlite_insert(comics_table)
+        statement = insert_stmt.on_conflict_do_update(
+            index_elements=[comics_table.c.path],
+            set_={
+                key: insert_stmt.excluded[key]
+                for key in rows[0]
+                if key not in ("uuid", "created_at", "path", "folder_id")
+            },
+        ).returning(comics_table.c.path, comics_table.c.id, comics_table.c.uuid)
+        # RETURNING order is unspecified, so match rows back by path
+        by_path = {
+            path: UpsertedComic(comic_id, comic_uuid)
+            for path, comic_id, comic_uuid in self.session.execute(statement, rows).all()
+        }
+
+        self.session.execute(
+            sqlite_insert(ComicMetadata.__table__).on_conflict_do_nothing(
+                index_elements=[ComicMetadata.__table__.c.comic_id]
+            ),
+            [{"comic_id": comic.id} for comic in by_path.values()],
+        )
+        return [by_path[row["path"]] for row in rows]
 
     def get_comic_by_path(self, path: Path) -> Optional[Comic]:
         """Get comic by absolute path (converts to relative for DB query).
@@ -149,6 +333,24 @@ class Repository:
         )
         return self.session.exec(statement).first()
 
+    def preload_comics_for_folder(self, folder_id: int) -> dict[str, ComicScanState]:
+        """Scan state of every comic in a folder, keyed by relative path, in one query."""
+        statement = (
+            select(
+                Comic.path,
+                Comic.file_modified_at,
+                Comic.format,
+                Comic.thumbnail_generated,
+                ComicMetadata.id,
+            )
+            .outerjoin(ComicMetadata, ComicMetadata.comic_id == Comic.id)
+            .where(Comic.folder_id == folder_id)
+        )
+        return {
+            path: ComicScanState(mtime, fmt, thumb, metadata_id is not None)
+            for path, mtime, fmt, thumb, metadata_id in self.session.exec(statement).all()
+        }
+
     def get_comic_by_id(self, comic_id: int) -> Optional[Comic]:
         return self.session.get(Comic, comic_id)
 
@@ -168,10 +370,23 @@ class Repository:
         self.session.flush()
         return uuids
 
+    def delete_comics_by_ids(self, comic_ids: List[int]) -> List[str]:
+        """Delete comics by id with one flush. Returns deleted comic UUIDs."""
+        uuids: List[str] = []
+        for start in range(0, len(comic_ids), 500):
+            chunk = comic_ids[start:start + 500]
+            comics = self.session.exec(select(Comic).where(col(Comic.id).in_(chunk))).all()
+            for comic in comics:
+                uuids.append(comic.uuid)
+                self.session.delete(comic)
+
+        self.session.flush()
+        return uuids
+
     def delete_comics_under_path(self, base_path: Path) -> List[str]:
         """Delete all comics under absolute base_path. Returns deleted comic UUIDs."""
         rel_base_str = to_relative(base_path, self.library_root).rstrip("/")
-        statement = select(Comic).where(col(Comic.path).like(f"{rel_base_str}/%"))
+        statement = select(Comic).where(_under(Comic.path, rel_base_str))
         comics = self.session.exec(statement).all()
         uuids = [c.uuid for c in comics]
 
@@ -183,10 +398,11 @@ class Repository:
 
     def delete_folder_by_path(self, path: Path) -> None:
         """Delete folder and all children by absolute path."""
+        self._folder_ids = None
         rel_path_str = to_relative(path, self.library_root).rstrip("/")
         
         # Delete child folders
-        statement_folders = select(Folder).where(col(Folder.path).like(f"{rel_path_str}/%"))
+        statement_folders = select(Folder).where(_under(Folder.path, rel_path_str))
         folders = self.session.exec(statement_folders).all()
         for f in folders:
             self.session.delete(f)
@@ -208,6 +424,7 @@ class Repository:
         Returns:
             True if folder was found and updated, False otherwise.
         """
+        self._folder_ids = None
         old_rel_str = to_relative(old_path, self.library_root).rstrip("/")
         new_rel_str = to_relative(new_path, self.library_root).rstrip("/")
 
@@ -228,17 +445,8 @@ class Repository:
         self.session.add(folder)
         self.session.flush()
             
-        # 2. Update children
-        # Fetch all children
-        statement = select(Folder).where(col(Folder.path).like(f"{old_rel_str}/%"))
-        children = self.session.exec(statement).all()
-        
-        for child in children:
-            # replace prefix
-            child.path = child.path.replace(old_rel_str, new_rel_str, 1)
-            self.session.add(child)
-            
-        self.session.flush()
+        # 2. Update children: one UPDATE swapping the path prefix
+        self._replace_path_prefix(Folder, old_rel_str, new_rel_str)
         return True
 
     def update_comic_paths(self, old_base: Path, new_base: Path) -> None:
@@ -251,14 +459,20 @@ class Repository:
         old_rel_str = to_relative(old_base, self.library_root).rstrip("/")
         new_rel_str = to_relative(new_base, self.library_root).rstrip("/")
         
-        statement = select(Comic).where(col(Comic.path).like(f"{old_rel_str}/%"))
-        comics = self.session.exec(statement).all()
-        
-        for comic in comics:
-            comic.path = comic.path.replace(old_rel_str, new_rel_str, 1)
-            self.session.add(comic)
-            
-        self.session.flush()
+        self._replace_path_prefix(Comic, old_rel_str, new_rel_str)
+
+    def _replace_path_prefix(self, model, old_rel_str: str, new_rel_str: str) -> None:
+        """Rewrite ``old/...`` to ``new/...`` for every *model* row under *old_rel_str*.
+
+        Runs as a single UPDATE. Loaded instances are refreshed from the rows
+        it touched (synchronize_session="fetch").
+        """
+        self.session.execute(
+            update(model)
+            .where(_under(model.path, old_rel_str))
+            .values(path=new_rel_str + func.substr(model.path, len(old_rel_str) + 1))
+            .execution_options(synchronize_session="fetch")
+        )
 
     def set_thumbnail_generated(self, comic_id: int, generated: bool = True) -> None:
         comic = self.session.get(Comic, comic_id)
@@ -267,6 +481,19 @@ class Repository:
             self.session.add(comic)
             self.session.flush()
 
+    def set_thumbnail_generated_by_uuid(self, comic_uuid: str) -> bool:
+        """Mark one comic as having a thumbnail without loading it. False if unknown."""
+        result = self.session.execute(
+            update(Comic).where(Comic.uuid == comic_uuid).values(thumbnail_generated=True)
+        )
+        return result.rowcount > 0
+
+    def set_thumbnails_generated(self, comic_ids: List[int]) -> None:
+        """Mark several comics as having a thumbnail with one UPDATE."""
+        self.session.execute(
+            update(Comic).where(col(Comic.id).in_(comic_ids)).values(thumbnail_generated=True)
+        )
+
     def folder_has_subfolders(self, folder_id: int) -> bool:
         """Return True if this folder has any child folders (i.e. is not a leaf)."""
         statement = select(func.count()).select_from(Folder).where(Folder.parent_id == folder_id)
@@ -280,11 +507,8 @@ class Repository:
         if not meta:
             meta = ComicMetadata(comic_id=comic_id)
             self.session.add(meta)
-            self.session.flush()
         for key, value in payload.model_dump(exclude_none=True).items():
             setattr(meta, key, value)
-        self.session.add(meta)
-        self.session.flush()
 
     # --- Read Methods (used by thumbnails/main) ---
 
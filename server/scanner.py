@@ -10,34 +10,49 @@ Implements:
 
 from __future__ import annotations
 
+import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice, repeat
 from pathlib import Path
-from typing import Iterable, Iterator, Optional, Tuple
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
 
 from .config import IssuedConfig
 from .database import get_engine, init_db
 from .logging_config import get_logger
-from .repository import Repository
-from .thumbnails import generate_thumbnail_for_comic
+from .path_utils import to_relative
+from .repository import ComicScanState, Repository
+from .thumbnails import render_thumbnail, write_thumbnail
 from .comicinfo import read_comicinfo_from_archive, ComicMetadataUpdate
 from .archive import ComicFormat, detect_archive_format, get_archive
-from .utils import delete_thumbnails, short_path
+from .utils import delete_thumbnails, map_bounded, short_path
 from sqlmodel import Session
 
 logger = get_logger(__name__)
 
+# scan_library commits after this many comics or seconds, whichever comes first.
+SCAN_COMMIT_MAX_COMICS = 500
+SCAN_COMMIT_MAX_SECONDS = 1.0
+# Comics per upsert statement in scan_library. Together with the inspect
+# window below, this bounds how many rendered thumbnails are held at once.
+SCAN_UPSERT_BATCH = 64
+# Inspections submitted ahead of the DB writer, per worker thread.
+SCAN_INSPECT_AHEAD = 2
+
 
 COMIC_EXTENSIONS = {".cbz", ".cbr", ".cb7", ".pdf"}
+_COMIC_SUFFIXES = tuple(COMIC_EXTENSIONS)
+_DIGITS_RE = re.compile(r"(\d+)")
 
 
 def _natural_sort_key(value: str) -> list[object]:
     """Sort text in human-natural order (e.g. issue2 before issue10)."""
-    return [
-        int(part) if part.isdigit() else part.lower()
-        for part in re.split(r"(\d+)", value)
-    ]
+    parts = _DIGITS_RE.split(value.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return parts
 
 
 def _path_natural_sort_key(path: Path) -> list[object]:
@@ -53,6 +68,11 @@ def is_comic_file(path: Path) -> bool:
     return path.suffix.lower() in COMIC_EXTENSIONS
 
 
+def _is_comic_filename(name: str) -> bool:
+    """is_comic_file for a bare file name, without building a Path."""
+    return name.lower().endswith(_COMIC_SUFFIXES)
+
+
 def _should_ignore(name: str, ignore_patterns: Iterable[str]) -> bool:
     """Check if file/folder should be ignored based on patterns or macOS temp files."""
     # Skip macOS temporary/metadata files (._*)
@@ -64,8 +84,11 @@ def _should_ignore(name: str, ignore_patterns: Iterable[str]) -> bool:
 def walk_library(
     root: Path,
     ignore_patterns: Tuple[str, ...],
-) -> Iterator[Tuple[Path, Iterable[Path]]]:
-    """Yield (directory, comic_files) under root, respecting ignore patterns."""
+) -> Iterator[Tuple[Path, Iterable[Path], bool]]:
+    """Yield (directory, comic_files, is_leaf) under root, respecting ignore patterns.
+
+    *is_leaf* is True when the directory has no (non-ignored) subdirectories.
+    """
     root = root.resolve()
     for dirpath, dirnames, filenames in os.walk(root):
         dir_path = Path(dirpath)
@@ -76,22 +99,22 @@ def walk_library(
         ]
         dirnames.sort(key=_natural_sort_key)
 
-        sorted_filenames = sorted(filenames, key=_natural_sort_key)
-
-        comic_files = [
-            dir_path / f
-            for f in sorted_filenames
-            if not _should_ignore(f, ignore_patterns)
-            and is_comic_file(Path(f))
+        # Filter on the bare names first so only comics become Paths or get sort keys
+        comic_names = [
+            f
+            for f in filenames
+            if _is_comic_filename(f) and not _should_ignore(f, ignore_patterns)
         ]
-        yield dir_path, comic_files
+        comic_names.sort(key=_natural_sort_key)
+        comic_files = [dir_path / f for f in comic_names]
+        yield dir_path, comic_files, not dirnames
 
 
-def validate_and_count_pages(
+def read_page_manifest(
     path: Path,
     detected_format: ComicFormat | None = None,
-) -> int:
-    """Validate archive integrity and return page count.
+) -> list[str]:
+    """Validate archive integrity and return its image names in reading order.
 
     Raises Exception (e.g. BadZipFile) if archive is corrupt.
     """
@@ -100,11 +123,23 @@ def validate_and_count_pages(
         images = archive.list_images()
         if not images:
             raise ValueError(f"No supported images found in {path.name}")
-        return len(images)
+        images.sort(key=_natural_sort_key)
+        return images
+
+
+def validate_and_count_pages(
+    path: Path,
+    detected_format: ComicFormat | None = None,
+) -> int:
+    """Validate archive integrity and return page count.
+
+    Raises Exception (e.g. BadZipFile) if archive is corrupt.
+    """
+    return len(read_page_manifest(path, detected_format))
 
 
 def _should_skip_comic(
-    comic_in_db,
+    comic_in_db: Optional[ComicScanState],
     file_mtime: datetime,
     force: bool,
     detected_format: ComicFormat,
@@ -139,113 +174,218 @@ def _should_skip_comic(
         return False
     
     # If no metadata row exists, don't skip (first-time processing)
-    if not comic_in_db.metadata_rel:
+    if not comic_in_db.has_metadata:
         return False
     
     # Comic unchanged and already processed (metadata row exists), skip it
     return True
 
 
-def process_comic(
+class _ComicInspection(NamedTuple):
+    """What _inspect_comic read from one comic file.
+
+    *status* is "unreadable" (stat failed), "corrupt", "skip" or "ready"; the
+    remaining fields are filled in as far as inspection got.
+    """
+
+    status: str
+    file_mtime: Optional[datetime] = None
+    file_size: int = 0
+    fmt: str = ""
+    pages: Optional[list[str]] = None
+    thumbnail: Optional[bytes] = None
+    comicinfo_fields: Optional[dict] = None
+
+
+def _comicinfo_may_have_changed(
+    comic_in_db: Optional[ComicScanState],
+    file_mtime: datetime,
+) -> bool:
+    """False when the file is unchanged and its metadata row was already filled."""
+    return (
+        comic_in_db is None
+        or comic_in_db.file_modified_at != file_mtime
+        or not comic_in_db.has_metadata
+    )
+
+
+def _inspect_comic(
     comic_path: Path,
-    folder_id: int,
+    comic_in_db: Optional[ComicScanState],
     config: IssuedConfig,
-    repo: Repository,
     force: bool,
-) -> tuple[Optional[int], bool, bool, bool]:
-    """Process a single comic file.
-    
-    Returns: (comic_uuid, was_existing, should_skip, thumbnail_generated)
+) -> _ComicInspection:
+    """Read-only phases of process_comic: stat, format, pages, thumbnail, ComicInfo.
+
+    Touches neither the database nor the thumbnails directory, so scan_library
+    runs it in worker threads.
     """
     try:
         stat = comic_path.stat()
     except (FileNotFoundError, PermissionError) as exc:
         logger.error(f"✗ {comic_path.name} - Unable to stat: {exc}")
-        return None, False, True, False
+        return _ComicInspection("unreadable")
 
     file_mtime = datetime.fromtimestamp(stat.st_mtime)
-    file_size = stat.st_size
-
-    # Check if comic exists and should be skipped
-    comic_in_db = repo.get_comic_by_path(comic_path)
-    existing = comic_in_db is not None
 
     try:
         detected_format = detect_archive_format(comic_path)
     except Exception as exc:
         logger.error(f"✗ {comic_path.name} - CORRUPT: {exc}")
-
-        if existing:
-            deleted_uuids = repo.delete_comic_by_path(comic_path)
-            repo.commit()
-            if deleted_uuids:
-                delete_thumbnails(deleted_uuids, config.thumbnails_dir)
-
-        return None, existing, True, False
+        return _ComicInspection("corrupt")
 
     if _should_skip_comic(comic_in_db, file_mtime, force, detected_format):
-        return None, existing, True, False
+        return _ComicInspection("skip")
 
-    # Validate and count pages
+    # Validate and list pages
     try:
-        page_count = validate_and_count_pages(comic_path, detected_format)
+        pages = read_page_manifest(comic_path, detected_format)
     except Exception as exc:
         logger.error(f"✗ {comic_path.name} - CORRUPT: {exc}")
-        
-        if existing:
-            deleted_uuids = repo.delete_comic_by_path(comic_path)
-            repo.commit()
-            if deleted_uuids:
-                delete_thumbnails(deleted_uuids, config.thumbnails_dir)
+        return _ComicInspection("corrupt")
+
+    # An unchanged file with a metadata row only gets here to normalize its
+    # format value; its stored ComicInfo is still current.
+    comicinfo = None
+    if force or _comicinfo_may_have_changed(comic_in_db, file_mtime):
+        comicinfo = read_comicinfo_from_archive(comic_path)
+
+    # Keep ComicInfo only if it has actual data (not just an empty model)
+    return _ComicInspection(
+        "ready",
+        file_mtime=file_mtime,
+        file_size=stat.st_size,
+        fmt=detected_format.value,
+        pages=pages,
+        thumbnail=render_thumbnail(comic_path, config, detected_format),
+        comicinfo_fields=comicinfo.model_dump(exclude_none=True) if comicinfo else {},
+    )
 
-        return None, existing, True, False
 
-    # Process comic
-    fmt = detected_format.value
+def _had_thumbnail(comic_in_db: Optional[ComicScanState]) -> bool:
+    return comic_in_db.thumbnail_generated if comic_in_db else False
 
-    # Use existing thumbnail status if updating, else False
-    thumb_gen = comic_in_db.thumbnail_generated if comic_in_db else False
 
-    comic = repo.upsert_comic(
-        folder_id=folder_id,
-        path=comic_path,
-        filename=comic_path.name,
-        fmt=fmt,
-        file_size=file_size,
-        page_count=page_count,
-        file_modified_at=file_mtime,
-        thumbnail_generated=thumb_gen,
-    )
+def _apply_comic_inspections(
+    comics: list[tuple[Path, str, Optional[ComicScanState], _ComicInspection]],
+    folder_id: int,
+    config: IssuedConfig,
+    repo: Repository,
+    is_leaf: Optional[bool] = None,
+) -> list[tuple[Optional[int], bool, bool, bool]]:
+    """Write _inspect_comic results for comics of one folder to the database and thumbnails directory.
 
-    # Generate thumbnail
-    thumb_success = generate_thumbnail_for_comic(comic.uuid, comic_path, config, repo)
+    *comics* holds (comic_path, rel_path, comic_in_db, inspection) tuples; the
+    ready ones are upserted with a single statement. *is_leaf* says whether the
+    folder has no subfolders; when None the database is asked.
+
+    Returns process_comic's result tuple for each comic, in order.
+    """
+    results: list[Optional[tuple[Optional[int], bool, bool, bool]]] = []
+    ready = []
+    for comic_path, rel_path, comic_in_db, inspection in comics:
+        existing = comic_in_db is not None
+        if inspection.status == "unreadable":
+            results.append((None, False, True, False))
+        elif inspection.status == "corrupt":
+            if existing:
+                deleted_uuids = repo.delete_comic_by_path(comic_path)
+                repo.commit()
+                if deleted_uuids:
+                    delete_thumbnails(deleted_uuids, config.thumbnails_dir)
+            results.append((None, existing, True, False))
+        elif inspection.status == "skip":
+            results.append((None, existing, True, False))
+        else:
+            ready.append((len(results), comic_path, rel_path, comic_in_db, inspection))
+            results.append(None)  # filled in below
+
+    if not ready:
+        return results
+
+    upserted = repo.upsert_comics(
+        [
+            dict(
+                folder_id=folder_id,
+                path=comic_path,
+                rel_path=rel_path,
+                filename=comic_path.name,
+                fmt=inspection.fmt,
+                file_size=inspection.file_size,
+                page_count=len(inspection.pages),
+                file_modified_at=inspection.file_mtime,
+                # Assume the rendered thumbnail gets written; corrected below if not
+                thumbnail_generated=inspection.thumbnail is not None
+                or _had_thumbnail(comic_in_db),
+                page_manifest=json.dumps(inspection.pages),
+            )
+            for _, comic_path, rel_path, comic_in_db, inspection in ready
+        ]
+    )
 
     # ComicInfo.xml metadata: parse when available; series from folder name only when leaf (never from ComicInfo <Series>)
-    comicinfo = read_comicinfo_from_archive(comic_path)
-    is_leaf = not repo.folder_has_subfolders(folder_id)
-    series_from_folder = comic_path.parent.name if is_leaf else None
-    
-    # Check if ComicInfo has actual data (not just an empty model)
-    comicinfo_fields = comicinfo.model_dump(exclude_none=True) if comicinfo else {}
-    
-    if comicinfo_fields:
-        # Has ComicInfo data
-        payload = ComicMetadataUpdate(
-            series=series_from_folder,
-            **comicinfo_fields,
+    if is_leaf is None:
+        is_leaf = not repo.folder_has_subfolders(folder_id)
+
+    for (index, comic_path, _, comic_in_db, inspection), comic in zip(ready, upserted):
+        # Store the thumbnail now that the comic has a UUID
+        thumb_success = inspection.thumbnail is not None and write_thumbnail(
+            comic.uuid, inspection.thumbnail, config
         )
-        repo.update_comic_metadata(comic.id, payload)
-    elif series_from_folder is not None:
-        # No ComicInfo, but set series from folder name
-        repo.update_comic_metadata(comic.id, ComicMetadataUpdate(series=series_from_folder))
+        if inspection.thumbnail is not None and not thumb_success:
+            # Keep the existing thumbnail status if updating, else False
+            repo.set_thumbnail_generated(comic.id, _had_thumbnail(comic_in_db))
+
+        series_from_folder = comic_path.parent.name if is_leaf else None
+        comicinfo_fields = inspection.comicinfo_fields
+        if comicinfo_fields:
+            # Has ComicInfo data
+            payload = ComicMetadataUpdate(
+                series=series_from_folder,
+                **comicinfo_fields,
+            )
+            repo.update_comic_metadata(comic.id, payload)
+        elif series_from_folder is not None:
+            # No ComicInfo, but set series from folder name
+            repo.update_comic_metadata(comic.id, ComicMetadataUpdate(series=series_from_folder))
+
+        repo.commit()
+
+        # Log with inline status
+        thumb_status = "✓" if thumb_success else "✗"
+        logger.debug(f"{thumb_status} {comic_path.name} ({len(inspection.pages)} pages)")
+
+        results[index] = (comic.uuid, comic_in_db is not None, False, thumb_success)
 
-    repo.commit()
+    return results
+
+
+def process_comic(
+    comic_path: Path,
+    folder_id: int,
+    config: IssuedConfig,
+    repo: Repository,
+    force: bool,
+    comic_cache: Optional[dict[str, ComicScanState]] = None,
+) -> tuple[Optional[int], bool, bool, bool]:
+    """Process a single comic file.
 
-    # Log with inline status
-    thumb_status = "✓" if thumb_success else "✗"
-    logger.debug(f"{thumb_status} {comic_path.name} ({page_count} pages)")
+    *comic_cache* is the folder's preload_comics_for_folder() result; without
+    it the comic is looked up by path.
+    
+    Returns: (comic_uuid, was_existing, should_skip, thumbnail_generated)
+    """
+    rel_path = to_relative(comic_path, repo.library_root)
+    if comic_cache is not None:
+        comic_in_db = comic_cache.get(rel_path)
+    else:
+        comic = repo.get_comic_by_path(comic_path)
+        comic_in_db = ComicScanState.from_comic(comic) if comic else None
 
-    return comic.uuid, existing, False, thumb_success
+    inspection = _inspect_comic(comic_path, comic_in_db, config, force)
+    return _apply_comic_inspections(
+        [(comic_path, rel_path, comic_in_db, inspection)], folder_id, config, repo
+    )[0]
 
 
 def scan_file(path: Path, config: IssuedConfig) -> None:
@@ -283,9 +423,8 @@ def scan_folder(
         dirs.sort(key=_natural_sort_key)
         files = sorted(files, key=_natural_sort_key)
         for file in files:
-            file_path = Path(root) / file
-            if is_comic_file(file_path) and not file_path.name.startswith("._"):
-                comic_files.append(file_path)
+            if _is_comic_filename(file) and not file.startswith("._"):
+                comic_files.append(Path(root) / file)
     comic_files.sort(key=_path_natural_sort_key)
     
     if comic_files:
@@ -294,19 +433,71 @@ def scan_folder(
         
         with Session(get_engine()) as session:
             repo = Repository(session, config.library_path)
+            repo.preload_folder_cache()
+            # Scan state per folder id, loaded with one query the first time
+            # a folder is seen rather than one lookup per comic.
+            comic_caches: dict[int, dict[str, ComicScanState]] = {}
             
             for comic_path in comic_files:
-                folder = repo.get_or_create_folder(comic_path.parent)
+                folder_id = repo.get_or_create_folder_id(comic_path.parent)
+                comic_cache = comic_caches.get(folder_id)
+                if comic_cache is None:
+                    comic_cache = comic_caches[folder_id] = repo.preload_comics_for_folder(folder_id)
                 
                 process_comic(
-                    comic_path, folder.id, config, repo, force=False
+                    comic_path, folder_id, config, repo, force=False, comic_cache=comic_cache
                 )
 
 
-def delete_path(path: Path, config: IssuedConfig) -> None:
-    """Delete a file or folder from the database and remove thumbnails."""
+@contextmanager
+def _repo_scope(config: IssuedConfig, repo: Optional[Repository]) -> Iterator[Repository]:
+    """Yield *repo* as is, or a Repository on a fresh session closed afterwards."""
+    if repo is not None:
+        yield repo
+        return
     with Session(get_engine()) as session:
-        repo = Repository(session, config.library_path)
+        yield Repository(session, config.library_path)
+
+
+def apply_deletes_and_moves(
+    deletes: list[Path], moves: list[tuple[Path, Path]], config: IssuedConfig
+) -> None:
+    """Apply a monitor window's deletes, then moves, in a single transaction.
+
+    These are DB-only changes, so one commit replaces one per path. If the
+    batch fails to commit, each change is retried in its own transaction.
+    Moved files that were never in the DB are scanned after the commit, so
+    no archive is read while the batch holds the write lock.
+    """
+    rescans: list[Path] = []
+    try:
+        with Session(get_engine()) as session:
+            repo = Repository(session, config.library_path)
+            with repo.deferred_commits():
+                for path in deletes:
+                    delete_path(path, config, repo)
+                for src_path, dest_path in moves:
+                    move_path(src_path, dest_path, config, repo, rescans)
+    except Exception as exc:
+        logger.warning(f"Batched delete/move failed ({exc}); retrying one by one")
+        for path in deletes:
+            delete_path(path, config)
+        for src_path, dest_path in moves:
+            move_path(src_path, dest_path, config)
+        return
+
+    for path in rescans:
+        scan_file(path, config)
+
+
+def delete_path(path: Path, config: IssuedConfig, repo: Optional[Repository] = None) -> None:
+    """Delete a file or folder from the database and remove thumbnails.
+
+    Pass *repo* to run inside the caller's session (see apply_deletes_and_moves);
+    errors then propagate instead of being logged.
+    """
+    batched = repo is not None
+    with _repo_scope(config, repo) as repo:
         try:
             if path.is_dir() or (not path.exists() and path.suffix not in COMIC_EXTENSIONS):
                 # It's a folder (or was a folder)
@@ -331,13 +522,26 @@ def delete_path(path: Path, config: IssuedConfig) -> None:
                 logger.info(f"[-] Removed: {path.name}")
                 
         except Exception as e:
+            if batched:
+                raise  # let apply_deletes_and_moves roll back and retry singly
             logger.error(f"✗ Failed to delete {path.name}: {e}")
 
 
-def move_path(src_path: Path, dest_path: Path, config: IssuedConfig) -> None:
-    """Handle file or folder move/rename in the database."""
-    with Session(get_engine()) as session:
-        repo = Repository(session, config.library_path)
+def move_path(
+    src_path: Path,
+    dest_path: Path,
+    config: IssuedConfig,
+    repo: Optional[Repository] = None,
+    rescans: Optional[list[Path]] = None,
+) -> None:
+    """Handle file or folder move/rename in the database.
+
+    Pass *repo* to run inside the caller's session (see apply_deletes_and_moves);
+    errors then propagate instead of being logged. A moved file with no DB
+    row is scanned as new, or appended to *rescans* for the caller to scan.
+    """
+    batched = repo is not None
+    with _repo_scope(config, repo) as repo:
         try:
             is_folder = False
             if dest_path.exists():
@@ -375,15 +579,19 @@ def move_path(src_path: Path, dest_path: Path, config: IssuedConfig) -> None:
                     comic.path = to_relative(dest_path, config.library_path)
                     comic.folder_id = folder.id
                     comic.filename = dest_path.name
-                    session.add(comic)
+                    repo.session.add(comic)
                     repo.commit()
 
                     logger.info(f"[→] Moved: {src_path.name} → {dest_path.name}")
+                elif rescans is not None:
+                    rescans.append(dest_path)
                 else:
                     # Treat as new if not found
                     process_comic(dest_path, repo.get_or_create_folder(dest_path.parent).id, config, repo, False)
 
         except Exception as e:
+            if batched:
+                raise  # let apply_deletes_and_moves roll back and retry singly
             logger.error(f"✗ Failed to move {src_path.name}: {e}")
 
 
@@ -407,68 +615,94 @@ def scan_library(
     library_root = config.library_path.resolve()
 
     stats = {"added": 0, "updated": 0, "deleted": 0, "skipped": 0}
-    processed_paths: set[Path] = set()
+    processed_rel: set[str] = set()
 
     # Ensure DB is initialized (schema created)
     init_db()
 
     with Session(get_engine()) as session:
         repo = Repository(session, config.library_path)
+        repo.preload_folder_cache()
         
-        for dir_path, comic_files in walk_library(base, ignore_patterns):
-            # Create folder entry
-            folder = repo.get_or_create_folder(dir_path)
+        # One transaction per batch of comics instead of per comic. The batch is
+        # also bounded in time: an open batch holds the write lock across archive
+        # reads and thumbnail rendering, and reader writes wait on it.
+        # Archive reads and thumbnail rendering run in worker threads; the
+        # session is only used here, so SQLite keeps a single writer.
+        workers = config.scanner.worker_count
+        with (
+            ThreadPoolExecutor(max_workers=workers) as pool,
+            repo.deferred_commits(SCAN_COMMIT_MAX_COMICS, SCAN_COMMIT_MAX_SECONDS),
+        ):
+            for dir_path, comic_files, is_leaf in walk_library(base, ignore_patterns):
+                # Create folder entry
+                folder_id = repo.get_or_create_folder_id(dir_path)
+                comic_cache = repo.preload_comics_for_folder(folder_id)
             
-            # Log folder being scanned
-            rel_folder = dir_path.relative_to(library_root) if dir_path != library_root else Path(".")
-            folder_display = str(rel_folder) if str(rel_folder) != "." else "root"
-            logger.info(f"[SCAN] {folder_display} ({len(comic_files)} files)")
-
-            for comic_path in comic_files:
-                processed_paths.add(comic_path.resolve())
-                
-                comic_uuid, was_existing, should_skip, thumb_gen = process_comic(
-                    comic_path, folder.id, config, repo, force
+                # Log folder being scanned
+                rel_folder = dir_path.relative_to(library_root) if dir_path != library_root else Path(".")
+                folder_display = str(rel_folder) if str(rel_folder) != "." else "root"
+                logger.info(f"[SCAN] {folder_display} ({len(comic_files)} files)")
+
+                rel_paths = [to_relative(comic_path, library_root) for comic_path in comic_files]
+                states = [comic_cache.get(rel_path) for rel_path in rel_paths]
+                # Yields in submission order, so comics are written in walk order.
+                # Results held at once: one upsert batch plus the inspect window.
+                inspections = map_bounded(
+                    pool,
+                    _inspect_comic,
+                    workers * SCAN_INSPECT_AHEAD,
+                    comic_files,
+                    states,
+                    repeat(config),
+                    repeat(force),
                 )
-                
-                if should_skip:
-                    stats["skipped"] += 1
-                elif was_existing:
-                    stats["updated"] += 1
-                else:
-                    stats["added"] += 1
+                processed_rel.update(rel_paths)
+                inspected = zip(comic_files, rel_paths, states, inspections)
+                while batch := list(islice(inspected, SCAN_UPSERT_BATCH)):
+                    results = _apply_comic_inspections(batch, folder_id, config, repo, is_leaf)
+                    for comic_uuid, was_existing, should_skip, thumb_gen in results:
+                        if should_skip:
+                            stats["skipped"] += 1
+                        elif was_existing:
+                            stats["updated"] += 1
+                        else:
+                            stats["added"] += 1
 
         # Handle deleted files
-        # Comics in DB under 'base' that were not processed and don't exist on disk
+        # Comics in DB under 'base' that were not processed and don't exist on disk.
+        # Only (id, path) is loaded, and only unprocessed paths are stat()ed.
         from sqlmodel import select, col
         from .models import Comic, Folder
-        from .path_utils import to_relative, to_absolute
+        from .path_utils import descendant_range, to_absolute
 
         base_rel_str = to_relative(base, library_root).rstrip("/")
 
-        if base == library_root:
-            statement = select(Comic)
-        else:
-            statement = select(Comic).where(col(Comic.path).like(f"{base_rel_str}/%"))
-
-        db_comics = session.exec(statement).all()
-
-        for comic in db_comics:
-            comic_abs_path = to_absolute(comic.path, library_root)
+        statement = select(Comic.id, Comic.path)
+        if base != library_root:
+            low, high = descendant_range(base_rel_str)
+            statement = statement.where((col(Comic.path) >= low) & (col(Comic.path) < high))
 
-            if comic_abs_path not in processed_paths and not comic_abs_path.exists():
-                deleted_uuids = repo.delete_comic_by_path(comic_abs_path)
-                repo.commit()
-                if deleted_uuids:
-                    delete_thumbnails(deleted_uuids, config.thumbnails_dir)
-                stats["deleted"] += 1
+        missing_ids = [
+            comic_id
+            for comic_id, rel_path in session.exec(statement).all()
+            if rel_path not in processed_rel
+            and not to_absolute(rel_path, library_root).exists()
+        ]
+        if missing_ids:
+            deleted_uuids = repo.delete_comics_by_ids(missing_ids)
+            repo.commit()
+            if deleted_uuids:
+                delete_thumbnails(deleted_uuids, config.thumbnails_dir)
+            stats["deleted"] += len(missing_ids)
 
         # Handle deleted folders: remove from DB any folder under 'base' that no longer exists on disk
         if base == library_root:
             folder_statement = select(Folder)
         else:
             folder_statement = select(Folder).where(
-                (Folder.path == base_rel_str) | (col(Folder.path).like(f"{base_rel_str}/%"))
+                (Folder.path == base_rel_str)
+                | ((col(Folder.path) >= low) & (col(Folder.path) < high))
             )
         db_folders = session.exec(folder_statement).all()
 
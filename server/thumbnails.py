@@ -6,8 +6,11 @@ storing them under `thumbnails/{comic_uuid}.webp`.
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from PIL import Image
 from sqlmodel import Session
@@ -16,23 +19,28 @@ from .config import IssuedConfig
 from .database import get_engine
 from .logging_config import get_logger
 from .repository import Repository
-from .utils import short_path
+from .utils import map_bounded, short_path
+
+if TYPE_CHECKING:
+    from .archive import ComicFormat
 
 logger = get_logger(__name__)
 
 
-def _extract_first_image_bytes(path: Path) -> bytes | None:
+def _extract_first_image_bytes(
+    path: Path, detected_format: ComicFormat | None = None
+) -> bytes | None:
     from .archive import get_archive
 
     try:
-        with get_archive(path) as archive:
+        with get_archive(path, detected_format=detected_format) as archive:
             images = archive.list_images()
-            images.sort()
             
             if not images:
                 logger.error(f"No images found in archive {path.name}")
                 return None
-            return archive.read(images[0])
+            # Only the first name is needed: one pass, no sort
+            return archive.read(min(images))
             
     except (FileNotFoundError, PermissionError) as exc:
         logger.error(f"Unable to read archive {path.name}: {exc}")
@@ -42,6 +50,26 @@ def _extract_first_image_bytes(path: Path) -> bytes | None:
         return None
 
 
+def _encode_thumbnail(img_bytes: bytes, width: int, height: int, quality: int) -> bytes:
+    out = BytesIO()
+    with Image.open(BytesIO(img_bytes)) as im:
+        # JPEG pages decode at 1/2, 1/4 or 1/8 scale (DCT shrink-on-load)
+        # instead of full resolution. Same bound thumbnail() uses on its own,
+        # which convert() would defeat by loading the full image first.
+        im.draft("RGB", (width * 2, height * 2))
+        if im.mode in ("RGB", "L"):
+            # Scale first: RGB needs no convert() copy at all, and grayscale
+            # converts the small image. Palette/alpha/CMYK convert first.
+            im.thumbnail((width, height))
+            if im.mode != "RGB":
+                im = im.convert("RGB")
+        else:
+            im = im.convert("RGB")
+            im.thumbnail((width, height))
+        im.save(out, format="WEBP", quality=quality)
+    return out.getvalue()
+
+
 def _save_thumbnail(
     img_bytes: bytes,
     thumb_path: Path,
@@ -49,11 +77,66 @@ def _save_thumbnail(
     height: int,
     quality: int,
 ) -> None:
-    thumb_path.parent.mkdir(parents=True, exist_ok=True)
-    with Image.open(BytesIO(img_bytes)) as im:
-        im = im.convert("RGB")
-        im.thumbnail((width, height))
-        im.save(thumb_path, format="WEBP", quality=quality)
+    _write_thumbnail_file(thumb_path, _encode_thumbnail(img_bytes, width, height, quality))
+
+
+def _write_thumbnail_file(thumb_path: Path, data: bytes) -> None:
+    """Write *data*, creating the thumbnails directory only when it is missing.
+
+    The bytes go to a temporary name first and are renamed into place, so the
+    thumbnail route never serves a half-written file. A temporary file left
+    by a crash ends in .webp and is removed by cleanup_orphaned_thumbnails.
+    """
+    tmp_path = thumb_path.with_suffix(".tmp.webp")
+    try:
+        tmp_path.write_bytes(data)
+    except FileNotFoundError:
+        thumb_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+    os.replace(tmp_path, thumb_path)
+
+
+# generate_thumbnails marks this many comics per UPDATE and commit.
+THUMBNAIL_COMMIT_BATCH = 50
+# Renders submitted ahead of the file/DB writer, per worker thread.
+THUMBNAIL_RENDER_AHEAD = 2
+
+
+def render_thumbnail(
+    comic_path: Path,
+    config: IssuedConfig,
+    detected_format: ComicFormat | None = None,
+) -> bytes | None:
+    """Encode the first page of *comic_path* as WebP thumbnail bytes.
+
+    Touches neither the database nor the thumbnails directory, so the scanner
+    runs it in worker threads; write_thumbnail() stores the result.
+    *detected_format* skips re-reading the archive's magic header.
+    """
+    img_bytes = _extract_first_image_bytes(comic_path, detected_format)
+    if not img_bytes:
+        return None
+    try:
+        return _encode_thumbnail(
+            img_bytes,
+            config.thumbnails.width,
+            config.thumbnails.height,
+            config.thumbnails.quality,
+        )
+    except Exception as exc:
+        logger.error(f"Failed to render thumbnail for {short_path(comic_path)}: {exc}")
+        return None
+
+
+def write_thumbnail(comic_uuid: str, data: bytes, config: IssuedConfig) -> bool:
+    """Store render_thumbnail() output as `thumbnails/{comic_uuid}.webp`."""
+    thumb_path = config.thumbnails_dir / f"{comic_uuid}.webp"
+    try:
+        _write_thumbnail_file(thumb_path, data)
+    except OSError as exc:
+        logger.error(f"Failed to save thumbnail {thumb_path.name}: {exc}")
+        return False
+    return True
 
 
 def generate_thumbnail_for_comic(
@@ -95,9 +178,7 @@ def generate_thumbnail_for_comic(
         except Exception:
             return False
 
-        comic = repo.get_comic_by_uuid(comic_uuid)
-        if comic and comic.id is not None:
-            repo.set_thumbnail_generated(comic.id, True)
+        if repo.set_thumbnail_generated_by_uuid(comic_uuid):
             repo.commit()
         return True
     finally:
@@ -112,23 +193,63 @@ def cleanup_orphaned_thumbnails(config: IssuedConfig) -> int:
     """
     with Session(get_engine()) as session:
         repo = Repository(session, config.library_path)
-        valid_uuids = {comic.uuid for comic in repo.get_all_comics()}
-
-        thumbnails_dir = config.thumbnails_dir
-        if not thumbnails_dir.exists():
-            return 0
-
-        deleted = 0
-        for thumb_file in thumbnails_dir.glob("*.webp"):
-            try:
-                comic_uuid = thumb_file.stem
-                if comic_uuid not in valid_uuids:
-                    thumb_file.unlink()
-                    deleted += 1
-            except OSError as exc:
-                logger.error(f"Failed to process thumbnail {thumb_file}: {exc}")
-        
-        return deleted
+        valid_uuids = repo.get_valid_thumbnail_uuids()
+
+    # os.scandir: names only, no Path or stat per entry
+    try:
+        entries = os.scandir(config.thumbnails_dir)
+    except FileNotFoundError:
+        return 0
+    with entries:
+        orphans = [
+            entry.path
+            for entry in entries
+            if entry.name.endswith(".webp") and entry.name[:-5] not in valid_uuids
+        ]
+    if not orphans:
+        return 0
+
+    # Unlinks are independent and wait on the disk, not the GIL
+    with ThreadPoolExecutor(max_workers=config.scanner.worker_count) as pool:
+        return sum(pool.map(_unlink_thumbnail, orphans))
+
+
+def _unlink_thumbnail(path: str) -> int:
+    """Remove one thumbnail file; 1 if it was removed, else 0."""
+    try:
+        os.unlink(path)
+        return 1
+    except FileNotFoundError:
+        return 0
+    except OSError as exc:
+        logger.error(f"Failed to process thumbnail {path}: {exc}")
+        return 0
+
+
+# render() result in generate_thumbnails when the file on disk is still good.
+_CURRENT_THUMBNAIL = object()
+
+
+def _thumbnail_is_current(comic_uuid: str, comic_path: Path, config: IssuedConfig) -> bool:
+    """True if the comic's thumbnail is a readable WebP newer than the comic file.
+
+    Covers thumbnails written before their flag was set (e.g. an interrupted
+    run), which then need no archive read or resize/encode. The file is
+    decoded once so empty or truncated files (possible before writes went
+    through a temporary name) are rendered again.
+    """
+    thumb_path = config.thumbnails_dir / f"{comic_uuid}.webp"
+    try:
+        thumb_stat = thumb_path.stat()
+        if not thumb_stat.st_size or thumb_stat.st_mtime_ns < comic_path.stat().st_mtime_ns:
+            return False
+        with Image.open(thumb_path) as im:
+            if im.format != "WEBP":
+                return False
+            im.load()
+    except Exception:
+        return False
+    return True
 
 
 def generate_thumbnails(config: IssuedConfig, regenerate: bool = False) -> None:
@@ -148,33 +269,45 @@ def generate_thumbnails(config: IssuedConfig, regenerate: bool = False) -> None:
 
         from .path_utils import to_absolute
 
-        for idx, comic in enumerate(comics, start=1):
-            path = to_absolute(comic.path, config.library_path)
+        # Plain values: commits below expire the ORM objects
+        library_path = config.library_path
+        jobs = [(comic.id, comic.uuid, to_absolute(comic.path, library_path)) for comic in comics]
 
-            logger.debug(f"[{idx}/{total}] {short_path(path)}")
+        def render(job: tuple[int, str, Path]) -> bytes | object | None:
+            _, comic_uuid, path = job
             if not path.exists():
                 logger.warning(f"Comic file not found on disk: {path}")
-                continue
-
-            img_bytes = _extract_first_image_bytes(path)
-            if not img_bytes:
-                continue
-
-            thumb_path = config.thumbnails_dir / f"{comic.uuid}.webp"
-            try:
-                _save_thumbnail(
-                    img_bytes,
-                    thumb_path,
-                    config.thumbnails.width,
-                    config.thumbnails.height,
-                    config.thumbnails.quality,
-                )
-            except Exception as exc:
-                logger.error(f"Failed to save thumbnail for {short_path(path)}: {exc}")
-                continue
-
-            if comic.id is not None:
-                repo.set_thumbnail_generated(comic.id, True)
+                return None
+            if not regenerate and _thumbnail_is_current(comic_uuid, path, config):
+                return _CURRENT_THUMBNAIL
+            return render_thumbnail(path, config)
+
+        # Archive reads and Pillow decode/encode run on worker threads (both
+        # release the GIL); files and DB rows are written here, in order.
+        done: list[int] = []
+        try:
+            workers = config.scanner.worker_count
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                rendered = map_bounded(pool, render, workers * THUMBNAIL_RENDER_AHEAD, jobs)
+                for idx, ((comic_id, comic_uuid, path), data) in enumerate(
+                    zip(jobs, rendered), start=1
+                ):
+                    logger.debug(f"[{idx}/{total}] {short_path(path)}")
+                    if data is None:
+                        continue
+                    if data is not _CURRENT_THUMBNAIL and not write_thumbnail(
+                        comic_uuid, data, config
+                    ):
+                        continue
+                    done.append(comic_id)
+                    if len(done) >= THUMBNAIL_COMMIT_BATCH:
+                        repo.set_thumbnails_generated(done)
+                        repo.commit()
+                        done.clear()
+        finally:
+            # Thumbnails already on disk keep their flag even if the run stops early
+            if done:
+                repo.set_thumbnails_generated(done)
                 repo.commit()
 
         logger.info("Thumbnail generation complete.")
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
 
 from .logging_config import get_logger
 
@@ -20,12 +24,26 @@ class Colors:
     YELLOW = "\033[93m"
 
 
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True if an If-None-Match header value matches *etag* (weak comparison, or ``*``)."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates or "*" in candidates
+
+
 def short_path(path: Path) -> str:
     """Return abbreviated path showing only parent folder + filename.
     
     Example: /very/long/path/to/folder/file.cbz -> folder/file.cbz
     """
-    return f"{path.parent.name}/{path.name}"
+    # String slicing: called per comic in log lines, and path.parent builds a Path
+    s = os.fspath(path)
+    name_sep = s.rfind(os.sep)
+    if name_sep < 0:
+        return f"/{s}"  # bare file name: empty parent name, as before
+    parent_sep = s.rfind(os.sep, 0, name_sep)
+    return f"{s[parent_sep + 1:name_sep]}/{s[name_sep + 1:]}"
 
 
 def dim_log(message: str) -> str:
@@ -46,10 +64,28 @@ def delete_thumbnails(comic_uuids: list[str], thumbnails_dir: Path) -> int:
     deleted = 0
     for comic_uuid in comic_uuids:
         thumb_path = thumbnails_dir / f"{comic_uuid}.webp"
-        if thumb_path.exists():
-            try:
-                thumb_path.unlink()
-                deleted += 1
-            except Exception as exc:
-                logger.error(f"Failed to delete thumbnail {thumb_path}: {exc}")
+        try:
+            thumb_path.unlink()
+            deleted += 1
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logger.error(f"Failed to delete thumbnail {thumb_path}: {exc}")
     return deleted
+
+
+def map_bounded(
+    pool: ThreadPoolExecutor, fn: Callable[..., Any], window: int, *iterables: Iterable
+) -> Iterator[Any]:
+    """Like pool.map(), in order, but with at most *window* calls submitted ahead.
+
+    pool.map() submits every call at once, so finished results (rendered
+    thumbnails) pile up whenever the consumer is slower than the workers.
+    """
+    pending: deque[Future] = deque()
+    for args in zip(*iterables):
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(pool.submit(fn, *args))
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,45 @@
+"""Tests for config.ini loading."""
+
+import os
+
+from server.config import PROJECT_ROOT, _read_ini, _read_ini_configparser, ensure_config, load_config
+
+
+def _write_config(path, name: str) -> None:
+    path.write_text(
+        f"[library]\npath = /comics\nname = {name}\n",
+        encoding="utf-8",
+    )
+
+
+def test_load_config_reuses_parse_until_file_changes(tmp_path):
+    config_path = tmp_path / "config.ini"
+    _write_config(config_path, "First")
+
+    first = load_config(config_path)
+    assert load_config(config_path) is first
+
+    _write_config(config_path, "Second")
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second = load_config(config_path)
+    assert second is not first
+    assert second.library.name == "Second"
+
+
+def test_read_ini_matches_configparser(tmp_path):
+    example = PROJECT_ROOT / "config.ini.example"
+    assert _read_ini(example) == _read_ini_configparser(example)
+
+    continued = tmp_path / "continued.ini"
+    continued.write_text("[scanner]\nignore_patterns = a,\n  b\n", encoding="utf-8")
+    assert _read_ini(continued) == {"scanner": {"ignore_patterns": "a,\nb"}}
+
+
+def test_ensure_config_sets_library_path(tmp_path):
+    config_path = ensure_config(tmp_path / "C:\\comics", tmp_path / "config.ini")
+
+    config = load_config(config_path)
+    assert config.library_path == tmp_path / "C:\\comics"
+    assert config.server.port == 8181
@@ -0,0 +1,22 @@
+"""Tests for the pooled sqlite3 connections behind db_connection()."""
+
+from server import database
+
+
+def test_db_connection_reuses_handle_and_discards_uncommitted_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "pool.db")
+    with database.db_connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        first = conn
+
+    with database.db_connection() as conn:
+        assert conn is first
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        with database.db_connection() as nested:
+            assert nested is not conn
+
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "other.db")
+    with database.db_connection() as conn:
+        assert conn is not first
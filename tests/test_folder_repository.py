@@ -0,0 +1,154 @@
+import sqlite3
+
+from reader import repo
+from server.migrations import FOLDER_PREVIEW_TRIGGERS
+
+
+def _setup_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE folders (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            path TEXT UNIQUE NOT NULL,
+            parent_id INTEGER NULL,
+            preview_uuids TEXT NULL
+        );
+        CREATE TABLE comics (
+            id INTEGER PRIMARY KEY,
+            uuid TEXT UNIQUE NOT NULL,
+            filename TEXT NOT NULL,
+            path TEXT UNIQUE NOT NULL,
+            last_scanned_at TEXT NULL,
+            folder_id INTEGER
+        );
+        INSERT INTO folders (id, name, path, parent_id) VALUES
+            (1, 'Library', '.', NULL),
+            (2, 'Marvel', 'Marvel', 1),
+            (3, 'X-Men', 'Marvel/X-Men', 2),
+            (4, 'Avengers', 'Marvel/Avengers', 2),
+            (5, 'Empty', 'Empty', 1);
+        INSERT INTO comics (id, uuid, filename, path, last_scanned_at, folder_id) VALUES
+            (1, 'u1', 'x1.cbz', 'Marvel/X-Men/x1.cbz', '2026-01-01', 3),
+            (2, 'u2', 'x2.cbz', 'Marvel/X-Men/x2.cbz', '2026-01-02', 3),
+            (3, 'u3', 'a1.cbz', 'Marvel/Avengers/a1.cbz', '2026-01-03', 4),
+            (4, 'u4', 'm1.cbz', 'Marvel/m1.cbz', '2026-01-04', 2);
+        """
+    )
+    for name, body in FOLDER_PREVIEW_TRIGGERS.items():
+        conn.execute(f"CREATE TRIGGER {name} {body}")
+    conn.commit()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    _setup_schema(conn)
+    return conn
+
+
+def test_add_folder_item_counts_sums_subfolders_and_comics():
+    conn = _connect()
+    folders = [{"id": 2}, {"id": 3}, {"id": 5}]
+
+    repo.add_folder_item_counts(conn, folders)
+
+    assert [f["item_count"] for f in folders] == [3, 2, 0]
+
+
+def test_add_folder_item_counts_accepts_empty_list():
+    conn = _connect()
+    folders: list[dict] = []
+    repo.add_folder_item_counts(conn, folders)
+    assert folders == []
+
+
+def test_breadcrumbs_run_root_to_leaf_and_exclude_library_root():
+    conn = _connect()
+
+    assert repo.get_breadcrumbs_for_folder(conn, 3) == [
+        {"id": 2, "name": "Marvel"},
+        {"id": 3, "name": "X-Men"},
+    ]
+    assert repo.get_breadcrumbs_for_folder(conn, 1) == []
+    assert repo.get_breadcrumbs_for_folder(conn, 999) == []
+
+
+def test_preview_thumbnails_pick_one_comic_per_child_first():
+    conn = _connect()
+
+    uuids = repo.get_folder_preview_thumbnails(conn, 2, limit=3)
+
+    assert set(uuids) == {"u1", "u2", "u3"}
+    # The first two covers come from different children (X-Men, Avengers).
+    assert "u3" in uuids[:2]
+
+
+def _cached(conn, folder_id):
+    return conn.execute(
+        "SELECT preview_uuids FROM folders WHERE id = ?", (folder_id,)
+    ).fetchone()["preview_uuids"]
+
+
+def test_preview_thumbnails_are_cached_until_subtree_changes():
+    conn = _connect()
+
+    first = repo.get_folder_preview_thumbnails(conn, 3, limit=1)
+    repo.get_folder_preview_thumbnails(conn, 2)
+    assert first == ["u2"]
+    assert _cached(conn, 3) == '["u2", "u1"]'
+    assert _cached(conn, 2) is not None
+
+    conn.execute(
+        "INSERT INTO comics (id, uuid, filename, path, last_scanned_at, folder_id) "
+        "VALUES (5, 'u5', 'x3.cbz', 'Marvel/X-Men/x3.cbz', '2026-02-01', 3)"
+    )
+    assert _cached(conn, 3) is None
+    assert _cached(conn, 2) is None
+
+    assert repo.get_folder_preview_thumbnails(conn, 3, limit=1) == ["u5"]
+
+
+def test_preview_cache_survives_rescan_but_not_folder_change():
+    conn = _connect()
+    repo.get_folder_preview_thumbnails(conn, 3)
+
+    conn.execute("UPDATE comics SET last_scanned_at = '2026-03-01' WHERE id = 1")
+    assert _cached(conn, 3) == '["u2", "u1"]'
+
+    conn.execute("UPDATE comics SET folder_id = 4 WHERE id = 1")
+    assert _cached(conn, 3) is None
+
+
+def test_preview_thumbnails_skip_cache_write_while_db_is_locked(tmp_path):
+    db_file = tmp_path / "library.db"
+    conn = sqlite3.connect(db_file)
+    conn.row_factory = sqlite3.Row
+    _setup_schema(conn)
+    writer = sqlite3.connect(db_file)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert repo.get_folder_preview_thumbnails(conn, 3) == ["u2", "u1"]
+        assert _cached(conn, 3) is None
+    finally:
+        writer.rollback()
+        writer.close()
+
+    repo.get_folder_preview_thumbnails(conn, 3)
+    assert _cached(conn, 3) == '["u2", "u1"]'
+    conn.close()
+
+
+def test_preview_thumbnails_empty_leaf_is_empty():
+    conn = _connect()
+    assert repo.get_folder_preview_thumbnails(conn, 5) == []
+    assert _cached(conn, 5) == "[]"
+
+
+def test_subfolders_with_item_count():
+    conn = _connect()
+
+    assert repo.get_subfolders_with_item_count(conn, 1) == [
+        {"id": 5, "name": "Empty", "item_count": 0},
+        {"id": 2, "name": "Marvel", "item_count": 3},
+    ]
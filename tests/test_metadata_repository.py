@@ -0,0 +1,121 @@
+import sqlite3
+
+from reader import repo
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        CREATE TABLE comics (
+            id INTEGER PRIMARY KEY,
+            uuid TEXT UNIQUE NOT NULL,
+            filename TEXT NOT NULL,
+            folder_id INTEGER
+        );
+        CREATE TABLE metadata (
+            id INTEGER PRIMARY KEY,
+            comic_id INTEGER UNIQUE NOT NULL,
+            title TEXT, series TEXT, issue_number INTEGER, publisher TEXT,
+            year INTEGER, month INTEGER, writer TEXT, penciller TEXT,
+            artist TEXT, summary TEXT, notes TEXT, web TEXT,
+            language_iso TEXT, genre TEXT, score INTEGER,
+            is_completed BOOLEAN NOT NULL,
+            current_page INTEGER,
+            last_read_at DATETIME
+        );
+        CREATE TABLE folders (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            parent_id INTEGER NULL
+        );
+        INSERT INTO folders (id, name, parent_id) VALUES
+            (1, 'Library', NULL), (2, 'Marvel', 1), (3, 'X-Men', 2);
+        INSERT INTO comics (id, uuid, filename, folder_id) VALUES (1, 'u1', 'one.cbz', 3);
+        """
+    )
+    return conn
+
+
+def test_update_metadata_creates_then_updates_row():
+    conn = _connect()
+
+    repo.update_metadata(conn, "u1", {"title": "First", "bogus": "ignored"})
+    repo.update_metadata(conn, "u1", {"writer": "Someone"})
+
+    meta = repo.get_metadata(conn, "u1")
+    assert meta["title"] == "First"
+    assert meta["writer"] == "Someone"
+    assert conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0] == 1
+
+
+def test_update_metadata_unknown_comic_is_noop():
+    conn = _connect()
+    repo.update_metadata(conn, "missing", {"title": "x"})
+    assert conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0] == 0
+
+
+def test_update_progress_keeps_completed_flag_when_not_given():
+    conn = _connect()
+
+    repo.update_progress(conn, "u1", 3, True)
+    repo.update_progress(conn, "u1", 5, None)
+
+    progress = repo.get_progress(conn, "u1")
+    assert progress["current_page"] == 5
+    assert progress["is_completed"] is True
+
+    repo.clear_progress(conn, "u1")
+    progress = repo.get_progress(conn, "u1")
+    assert progress["current_page"] == 1
+    assert progress["is_completed"] is False
+    assert progress["last_read_at"] is None
+
+
+def test_mark_all_comics_in_folder_completed_creates_missing_rows():
+    conn = _connect()
+    conn.executescript(
+        """
+        UPDATE comics SET folder_id = 9;
+        INSERT INTO comics (id, uuid, filename, folder_id) VALUES (2, 'u2', 'two.cbz', 9);
+        INSERT INTO metadata (comic_id, is_completed, title) VALUES (2, 0, 'Kept');
+        """
+    )
+
+    assert repo.mark_all_comics_in_folder_completed(conn, 9) == 2
+
+    rows = conn.execute(
+        "SELECT comic_id, is_completed, title FROM metadata ORDER BY comic_id"
+    ).fetchall()
+    assert [tuple(r) for r in rows] == [(1, 1, None), (2, 1, "Kept")]
+
+
+def test_initial_page_by_id_is_clamped():
+    conn = _connect()
+    assert repo.get_initial_page_by_id(conn, 1, 10) == 1
+
+    repo.update_progress(conn, "u1", 42, None)
+    assert repo.get_initial_page_by_id(conn, 1, 10) == 10
+    assert repo.get_initial_page_by_id(conn, 1, 0) == 1
+
+    repo.update_progress(conn, "u1", 0, None)
+    assert repo.get_initial_page_by_id(conn, 1, 10) == 1
+
+
+def test_reader_context_combines_page_title_and_breadcrumbs():
+    conn = _connect()
+    assert repo.get_reader_context(conn, 1, None, 5) == {
+        "initial_page": 1,
+        "title": None,
+        "breadcrumbs": [],
+    }
+
+    repo.update_metadata(conn, "u1", {"title": "Days of Future Past"})
+    repo.update_progress(conn, "u1", 9, None)
+
+    assert repo.get_reader_context(conn, 1, 3, 5) == {
+        "initial_page": 5,
+        "title": "Days of Future Past",
+        "breadcrumbs": [{"id": 2, "name": "Marvel"}, {"id": 3, "name": "X-Men"}],
+    }
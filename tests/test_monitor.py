@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from server.monitor import ComicLibraryHandler, MonitorTask, optimize_tasks
+from server.monitor import ComicLibraryHandler, DedupTaskQueue, MonitorTask, optimize_tasks
 
 
 def test_optimize_tasks_deduplicates():
@@ -44,6 +44,30 @@ def test_optimize_tasks_keeps_all_different_actions():
     assert len(optimized) == 3
 
 
+def test_optimize_tasks_drops_paths_under_scanned_or_deleted_folders():
+    tasks = [
+        MonitorTask("scan_folder", Path("/comics/a/b")),
+        MonitorTask("scan_folder", Path("/comics/a")),
+        MonitorTask("scan_folder", Path("/comics/ab")),
+        MonitorTask("scan_file", Path("/comics/a/b/c.cbz")),
+        MonitorTask("scan_file", Path("/comics/z.cbz")),
+        MonitorTask("delete", Path("/old/x/y.cbz")),
+        MonitorTask("delete", Path("/old/x")),
+    ]
+    assert optimize_tasks(tasks) == [
+        MonitorTask("delete", Path("/old/x")),
+        MonitorTask("scan_folder", Path("/comics/a")),
+        MonitorTask("scan_folder", Path("/comics/ab")),
+        MonitorTask("scan_file", Path("/comics/z.cbz")),
+    ]
+
+
+def test_optimize_tasks_keeps_repeated_moves_in_order():
+    there = MonitorTask("move", Path("/comics/a.cbz"), Path("/comics/b.cbz"))
+    back = MonitorTask("move", Path("/comics/b.cbz"), Path("/comics/a.cbz"))
+    assert optimize_tasks([there, back, there]) == [there, back, there]
+
+
 def test_handler_ignores_macos_temp_files():
     """Test that handler ignores macOS temporary files (._*)."""
     import queue
@@ -106,3 +130,24 @@ def test_handler_queues_folder_creation():
     assert task.action == "scan_folder"
     assert task.path == Path("/comics/Marvel")
 
+
+def test_dedup_task_queue_skips_waiting_duplicates():
+    task_queue = DedupTaskQueue()
+    task = MonitorTask("scan_file", Path("/comics/issue1.cbz"))
+    task_queue.put(task)
+    task_queue.put(task)
+    task_queue.put(MonitorTask("delete", Path("/comics/issue1.cbz")))
+    assert task_queue.qsize() == 2
+
+    assert task_queue.get_nowait() == task
+    task_queue.put(task)
+    assert task_queue.qsize() == 2
+
+
+def test_dedup_task_queue_keeps_repeated_moves():
+    task_queue = DedupTaskQueue()
+    there = MonitorTask("move", Path("/comics/a.cbz"), Path("/comics/b.cbz"))
+    back = MonitorTask("move", Path("/comics/b.cbz"), Path("/comics/a.cbz"))
+    for task in (there, back, there):
+        task_queue.put(task)
+    assert [task_queue.get_nowait() for _ in range(3)] == [there, back, there]
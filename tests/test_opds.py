@@ -1,5 +1,6 @@
 """Tests for OPDS endpoints."""
 
+import time
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from pathlib import Path
@@ -10,10 +11,12 @@ from sqlmodel import Session, create_engine
 
 from server.config import IssuedConfig, LibraryConfig, MonitoringConfig, ReaderAuthConfig, ScannerConfig, ServerConfig, ThumbnailConfig
 from server.database import init_db
+from server.migrations import ensure_comics_fts_table
 from server.opds import app
 from server.repository import Repository
-from server.models import Comic, Folder
-from server.opds.feeds import _comic_media_type
+from server.models import Comic, ComicMetadata, Folder
+from server.opds.feeds import FEED_CHUNK_ENTRIES, _comic_media_type, _iter_feed_chunks
+from server.opds.routes import _http_date_timestamp
 
 
 @pytest.fixture
@@ -111,6 +114,34 @@ def test_opds_search_returns_results(client, test_db, test_config):
     assert len(entries) > 0
 
 
+def test_opds_search_uses_fts_metadata_columns(client, test_db, test_config, monkeypatch):
+    """With comics_fts present, search matches metadata such as writer, and short terms."""
+    monkeypatch.setattr("server.migrations.DB_PATH", Path(test_db.url.database), raising=True)
+    assert ensure_comics_fts_table() is True
+    with Session(test_db) as session:
+        repo = Repository(session, test_config.library_path)
+        folder = repo.get_or_create_folder(test_config.library_path)
+        comic = Comic(
+            filename="Daredevil 001.cbz",
+            path="Daredevil 001.cbz",
+            format="cbz",
+            file_size=1,
+            page_count=1,
+            file_modified_at=datetime.now(),
+            folder_id=folder.id,
+        )
+        session.add(comic)
+        session.commit()
+        session.add(ComicMetadata(comic_id=comic.id, writer="Frank Miller"))
+        session.commit()
+
+    ns = {"atom": "http://www.w3.org/2005/Atom"}
+    for q, expected in (("frank mil", 1), ("EV", 1), ("Batman", 0)):
+        response = client.get("/opds/search", params={"q": q})
+        assert response.status_code == 200
+        assert len(ET.fromstring(response.content).findall("atom:entry", ns)) == expected
+
+
 def test_opds_folder_endpoint_returns_404_for_missing(client):
     """Test that folder endpoint returns 404 for non-existent folder."""
     response = client.get("/opds/folder/999")
@@ -131,6 +162,31 @@ def test_cb7_media_type():
     assert _comic_media_type("cb7") == "application/x-7z-compressed"
 
 
+def test_feed_chunks_batch_entries_and_close_feed():
+    entries = (f"<e{i}/>" for i in range(FEED_CHUNK_ENTRIES * 2))
+    chunks = list(_iter_feed_chunks("<feed>", entries))
+    assert len(chunks) == 3
+    assert b"".join(chunks).decode() == (
+        "<feed>" + "".join(f"<e{i}/>" for i in range(FEED_CHUNK_ENTRIES * 2)) + "\n</feed>"
+    )
+
+
+def test_media_type_case_and_unknown_format():
+    assert _comic_media_type("CBZ") == "application/x-cbz"
+    assert _comic_media_type("epub") == "application/octet-stream"
+
+
+def test_http_date_without_zone_is_utc_on_non_utc_host(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        assert _http_date_timestamp("Thu, 01 Jan 2026 00:00:00 -0000") == 1767225600
+        assert _http_date_timestamp("Thu, 01 Jan 2026 00:00:00 GMT") == 1767225600
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
 def test_misnamed_cb7_download_uses_real_format(client, test_db, test_config):
     comic_path = test_config.library_path / "misnamed.cbz"
     payload = b"7z\xbc\xaf\x27\x1carchive-data"
@@ -159,3 +215,54 @@ def test_misnamed_cb7_download_uses_real_format(client, test_db, test_config):
     assert response.content == payload
     assert response.headers["content-type"] == "application/x-7z-compressed"
     assert 'filename="misnamed.cb7"' in response.headers["content-disposition"]
+
+    revalidated = client.get(
+        f"/opds/comic/{comic_uuid}/file", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert client.get(
+        f"/opds/comic/{comic_uuid}/file",
+        headers={"If-Modified-Since": response.headers["last-modified"]},
+    ).status_code == 304
+
+
+def test_recent_links_series_only_for_leaf_folders(client, test_db, test_config):
+    with Session(test_db) as session:
+        repo = Repository(session, test_config.library_path)
+        parent = repo.get_or_create_folder(test_config.library_path / "Publisher")
+        leaf = repo.get_or_create_folder(test_config.library_path / "Publisher" / "Series")
+        for name, folder in (("a.cbz", parent), ("b.cbz", leaf)):
+            session.add(
+                Comic(
+                    filename=name,
+                    path=name,
+                    format="cbz",
+                    file_size=1,
+                    page_count=1,
+                    file_modified_at=datetime.now(),
+                    folder_id=folder.id,
+                )
+            )
+        session.commit()
+
+    response = client.get("/opds/recent")
+
+    assert response.status_code == 200
+    assert response.text.count('rel="collection"') == 1
+    assert 'title="Series"' in response.text
+
+
+def test_thumbnail_is_revalidated_with_etag(client, test_config, tmp_path, monkeypatch):
+    monkeypatch.setattr("server.config.DATA_DIR", tmp_path, raising=True)
+    test_config.thumbnails_dir.mkdir()
+    (test_config.thumbnails_dir / "abc.webp").write_bytes(b"webp-bytes")
+
+    response = client.get("/opds/comic/abc/thumbnail")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, no-cache"
+    revalidated = client.get(
+        "/opds/comic/abc/thumbnail", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
@@ -130,6 +130,24 @@ def test_pdf_page_caching(tmp_path):
         assert img1 == img2
 
 
+@pytest.mark.skipif(not FITZ_AVAILABLE, reason="PyMuPDF not installed")
+def test_pdf_cached_handle_keeps_no_rendered_pages(tmp_path):
+    from server.archive import close_cached_archives, open_cached_archive
+
+    pdf_path = tmp_path / "reader.pdf"
+    doc = fitz.open()
+    doc.new_page()
+    doc.save(pdf_path)
+    doc.close()
+
+    try:
+        with open_cached_archive(pdf_path) as archive:
+            assert archive.read("page_0001.png")
+            assert archive._image_cache == {}
+    finally:
+        close_cached_archives()
+
+
 @pytest.mark.skipif(not FITZ_AVAILABLE, reason="PyMuPDF not installed")
 def test_pdf_comicinfo_generation(tmp_path):
     """Test ComicInfo.xml generation from PDF metadata."""
@@ -0,0 +1,126 @@
+"""Tests for reader JSON API endpoints."""
+
+import importlib
+import sqlite3
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import create_engine
+
+from server.config import (
+    IssuedConfig,
+    LibraryConfig,
+    MonitoringConfig,
+    ReaderAuthConfig,
+    ScannerConfig,
+    ServerConfig,
+    ThumbnailConfig,
+)
+from server.database import init_db
+from server.opds import app
+
+COMIC_UUID = "3f2b8c1e-5d4a-4e6b-9c7d-0a1b2c3d4e5f"
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    library_path = tmp_path / "comics"
+    library_path.mkdir()
+    config = IssuedConfig(
+        library=LibraryConfig(path=library_path, name="Test Library"),
+        server=ServerConfig(),
+        thumbnails=ThumbnailConfig(),
+        scanner=ScannerConfig(),
+        monitoring=MonitoringConfig(enabled=False),
+        reader_auth=ReaderAuthConfig(),
+    )
+    db_file = tmp_path / "test.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+    init_db()
+    with sqlite3.connect(db_file) as conn:
+        conn.executescript(
+            f"""
+            INSERT INTO folders (id, name, path, created_at) VALUES (1, 'Series', 'Series', '2026-01-01');
+            INSERT INTO comics (id, uuid, filename, path, format, file_size, page_count,
+                                file_modified_at, thumbnail_generated, folder_id, created_at)
+            VALUES (1, '{COMIC_UUID}', 'one.cbz', 'Series/one.cbz', 'cbz', 1, 10, '2026-01-01', 0, 1, '2026-01-01');
+            """
+        )
+    middleware_module = importlib.import_module("server.opds.middleware")
+    monkeypatch.setattr(middleware_module, "get_config", lambda: config)
+    monkeypatch.setattr("reader.services.get_config", lambda: config)
+    return TestClient(app), db_file
+
+
+def test_progress_and_metadata_writes_are_committed(api):
+    client, db_file = api
+
+    assert client.patch(f"/reader/api/comic/{COMIC_UUID}/progress", json={"current_page": 4}).status_code == 200
+    assert client.patch(f"/reader/api/comic/{COMIC_UUID}/metadata", json={"title": "One"}).status_code == 200
+    assert client.put(f"/reader/api/comic/{COMIC_UUID}/tags", json={"tags": ["b", "a", "a "]}).json() == {
+        "ok": True,
+        "tags": ["a", "b"],
+    }
+    assert client.post(f"/reader/api/comic/{COMIC_UUID}/completed/toggle").json() == {
+        "ok": True,
+        "is_completed": True,
+    }
+
+    with sqlite3.connect(db_file) as conn:
+        row = conn.execute(
+            "SELECT current_page, title, is_completed FROM metadata WHERE comic_id = 1"
+        ).fetchone()
+        tags = conn.execute(
+            "SELECT t.name FROM comic_tags ct JOIN tags t ON t.id = ct.tag_id ORDER BY t.name"
+        ).fetchall()
+    assert row == (4, "One", 1)
+    assert [t[0] for t in tags] == ["a", "b"]
+
+
+def test_write_endpoints_return_404_for_unknown_comic(api):
+    client, _ = api
+    assert client.patch("/reader/api/comic/nope/progress", json={"current_page": 1}).status_code == 404
+    assert client.patch("/reader/api/comic/nope/metadata", json={"title": "x"}).status_code == 404
+    assert client.post("/reader/api/comic/nope/progress/clear").status_code == 404
+
+
+def test_empty_metadata_patch_and_clear_succeed_for_existing_comic(api):
+    client, _ = api
+    assert client.patch(f"/reader/api/comic/{COMIC_UUID}/metadata", json={}).status_code == 200
+    assert client.post(f"/reader/api/comic/{COMIC_UUID}/progress/clear").status_code == 200
+
+
+def test_page_endpoint_streams_archive_member(api, tmp_path):
+    client, _ = api
+    (tmp_path / "comics" / "Series").mkdir()
+    page = bytes(range(256)) * 4096
+    with zipfile.ZipFile(tmp_path / "comics" / "Series" / "one.cbz", "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("001.png", page)
+
+    response = client.get(f"/reader/api/comic/{COMIC_UUID}/page/1")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["content-length"] == str(len(page))
+    assert response.content == page
+    assert client.get(f"/reader/api/comic/{COMIC_UUID}/page/2").status_code == 404
+
+    etag = response.headers["etag"]
+    cached = client.get(f"/reader/api/comic/{COMIC_UUID}/page/1", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+
+def test_malformed_uuid_is_rejected_before_lookup(api, monkeypatch):
+    client, _ = api
+    monkeypatch.setattr("reader.services.get_comic_by_uuid", lambda *_: pytest.fail("looked up"))
+    assert client.get("/reader/api/comic/not-a-uuid").status_code == 404
+    assert client.get("/reader/api/comic/not-a-uuid/page/1").status_code == 404
+    assert client.get("/reader/comic/not-a-uuid").status_code == 404
@@ -0,0 +1,49 @@
+"""Tests for reader session cookies."""
+
+import hashlib
+import hmac
+import json
+import time
+
+from reader import auth
+
+
+def test_session_cookie_round_trip():
+    cookie = auth.create_session_cookie_value("reader", "secret")
+
+    assert auth.verify_session_cookie(cookie, "secret") == "reader"
+    assert auth.verify_session_cookie(cookie, "other") is None
+
+
+def test_session_cookie_rejects_tampered_signature():
+    cookie = auth.create_session_cookie_value("reader", "secret")
+    payload_b64, sig_b64 = cookie.split(".")
+    tampered = f"{payload_b64}.{sig_b64[:-1]}{'A' if sig_b64[-1] != 'A' else 'B'}"
+
+    assert auth.verify_session_cookie(tampered, "secret") is None
+    assert auth.verify_session_cookie("garbage", "secret") is None
+    assert auth.verify_session_cookie(None, "secret") is None
+
+
+def test_session_cookie_accepts_legacy_hmac_signature():
+    payload_bytes = json.dumps(
+        {"u": "reader", "e": int(time.time()) + 60}, sort_keys=True
+    ).encode("utf-8")
+    sig = hmac.new(b"secret", payload_bytes, hashlib.sha256).digest()
+    cookie = f"{auth._b64_encode(payload_bytes)}.{auth._b64_encode(sig)}"
+
+    assert auth.verify_session_cookie(cookie, "secret") == "reader"
+
+
+def test_session_cookie_rejects_expired_payload(monkeypatch):
+    cookie = auth.create_session_cookie_value("reader", "secret")
+    later = time.time() + auth.SESSION_MAX_AGE_SECONDS + 10
+    monkeypatch.setattr(auth.time, "time", lambda: later)
+
+    assert auth.verify_session_cookie(cookie, "secret") is None
+
+
+def test_credentials_match_requires_both_fields():
+    assert auth.credentials_match("reader", "secret", "reader", "secret")
+    assert not auth.credentials_match("reader", "wrong", "reader", "secret")
+    assert not auth.credentials_match("other", "secret", "reader", "secret")
@@ -0,0 +1,48 @@
+"""Tests for reader page extraction and its page-name cache."""
+
+import os
+import zipfile
+
+from reader import services
+
+
+def _write_cbz(path, names):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name in names:
+            zf.writestr(name, name.encode())
+
+
+def test_get_page_image_uses_natural_order_and_tracks_file_changes(tmp_path, monkeypatch):
+    cbz = tmp_path / "comic.cbz"
+    _write_cbz(cbz, ["10.jpg", "2.jpg", "1.jpg"])
+    monkeypatch.setattr(services, "get_comic_by_uuid", lambda uuid: {"path": cbz})
+
+    assert services.get_page_image("u", 1) == (b"2.jpg", "image/jpeg")
+    assert services.get_page_image("u", 2) == (b"10.jpg", "image/jpeg")
+    assert services.get_page_image("u", 3) is None
+
+    _write_cbz(cbz, ["a.png", "b.png"])
+    stat = cbz.stat()
+    os.utime(cbz, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert services.get_page_image("u", 0) == (b"a.png", "image/png")
+
+
+def test_open_cached_archive_reuses_handles_and_evicts(tmp_path, monkeypatch):
+    from server import archive as archive_module
+
+    monkeypatch.setattr(archive_module, "OPEN_ARCHIVE_CACHE_SIZE", 1)
+    first, second = tmp_path / "a.cbz", tmp_path / "b.cbz"
+    _write_cbz(first, ["1.jpg"])
+    _write_cbz(second, ["1.jpg"])
+
+    try:
+        with archive_module.open_cached_archive(first) as a1:
+            pass
+        with archive_module.open_cached_archive(first) as again:
+            assert again is a1
+        with archive_module.open_cached_archive(second) as b:
+            assert b.read("1.jpg") == b"1.jpg"
+        assert a1.zf.fp is None  # evicted and closed
+    finally:
+        archive_module.close_cached_archives()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import dataclasses
 import importlib
 import sqlite3
 from datetime import datetime, timezone
@@ -22,6 +23,17 @@ from server.config import (
 from server.database import init_db
 from server.models import Comic, Folder
 from server.opds import app
+from reader import auth as reader_auth
+
+
+def _use_config(monkeypatch, config):
+    for module_name in (
+        "reader.routes._common",
+        "reader.routes.auth",
+        "server.opds.middleware",
+        "server.opds.routes",
+    ):
+        monkeypatch.setattr(importlib.import_module(module_name), "get_config", lambda: config)
 
 
 @pytest.fixture
@@ -55,14 +67,7 @@ def proxy_app(tmp_path, monkeypatch):
             """
         )
 
-    common_module = importlib.import_module("reader.routes._common")
-    auth_module = importlib.import_module("reader.routes.auth")
-    middleware_module = importlib.import_module("server.opds.middleware")
-    opds_routes_module = importlib.import_module("server.opds.routes")
-    monkeypatch.setattr(common_module, "get_config", lambda: config)
-    monkeypatch.setattr(auth_module, "get_config", lambda: config)
-    monkeypatch.setattr(middleware_module, "get_config", lambda: config)
-    monkeypatch.setattr(opds_routes_module, "get_config", lambda: config)
+    _use_config(monkeypatch, config)
 
     client = TestClient(app, base_url="http://issued.internal:8181")
     return config, engine, client
@@ -77,7 +82,7 @@ def test_reader_html_uses_origin_relative_asset_and_thumbnail_urls(proxy_app):
         session.refresh(folder)
         session.add(
             Comic(
-                uuid="proxy-comic",
+                uuid="0b9d6a52-7c41-4f3e-8a2d-5e6f7a8b9c0d",
                 filename="Issue 1.cbz",
                 path="Series/Issue 1.cbz",
                 format="cbz",
@@ -94,8 +99,8 @@ def test_reader_html_uses_origin_relative_asset_and_thumbnail_urls(proxy_app):
     assert response.status_code == 200
     assert 'href="/reader/static/css/style.css"' in response.text
     assert 'src="/reader/static/js/browser.js"' in response.text
-    assert 'href="/reader/comic/proxy-comic"' in response.text
-    assert 'src="/opds/comic/proxy-comic/thumbnail"' in response.text
+    assert 'href="/reader/comic/0b9d6a52-7c41-4f3e-8a2d-5e6f7a8b9c0d"' in response.text
+    assert 'src="/opds/comic/0b9d6a52-7c41-4f3e-8a2d-5e6f7a8b9c0d/thumbnail"' in response.text
     assert "issued.internal:8181" not in response.text
 
 
@@ -106,27 +111,27 @@ def test_reader_page_uses_origin_relative_page_image_url(proxy_app, monkeypatch)
         browse_module.services,
         "get_comic_by_uuid",
         lambda comic_uuid: {
+            "id": 1,
+            "folder_id": None,
             "filename": "Issue 1.cbz",
             "page_count": 12,
         },
     )
-    monkeypatch.setattr(browse_module.repo, "get_initial_page", lambda *args: 1)
-    monkeypatch.setattr(browse_module.repo, "get_folder_id_for_comic", lambda *args: None)
     monkeypatch.setattr(
         browse_module.repo,
-        "get_metadata",
-        lambda *args: None,
+        "get_reader_context",
+        lambda *args: {"initial_page": 1, "title": None, "breadcrumbs": []},
     )
 
-    response = client.get("/reader/comic/proxy-comic")
+    response = client.get("/reader/comic/0b9d6a52-7c41-4f3e-8a2d-5e6f7a8b9c0d")
 
     assert response.status_code == 200
-    assert 'src="/reader/api/comic/proxy-comic/page/1"' in response.text
+    assert 'src="/reader/api/comic/0b9d6a52-7c41-4f3e-8a2d-5e6f7a8b9c0d/page/1"' in response.text
     assert 'src="/reader/static/js/reader.js"' in response.text
     assert "issued.internal:8181" not in response.text
 
 
-def test_reader_auth_pages_and_redirects_use_origin_relative_urls(proxy_app):
+def test_reader_auth_pages_and_redirects_use_origin_relative_urls(proxy_app, monkeypatch):
     config, _, client = proxy_app
 
     redirect = client.get("/reader/login", follow_redirects=False)
@@ -135,7 +140,10 @@ def test_reader_auth_pages_and_redirects_use_origin_relative_urls(proxy_app):
     assert redirect.headers["location"] == "/reader/"
     assert logout.headers["location"] == "/reader/login"
 
-    config.reader_auth = ReaderAuthConfig(user="reader", password="secret")
+    _use_config(
+        monkeypatch,
+        dataclasses.replace(config, reader_auth=ReaderAuthConfig(user="reader", password="secret")),
+    )
     login = client.get("/reader/login")
 
     assert login.status_code == 200
@@ -152,3 +160,21 @@ def test_opds_feed_keeps_absolute_public_urls(proxy_app):
 
     assert response.status_code == 200
     assert 'href="https://issued.example.com/opds/"' in response.text
+
+
+def test_reader_auth_redirects_unauthenticated_requests(proxy_app, monkeypatch):
+    config, _, client = proxy_app
+    _use_config(
+        monkeypatch,
+        dataclasses.replace(config, reader_auth=ReaderAuthConfig(user="reader", password="secret")),
+    )
+
+    redirect = client.get("/reader/tags", follow_redirects=False)
+    assert redirect.status_code == 302
+    assert redirect.headers["location"] == "/reader/login?next=/reader/tags"
+
+    client.cookies.set(
+        reader_auth.SESSION_COOKIE_NAME,
+        reader_auth.create_session_cookie_value("reader", "secret"),
+    )
+    assert client.get("/reader/tags", follow_redirects=False).status_code == 200
@@ -3,6 +3,7 @@ import sqlite3
 import zipfile
 from pathlib import Path
 
+import pytest
 from PIL import Image
 
 from server.config import IssuedConfig, LibraryConfig, MonitoringConfig, ReaderAuthConfig, ScannerConfig, ServerConfig, ThumbnailConfig
@@ -10,6 +11,12 @@ from server.database import DB_PATH, get_connection, init_db
 from server import scanner
 
 
+@pytest.fixture(autouse=True)
+def _data_dir(tmp_path, monkeypatch):
+    """Keep thumbnails written by scans under tmp_path, not the working tree."""
+    monkeypatch.setattr("server.config.DATA_DIR", tmp_path, raising=True)
+
+
 def _create_minimal_cbz(path: Path) -> None:
     """Create a valid CBZ file with a tiny PNG image."""
     img = Image.new("RGB", (10, 10), color="red")
@@ -86,9 +93,11 @@ def test_scan_library_smoke(tmp_path, monkeypatch):
         assert "." in folder_paths
         assert "Series" in folder_paths
 
-        cur = conn.execute("SELECT path FROM comics")
-        comic_paths = {row["path"] for row in cur.fetchall()}
-        assert "Series/issue01.cbz" in comic_paths
+        cur = conn.execute("SELECT path, page_count, page_manifest FROM comics")
+        comics = {row["path"]: row for row in cur.fetchall()}
+        assert "Series/issue01.cbz" in comics
+        assert comics["Series/issue01.cbz"]["page_count"] == 1
+        assert comics["Series/issue01.cbz"]["page_manifest"] == '["page001.png"]'
     finally:
         conn.close()
 
@@ -129,3 +138,598 @@ def test_scan_library_inserts_comics_in_natural_order(tmp_path, monkeypatch):
         conn.close()
 
 
+def test_apply_deletes_and_moves_updates_db_in_one_batch(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    series_dir = lib / "Series"
+    series_dir.mkdir(parents=True)
+    for filename in ("issue1.cbz", "issue2.cbz"):
+        _create_minimal_cbz(series_dir / filename)
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import create_engine
+
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+
+    config = _make_config(lib)
+    scanner.scan_library(config, path=None, force=True)
+
+    (series_dir / "issue2.cbz").unlink()
+    (series_dir / "issue1.cbz").rename(series_dir / "renamed.cbz")
+    # Never scanned: its move is applied as a scan after the batch commits
+    _create_minimal_cbz(series_dir / "new.cbz")
+    scanner.apply_deletes_and_moves(
+        [series_dir / "issue2.cbz"],
+        [
+            (series_dir / "issue1.cbz", series_dir / "renamed.cbz"),
+            (series_dir / "unknown.cbz", series_dir / "new.cbz"),
+        ],
+        config,
+    )
+
+    conn = sqlite3.connect(db_file)
+    try:
+        rows = conn.execute("SELECT path, filename FROM comics ORDER BY path").fetchall()
+        assert rows == [
+            ("Series/new.cbz", "new.cbz"),
+            ("Series/renamed.cbz", "renamed.cbz"),
+        ]
+    finally:
+        conn.close()
+
+
+def test_preloaded_folder_cache_creates_parent_chain(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    (lib / "Marvel" / "X-Men").mkdir(parents=True)
+    (lib / "DC").mkdir()
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import Session, create_engine
+    engine = create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr("server.database.engine", engine, raising=True)
+    init_db()
+
+    from server.repository import Repository
+
+    with Session(engine) as session:
+        repo = Repository(session, lib)
+        dc_id = repo.get_or_create_folder(lib / "DC").id
+        repo.commit()
+
+        repo.preload_folder_cache()
+        xmen_id = repo.get_or_create_folder_id(lib / "Marvel" / "X-Men")
+        assert repo.get_or_create_folder_id(lib / "Marvel" / "X-Men") == xmen_id
+        assert repo.get_or_create_folder_id(lib / "DC") == dc_id
+        repo.commit()
+
+    conn = sqlite3.connect(db_file)
+    try:
+        rows = conn.execute("SELECT id, path, parent_id FROM folders").fetchall()
+    finally:
+        conn.close()
+    by_path = {path: (folder_id, parent_id) for folder_id, path, parent_id in rows}
+    assert set(by_path) == {".", "DC", "Marvel", "Marvel/X-Men"}
+    assert by_path["Marvel/X-Men"] == (xmen_id, by_path["Marvel"][0])
+    assert by_path["Marvel"][1] == by_path["."][0]
+    assert by_path["DC"][1] == by_path["."][0]
+
+
+def test_get_or_create_folder_links_new_ancestors_under_existing_one(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    (lib / "Marvel" / "X-Men" / "1991").mkdir(parents=True)
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import Session, create_engine
+    engine = create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr("server.database.engine", engine, raising=True)
+    init_db()
+
+    from server.repository import Repository
+
+    with Session(engine) as session:
+        repo = Repository(session, lib)
+        marvel_id = repo.get_or_create_folder(lib / "Marvel").id
+        repo.commit()
+        leaf = repo.get_or_create_folder(lib / "Marvel" / "X-Men" / "1991")
+        repo.commit()
+        assert repo.get_or_create_folder(lib / "Marvel" / "X-Men" / "1991").id == leaf.id
+        assert repo.get_or_create_folder(lib / "Marvel").id == marvel_id
+
+    conn = sqlite3.connect(db_file)
+    try:
+        rows = conn.execute("SELECT id, path, parent_id FROM folders").fetchall()
+    finally:
+        conn.close()
+    by_path = {path: (folder_id, parent_id) for folder_id, path, parent_id in rows}
+    assert set(by_path) == {".", "Marvel", "Marvel/X-Men", "Marvel/X-Men/1991"}
+    assert by_path["Marvel"][1] == by_path["."][0]
+    assert by_path["Marvel/X-Men"][1] == marvel_id
+    assert by_path["Marvel/X-Men/1991"] == (leaf.id, by_path["Marvel/X-Men"][0])
+
+
+def test_rescan_skips_unchanged_comics_from_folder_preload(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    series_dir = lib / "Series"
+    series_dir.mkdir(parents=True)
+    for name in ("issue01.cbz", "issue02.cbz"):
+        _create_minimal_cbz(series_dir / name)
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import create_engine
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+
+    config = _make_config(lib)
+    assert scanner.scan_library(config)["added"] == 2
+
+    _create_minimal_cbz(series_dir / "issue03.cbz")
+    stats = scanner.scan_library(config)
+    assert stats["added"] == 1
+    assert stats["skipped"] == 2
+    assert stats["updated"] == 0
+
+
+def test_scan_library_writes_worker_rendered_thumbnails(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    series_dir = lib / "Series"
+    series_dir.mkdir(parents=True)
+    for name in ("issue1.cbz", "issue2.cbz", "issue3.cbz"):
+        _create_minimal_cbz(series_dir / name)
+    (series_dir / "broken.cbz").write_bytes(b"not a zip")
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import create_engine
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+
+    config = _make_config(lib)
+    stats = scanner.scan_library(config)
+    assert stats["added"] == 3
+    assert stats["skipped"] == 1
+
+    conn = sqlite3.connect(db_file)
+    try:
+        rows = conn.execute(
+            "SELECT filename, uuid, thumbnail_generated FROM comics ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+    assert [row[0] for row in rows] == ["issue1.cbz", "issue2.cbz", "issue3.cbz"]
+    for _, comic_uuid, thumbnail_generated in rows:
+        assert thumbnail_generated == 1
+        assert (tmp_path / "thumbnails" / f"{comic_uuid}.webp").is_file()
+
+
+def test_first_scan_sets_series_only_for_leaf_folders(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    series_dir = lib / "Publisher" / "Series"
+    series_dir.mkdir(parents=True)
+    _create_minimal_cbz(lib / "Publisher" / "oneshot.cbz")
+    _create_minimal_cbz(series_dir / "issue1.cbz")
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import create_engine
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+
+    scanner.scan_library(_make_config(lib))
+
+    conn = sqlite3.connect(db_file)
+    try:
+        series = dict(
+            conn.execute(
+                "SELECT c.filename, m.series FROM comics c JOIN metadata m ON m.comic_id = c.id"
+            ).fetchall()
+        )
+    finally:
+        conn.close()
+    assert series == {"oneshot.cbz": None, "issue1.cbz": "Series"}
+
+
+def test_rescan_deletes_removed_comics_in_one_sweep(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    series_dir = lib / "Series"
+    series_dir.mkdir(parents=True)
+    for name in ("issue1.cbz", "issue2.cbz", "issue3.cbz"):
+        _create_minimal_cbz(series_dir / name)
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import create_engine
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+
+    config = _make_config(lib)
+    scanner.scan_library(config)
+    (series_dir / "issue1.cbz").unlink()
+    (series_dir / "issue3.cbz").unlink()
+
+    stats = scanner.scan_library(config, path=series_dir)
+    assert stats["deleted"] == 2
+
+    conn = sqlite3.connect(db_file)
+    try:
+        assert conn.execute("SELECT path FROM comics").fetchall() == [("Series/issue2.cbz",)]
+        assert conn.execute("SELECT COUNT(*) FROM metadata").fetchone() == (1,)
+    finally:
+        conn.close()
+
+
+def test_scan_folder_adds_nested_comics_once(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    new_dir = lib / "Publisher" / "Series"
+    new_dir.mkdir(parents=True)
+    _create_minimal_cbz(lib / "Publisher" / "oneshot.cbz")
+    for name in ("issue1.cbz", "issue2.cbz"):
+        _create_minimal_cbz(new_dir / name)
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import create_engine
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+    init_db()
+
+    config = _make_config(lib)
+    scanner.scan_folder(lib / "Publisher", config)
+    scanner.scan_folder(lib / "Publisher", config)
+
+    conn = sqlite3.connect(db_file)
+    try:
+        rows = conn.execute(
+            "SELECT c.path, f.path FROM comics c JOIN folders f ON f.id = c.folder_id ORDER BY c.id"
+        ).fetchall()
+    finally:
+        conn.close()
+    assert rows == [
+        ("Publisher/oneshot.cbz", "Publisher"),
+        ("Publisher/Series/issue1.cbz", "Publisher/Series"),
+        ("Publisher/Series/issue2.cbz", "Publisher/Series"),
+    ]
+
+
+def test_deferred_commits_flush_batches_at_max_pending(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    for name in ("A", "B", "C"):
+        (lib / name).mkdir(parents=True)
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import Session, create_engine
+    engine = create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr("server.database.engine", engine, raising=True)
+    init_db()
+
+    from server.repository import Repository
+
+    def committed_paths() -> set[str]:
+        conn = sqlite3.connect(db_file)
+        try:
+            return {row[0] for row in conn.execute("SELECT path FROM folders")}
+        finally:
+            conn.close()
+
+    with Session(engine) as session:
+        repo = Repository(session, lib)
+        with repo.deferred_commits(max_pending=2):
+            repo.get_or_create_folder(lib / "A")
+            repo.commit()
+            assert committed_paths() == set()
+            repo.get_or_create_folder(lib / "B")
+            repo.commit()
+            assert committed_paths() == {".", "A", "B"}
+            repo.get_or_create_folder(lib / "C")
+            repo.commit()
+            assert "C" not in committed_paths()
+    assert "C" in committed_paths()
+
+
+def test_delete_comics_under_path_matches_prefix_literally(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import Session, create_engine
+    engine = create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr("server.database.engine", engine, raising=True)
+    init_db()
+
+    from datetime import datetime
+    from sqlmodel import select
+    from server.models import Comic
+    from server.repository import Repository
+
+    with Session(engine) as session:
+        repo = Repository(session, lib)
+        for rel in ("A_B/1.cbz", "AxB/2.cbz", "a_b/3.cbz", "A_B0/4.cbz"):
+            folder_id = repo.get_or_create_folder((lib / rel).parent).id
+            repo.upsert_comic(
+                folder_id=folder_id,
+                path=lib / rel,
+                filename=rel.split("/")[1],
+                fmt="cbz",
+                file_size=1,
+                page_count=1,
+                file_modified_at=datetime(2026, 1, 1),
+            )
+        repo.commit()
+
+        assert len(repo.delete_comics_under_path(lib / "A_B")) == 1
+        repo.commit()
+        remaining = set(session.exec(select(Comic.path)).all())
+    assert remaining == {"AxB/2.cbz", "a_b/3.cbz", "A_B0/4.cbz"}
+
+
+def test_folder_move_rewrites_only_the_path_prefix(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import Session, create_engine
+    engine = create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr("server.database.engine", engine, raising=True)
+    init_db()
+
+    from datetime import datetime
+    from sqlmodel import select
+    from server.models import Comic, Folder
+    from server.repository import Repository
+
+    with Session(engine) as session:
+        repo = Repository(session, lib)
+        nested = lib / "Marvel" / "Marvel"
+        comic = repo.upsert_comic(
+            folder_id=repo.get_or_create_folder(nested).id,
+            path=nested / "Marvel 1.cbz",
+            filename="Marvel 1.cbz",
+            fmt="cbz",
+            file_size=1,
+            page_count=1,
+            file_modified_at=datetime(2026, 1, 1),
+        )
+        repo.commit()
+
+        assert repo.update_folder_path(lib / "Marvel", lib / "Old Marvel")
+        repo.update_comic_paths(lib / "Marvel", lib / "Old Marvel")
+        repo.commit()
+
+        assert comic.path == "Old Marvel/Marvel/Marvel 1.cbz"
+        assert set(session.exec(select(Folder.path)).all()) == {".", "Old Marvel", "Old Marvel/Marvel"}
+        assert session.exec(select(Comic.path)).all() == ["Old Marvel/Marvel/Marvel 1.cbz"]
+
+
+def test_upsert_comics_updates_and_inserts_in_one_call(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import Session, create_engine
+    engine = create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr("server.database.engine", engine, raising=True)
+    init_db()
+
+    from datetime import datetime
+    from sqlmodel import func, select
+    from server.models import Comic, ComicMetadata
+    from server.repository import Repository
+
+    def row(name: str, size: int) -> dict:
+        return dict(
+            folder_id=folder_id,
+            path=lib / name,
+            filename=name,
+            fmt="cbz",
+            file_size=size,
+            page_count=1,
+            file_modified_at=datetime(2026, 1, 1),
+        )
+
+    with Session(engine) as session:
+        repo = Repository(session, lib)
+        folder_id = repo.get_or_create_folder(lib).id
+        existing = repo.upsert_comic(**row("b.cbz", 1))
+        repo.commit()
+        existing_id, existing_uuid = existing.id, existing.uuid
+
+        comics = repo.upsert_comics([row("c.cbz", 3), row("b.cbz", 2), row("a.cbz", 4)])
+        repo.commit()
+
+        assert comics[1] == (existing_id, existing_uuid)
+        assert len({c.uuid for c in comics}) == 3
+        sizes = dict(session.exec(select(Comic.id, Comic.file_size)).all())
+        assert [sizes[c.id] for c in comics] == [3, 2, 4]
+        assert session.exec(select(func.count()).select_from(ComicMetadata)).one() == 3
+
+
+def test_upsert_comics_on_existing_comic_keeps_folder_preview_cache(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    monkeypatch.setattr("server.migrations.DB_PATH", db_file, raising=True)
+    from sqlmodel import Session, create_engine
+    engine = create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr("server.database.engine", engine, raising=True)
+    init_db()
+
+    from datetime import datetime
+    from reader import repo as reader_repo
+    from server.migrations import ensure_folder_preview_cache
+    from server.repository import Repository
+
+    assert ensure_folder_preview_cache()
+
+    def row(size: int) -> dict:
+        return dict(
+            folder_id=folder_id,
+            path=lib / "Series" / "a.cbz",
+            filename="a.cbz",
+            fmt="cbz",
+            file_size=size,
+            page_count=1,
+            file_modified_at=datetime(2026, 1, 1),
+        )
+
+    def cached() -> str | None:
+        conn = sqlite3.connect(db_file)
+        try:
+            return conn.execute(
+                "SELECT preview_uuids FROM folders WHERE id = ?", (folder_id,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    with Session(engine) as session:
+        repo = Repository(session, lib)
+        folder_id = repo.get_or_create_folder(lib / "Series").id
+        (comic,) = repo.upsert_comics([row(1)])
+        repo.commit()
+
+        conn = sqlite3.connect(db_file)
+        conn.row_factory = sqlite3.Row
+        try:
+            assert reader_repo.get_folder_preview_thumbnails(conn, folder_id) == [comic.uuid]
+            conn.commit()
+        finally:
+            conn.close()
+
+        repo.upsert_comics([row(2)])
+        repo.commit()
+    assert cached() == f'["{comic.uuid}"]'
+
+
+def test_generate_thumbnails_fills_missing_in_batches(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    for name in ("a.cbz", "b.cbz", "c.cbz"):
+        _create_minimal_cbz(lib / name)
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    monkeypatch.setattr("server.thumbnails.THUMBNAIL_COMMIT_BATCH", 2, raising=True)
+    from sqlmodel import create_engine
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+
+    from server.thumbnails import generate_thumbnails
+
+    config = _make_config(lib)
+    scanner.scan_library(config)
+    for thumb in (tmp_path / "thumbnails").glob("*.webp"):
+        thumb.unlink()
+    conn = sqlite3.connect(db_file)
+    try:
+        conn.execute("UPDATE comics SET thumbnail_generated = 0")
+        conn.commit()
+
+        generate_thumbnails(config)
+
+        rows = conn.execute("SELECT uuid, thumbnail_generated FROM comics").fetchall()
+    finally:
+        conn.close()
+    assert len(rows) == 3
+    for comic_uuid, thumbnail_generated in rows:
+        assert thumbnail_generated == 1
+        assert (tmp_path / "thumbnails" / f"{comic_uuid}.webp").is_file()
+
+
+def test_generate_thumbnails_reuses_current_thumbnail_files(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    _create_minimal_cbz(lib / "a.cbz")
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import create_engine
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+
+    from server.thumbnails import generate_thumbnails
+
+    config = _make_config(lib)
+    scanner.scan_library(config)
+    conn = sqlite3.connect(db_file)
+    try:
+        (comic_uuid,) = conn.execute("SELECT uuid FROM comics").fetchone()
+        thumb = tmp_path / "thumbnails" / f"{comic_uuid}.webp"
+        buf = io.BytesIO()
+        Image.new("RGB", (3, 3), color="blue").save(buf, format="WEBP")
+        kept = buf.getvalue()
+        thumb.write_bytes(kept)
+        conn.execute("UPDATE comics SET thumbnail_generated = 0")
+        conn.commit()
+
+        generate_thumbnails(config)
+        assert conn.execute("SELECT thumbnail_generated FROM comics").fetchone() == (1,)
+        assert thumb.read_bytes() == kept
+
+        generate_thumbnails(config, regenerate=True)
+        assert thumb.read_bytes() != kept
+
+        # A truncated file from an interrupted write is rendered again
+        thumb.write_bytes(kept[:10])
+        conn.execute("UPDATE comics SET thumbnail_generated = 0")
+        conn.commit()
+        generate_thumbnails(config)
+        assert conn.execute("SELECT thumbnail_generated FROM comics").fetchone() == (1,)
+        with Image.open(thumb) as im:
+            assert im.format == "WEBP"
+            im.load()
+    finally:
+        conn.close()
+
+
+def test_cleanup_orphaned_thumbnails_keeps_known_comics(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    _create_minimal_cbz(lib / "a.cbz")
+
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    from sqlmodel import create_engine
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+
+    from server.thumbnails import cleanup_orphaned_thumbnails
+
+    config = _make_config(lib)
+    scanner.scan_library(config)
+    thumbnails_dir = tmp_path / "thumbnails"
+    (thumbnails_dir / "orphan.webp").write_bytes(b"x")
+    (thumbnails_dir / "notes.txt").write_bytes(b"x")
+
+    assert cleanup_orphaned_thumbnails(config) == 1
+    assert sorted(p.suffix for p in thumbnails_dir.iterdir()) == [".txt", ".webp"]
@@ -0,0 +1,73 @@
+"""Tests for reader comic search backed by the comics_fts index."""
+
+import sqlite3
+
+import pytest
+from sqlmodel import create_engine
+
+from reader import repo
+from server.database import init_db
+from server.migrations import ensure_comics_fts_table
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    db_file = tmp_path / "library.db"
+    monkeypatch.setattr("server.database.DB_PATH", db_file, raising=True)
+    monkeypatch.setattr(
+        "server.database.engine",
+        create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False}),
+        raising=True,
+    )
+    monkeypatch.setattr("server.migrations.DB_PATH", db_file, raising=True)
+    init_db()
+    assert ensure_comics_fts_table() is True
+    assert ensure_comics_fts_table() is False
+
+    connection = sqlite3.connect(db_file)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(
+        """
+        INSERT INTO folders (id, name, path, created_at) VALUES (1, 'Series', 'Series', '2026-01-01');
+        INSERT INTO comics (id, uuid, filename, path, format, file_size, page_count,
+                            file_modified_at, thumbnail_generated, folder_id, created_at)
+        VALUES (1, 'u1', 'Batman 001.cbz', 'Series/Batman 001.cbz', 'cbz', 1, 1, '2026-01-01', 0, 1, '2026-01-01'),
+               (2, 'u2', 'Other 002.cbz', 'Series/Other 002.cbz', 'cbz', 1, 1, '2026-01-01', 0, 1, '2026-01-01');
+        INSERT INTO metadata (comic_id, is_completed, title) VALUES (2, 0, 'Dark Knight');
+        INSERT INTO tags (id, name) VALUES (1, 'favourites');
+        INSERT INTO comic_tags (comic_id, tag_id) VALUES (2, 1);
+        """
+    )
+    yield connection
+    connection.close()
+
+
+def _uuids(rows):
+    return [row["uuid"] for row in rows]
+
+
+def test_search_matches_substrings_case_insensitively(conn):
+    assert _uuids(repo.search_comics(conn, "ATMA")) == ["u1"]
+    assert _uuids(repo.search_comics(conn, "knight")) == ["u2"]
+    assert _uuids(repo.search_comics(conn, "00")) == ["u1", "u2"]
+    assert _uuids(repo.search_comics(conn, "favour")) == ["u2"]
+
+
+def test_search_index_follows_metadata_and_deletes(conn):
+    conn.execute("UPDATE metadata SET title = 'Gotham Nights' WHERE comic_id = 2")
+    conn.execute("DELETE FROM comics WHERE id = 1")
+    conn.commit()
+
+    assert _uuids(repo.search_comics(conn, "gotham")) == ["u2"]
+    assert repo.search_comics(conn, "knight") == []
+    assert repo.search_comics(conn, "batman") == []
+
+
+def test_search_grouped_by_folder(conn):
+    groups = repo.search_comics_grouped(conn, "cbz")
+    assert [g["series"] for g in groups] == ["Series"]
+    assert _uuids(groups[0]["comics"]) == ["u1", "u2"]
+
+
+def test_get_comics_in_folder_orders_by_filename(conn):
+    assert _uuids(repo.get_comics_in_folder(conn, 1)) == ["u1", "u2"]
@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from server.utils import map_bounded, short_path
+
+
+def test_short_path_keeps_parent_folder_and_file_name():
+    for raw in ("/very/long/folder/file.cbz", "/file.cbz", "file.cbz", "folder/file.cbz"):
+        path = Path(raw)
+        assert short_path(path) == f"{path.parent.name}/{path.name}"
+
+
+def test_map_bounded_keeps_order_and_limits_submissions():
+    calls = []
+
+    def square(n):
+        calls.append(n)
+        return n * n
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = map_bounded(pool, square, 3, range(10))
+        assert next(results) == 0
+        assert len(calls) <= 4
+        assert list(results) == [n * n for n in range(1, 10)]